@@ -0,0 +1,13 @@
+"""
+Benchmarks for Desktop Widgets
+Run from the repository root:
+
+    python -m benchmarks                      # all benchmarks, small and medium scale
+    python -m benchmarks --scale large -k load
+    python -m benchmarks --save-baseline      # store this machine's numbers
+    python -m benchmarks.generate --years 5 -o data.json
+    python -m benchmarks.replay --keys keys.json --realtime
+
+Results are JSON; with a baseline present every run is compared against it
+and the exit status is 1 when something got slower than the tolerance.
+"""
@@ -0,0 +1,177 @@
+"""
+Data-layer benchmarks: load, save, lookups, index builds and migrations
+Everything here runs without Tk.
+"""
+
+import random
+
+import widgets_data
+from benchmarks.runner import benchmark
+
+LOOKUPS = 1000
+
+
+def sample_keys(context, section, count=LOOKUPS):
+    keys = sorted(context.fresh_data()[section])
+    return random.Random(0).choices(keys, k=count)
+
+
+@benchmark("store/load")
+def load(context):
+    return lambda: widgets_data.DataStore(context.path)
+
+
+@benchmark("store/save")
+def save(context):
+    store = widgets_data.DataStore(context.scratch("save.json"))
+    store.data.update(widgets_data.to_records(context.fresh_data()))
+    return store.save
+
+
+@benchmark("store/edit_commit")
+def edit_commit(context):
+    # One keystroke's worth of work: set a slot, save, notify
+    store = widgets_data.DataStore(context.scratch("edit.json"))
+    store.data.update(widgets_data.to_records(context.fresh_data()))
+    day = max(store.data["day_planner"])
+    texts = iter(range(10 ** 9))
+    return lambda: store.day_plan.set_slot(day, 9, f"edit {next(texts)}")
+
+
+@benchmark("store/drag_save")
+def drag_save(context):
+    # The end of a widget drag: only the layout file is written
+    store = widgets_data.DataStore(context.scratch("drag.json"), context.scratch("drag_layout.json"))
+    store.data.update(widgets_data.to_records(context.fresh_data()))
+    positions = iter(range(10 ** 9))
+    return lambda: store.layout.set_position("todo", next(positions) % 1000, 100)
+
+
+@benchmark("lookup/calendar")
+def lookup_calendar(context):
+    store = widgets_data.DataStore(context.path)
+    keys = sample_keys(context, "calendar_events")
+    return lambda: [store.calendar.get(key) for key in keys]
+
+
+@benchmark("lookup/day_planner")
+def lookup_day_planner(context):
+    store = widgets_data.DataStore(context.path)
+    keys = sample_keys(context, "day_planner")
+    return lambda: [store.day_plan.get(key).get("9", "") for key in keys]
+
+
+@benchmark("lookup/week_planner")
+def lookup_week_planner(context):
+    store = widgets_data.DataStore(context.path)
+    keys = sample_keys(context, "week_planner")
+    return lambda: [store.week_plan.get(key) for key in keys]
+
+
+@benchmark("lookup/habit_week")
+def lookup_habit_week(context):
+    store = widgets_data.DataStore(context.path)
+    keys = sample_keys(context, "habit_tracking")
+    return lambda: [store.habits.week(key) for key in keys]
+
+
+@benchmark("lookup/todo_view")
+def lookup_todo_view(context):
+    index = widgets_data.TodoIndex(context.fresh_data())
+    return lambda: list(index.view("active"))
+
+
+@benchmark("lookup/search")
+def lookup_search(context):
+    index = widgets_data.SearchIndex(context.fresh_data())
+    index.rebuild()
+    queries = ["review", "gym budget", "plan spr", "dentist appointment", "release notes"]
+    return lambda: [index.search(query) for query in queries]
+
+
+@benchmark("lookup/date_neighbours")
+def lookup_date_neighbours(context):
+    index = widgets_data.DateIndex(context.fresh_data())
+    keys = sample_keys(context, "day_planner")
+    return lambda: [index.prev_key("calendar_events", key) for key in keys]
+
+
+@benchmark("index/todos")
+def index_todos(context):
+    data = context.fresh_data()
+    return lambda: widgets_data.TodoIndex(data)
+
+
+@benchmark("index/search_rebuild")
+def index_search(context):
+    index = widgets_data.SearchIndex(context.fresh_data())
+    return index.rebuild
+
+
+@benchmark("index/search_pack")
+def index_search_pack(context):
+    # What persisting costs after an edit to a loaded index: one changed doc
+    data = context.fresh_data()
+    index = widgets_data.SearchIndex(data)
+    index.rebuild()
+    path = context.scratch("search.idx")
+    index.save(path)
+    index = widgets_data.SearchIndex(data)
+    index.load(path)
+    day = max(data["day_planner"])
+    texts = iter(range(10 ** 9))
+    
+    def edit_and_pack():
+        data["day_planner"][day]["9"] = f"edit {next(texts)}"
+        index.update("day_planner", day)
+        return index.pack()
+    return edit_and_pack
+
+
+@benchmark("index/dates")
+def index_dates(context):
+    data = context.fresh_data()
+    return lambda: widgets_data.DateIndex(data)
+
+
+@benchmark("index/habit_stats")
+def index_habit_stats(context):
+    stats = widgets_data.HabitStats(context.fresh_data())
+    return lambda: [stats.build(), [stats.stats(str(i)) for i in range(len(stats.data["habits"]))]]
+
+
+@benchmark("migrate/record_ids")
+def migrate_record_ids(context):
+    # A file from before todos and notes had ids
+    store = widgets_data.DataStore(context.scratch("ids.json"))
+    
+    def prepare():
+        store.data = widgets_data.to_records(context.fresh_data())
+        for section in ("todos", "sticky_notes"):
+            for record in store.data[section]:
+                del record["id"]
+    return prepare, store.ensure_record_ids
+
+
+@benchmark("migrate/pomodoro_rollups")
+def migrate_pomodoro_rollups(context):
+    # A file from before the rollups were stored
+    state = {}
+    
+    def prepare():
+        state["data"] = context.fresh_data()
+        del state["data"]["pomodoro_rollups"]
+    return prepare, lambda: widgets_data.SessionLedger(state["data"])
+
+
+@benchmark("migrate/calendar_events")
+def migrate_calendar_events(context):
+    # A file from before days held lists of events
+    state = {}
+    
+    def prepare():
+        state["data"] = context.fresh_data()
+        days = state["data"]["calendar_events"]
+        for day, events in days.items():
+            days[day] = "; ".join(widgets_data.event_label(event) for event in events)
+    return prepare, lambda: widgets_data.migrate_calendar_events(state["data"])
@@ -0,0 +1,121 @@
+"""
+Reproducible synthetic data files for the benchmarks
+The same seed and parameters always give the same data, shaped like a
+desktop_widgets_data_v2.json that has been in daily use for years.
+"""
+
+import argparse
+import json
+import random
+from datetime import date, datetime, timedelta
+
+import widgets_data
+
+WORDS = (
+    "review budget call mum standup dentist gym groceries report draft email "
+    "invoice meeting lunch plan sprint retro deploy fix bug write blog read "
+    "chapter run errands clean kitchen laundry pay rent book flights team sync "
+    "design doc interview prepare slides walk dog yoga piano lesson water "
+    "plants backup laptop renew passport birthday dinner friends project "
+    "kickoff release notes refactor module tax forms doctor appointment"
+).split()
+HABIT_NAMES = ("Read", "Exercise", "Meditate", "Water", "Journal", "Walk", "Stretch", "No sugar", "Sleep early")
+END_DATE = date(2026, 1, 1)
+
+
+def phrase(rng, low=2, high=6):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+def generate_data(years=3, todos=10000, notes=2000, habits=100, sessions_per_day=4, seed=1, end=END_DATE):
+    """A data dict covering `years` years up to `end`"""
+    rng = random.Random(seed)
+    data = widgets_data.DataStore.default_data()
+    first = end - timedelta(days=int(years * 365))
+    days = [first + timedelta(days=i) for i in range((end - first).days)]
+    
+    for day in days:
+        key = day.isoformat()
+        if rng.random() < 0.3:
+            events = []
+            for _ in range(rng.choice((1, 1, 1, 2, 3))):
+                event = {"id": f"{rng.getrandbits(48):012x}", "text": phrase(rng)}
+                if rng.random() < 0.6:
+                    start = rng.randint(7 * 4, 21 * 4) * 15
+                    event["start"] = f"{start // 60:02d}:{start % 60:02d}"
+                    if rng.random() < 0.7:
+                        end = start + rng.choice((30, 60, 90, 120))
+                        event["end"] = f"{min(end, 1439) // 60:02d}:{min(end, 1439) % 60:02d}"
+                events.append(event)
+            data["calendar_events"][key] = sorted(events, key=widgets_data.event_sort_key)
+        hours = rng.sample(range(5, 24), rng.randint(3, 8))
+        data["day_planner"][key] = {str(hour): phrase(rng) for hour in sorted(hours)}
+        if day.weekday() == 0:
+            data["week_planner"][key] = {str(weekday): phrase(rng, 3, 12) for weekday in range(7) if rng.random() < 0.8}
+        if day.day == 1:
+            data["monthly_planner"][key[:7]] = {
+                name: "\n".join(phrase(rng) for _ in range(rng.randint(1, 4)))
+                for _, name, _ in widgets_data.MONTH_PLAN_SECTIONS
+            }
+    
+    for i in range(todos):
+        created = datetime.combine(rng.choice(days), datetime.min.time()) + timedelta(minutes=rng.randint(0, 1439))
+        task = {
+            "id": f"{rng.getrandbits(48):012x}",
+            "text": phrase(rng),
+            "done": rng.random() < 0.6,
+            "priority": rng.choice(widgets_data.TODO_PRIORITIES),
+            "created": created.isoformat(),
+            "order": i
+        }
+        if rng.random() < 0.4:
+            task["due"] = (created.date() + timedelta(days=rng.randint(0, 30))).isoformat()
+        data["todos"].append(task)
+    
+    for _ in range(notes):
+        moment = datetime.combine(rng.choice(days), datetime.min.time()) + timedelta(minutes=rng.randint(0, 1439))
+        data["sticky_notes"].append({
+            "id": f"{rng.getrandbits(48):012x}",
+            "text": "\n".join(phrase(rng, 3, 10) for _ in range(rng.randint(1, 5))),
+            "time": moment.strftime("%b %d, %H:%M")
+        })
+    
+    data["habits"] = [f"{HABIT_NAMES[i % len(HABIT_NAMES)]} {i // len(HABIT_NAMES) + 1}" for i in range(habits)]
+    odds = [rng.uniform(0.2, 0.95) for _ in range(habits)]
+    for day in days:
+        if day.weekday() == 0:
+            data["habit_tracking"][day.isoformat()] = {
+                str(i): [weekday for weekday in range(7) if rng.random() < odds[i]]
+                for i in range(habits)
+            }
+    
+    for day in days:
+        moment = datetime.combine(day, datetime.min.time()) + timedelta(hours=9)
+        for _ in range(rng.randint(0, sessions_per_day * 2)):
+            start = int(moment.timestamp())
+            data["pomodoro_log"].append([start, start + 1500, "work", 1500])
+            data["pomodoro_log"].append([start + 1500, start + 1800, "break", 300])
+            moment += timedelta(minutes=30 + rng.randint(0, 90))
+    widgets_data.SessionLedger(data)  # fills pomodoro_rollups the way the app keeps them
+    return data
+
+
+def write_data(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Desktop Widgets data file")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--todos", type=int, default=10000)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--habits", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    write_data(args.output, generate_data(args.years, args.todos, args.notes, args.habits, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main_cli()
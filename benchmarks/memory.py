@@ -0,0 +1,52 @@
+"""
+Memory benchmarks: todos and sticky notes as slotted records vs plain dicts
+The sizes are taken with tracemalloc, so they include the strings each
+representation keeps alive, not just the containers.
+"""
+
+import json
+import tracemalloc
+
+import widgets_data
+from benchmarks.generate import generate_data
+from benchmarks.runner import benchmark
+
+RECORDS = 100000
+
+
+def resident(build):
+    """Bytes still allocated by whatever build() returns"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+
+@benchmark("memory/records")
+def records(context):
+    # A fixed 100k todos and notes whatever the scale; the rest of the data
+    # is kept small since only the record sections are measured
+    if "memory_text" not in context.cache:
+        data = generate_data(years=0.1, todos=RECORDS, notes=RECORDS, habits=0)
+        context.cache["memory_text"] = json.dumps({section: data[section] for section in widgets_data.RECORD_TYPES})
+    text = context.cache["memory_text"]
+    state = {}
+    
+    def prepare():
+        state["data"] = json.loads(text)
+    
+    def report():
+        dicts = resident(lambda: json.loads(text))
+        slotted = resident(lambda: widgets_data.to_records(json.loads(text)))
+        return {
+            "records": 2 * RECORDS,
+            "dict_bytes_per_record": round(dicts / (2 * RECORDS)),
+            "record_bytes_per_record": round(slotted / (2 * RECORDS)),
+            "saved_percent": round(100 * (1 - slotted / dicts), 1),
+        }
+    return prepare, lambda: widgets_data.to_records(state["data"]), report
@@ -0,0 +1,170 @@
+"""
+Render benchmarks: every widget class against generated data on a real X display
+Without a DISPLAY (Linux) an Xvfb server is started for the run; with
+neither Xvfb nor tkinter available the benchmarks are skipped.
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import time
+from itertools import cycle
+
+import widgets_data
+import widgets_gui
+from benchmarks.runner import Skip, benchmark
+
+display = {"root": None, "error": None}
+
+
+def start_xvfb():
+    number = next(n for n in range(99, 1000) if not os.path.exists(f"/tmp/.X{n}-lock"))
+    server = subprocess.Popen(
+        ["Xvfb", f":{number}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    atexit.register(server.terminate)
+    deadline = time.time() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if server.poll() is not None or time.time() > deadline:
+            raise Skip("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+
+
+def tk_root():
+    """The shared, withdrawn Tk root; starts Xvfb first if there is no display"""
+    if display["error"] is not None:
+        raise Skip(display["error"])
+    if display["root"] is None:
+        try:
+            widgets_gui.load_gui()
+            if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+                if shutil.which("Xvfb") is None:
+                    raise Skip("no DISPLAY and no Xvfb on the PATH")
+                start_xvfb()
+            display["root"] = widgets_gui.tk.Tk()
+        except ImportError:
+            display["error"] = "tkinter is not installed"
+            raise Skip(display["error"])
+        except Skip as e:
+            display["error"] = str(e)
+            raise
+        except Exception as e:  # TclError: the display would not open
+            display["error"] = f"no display ({e})"
+            raise Skip(display["error"])
+        display["root"].withdraw()
+    return display["root"]
+
+
+class RenderApp:
+    """DesktopWidgetsApp's store, indexes and change fan-out, without autostart, IPC, sync or file watching"""
+    
+    def __init__(self, root, path):
+        self.root = root
+        self.workers = widgets_data.WorkerPool(root)
+        self.store = widgets_data.DataStore(path)
+        self.store.executor = self.workers
+        self.data = self.store.data
+        self.search_index = widgets_data.SearchIndex(self.data)
+        self.search_index.rebuild()
+        self.date_index = widgets_data.DateIndex(self.data)
+        self.habit_stats = widgets_data.HabitStats(self.data)
+        for index in (self.search_index, self.date_index, self.habit_stats):
+            self.store.listeners.append(index.update)
+        self.store.listeners.append(self.on_store_change)
+        self.widgets = {}
+    
+    def on_store_change(self, section, key, source):
+        for widget in self.widgets.values():
+            if widget is not source:
+                widget.on_data_changed(section, key)
+    
+    def undo(self, event=None):
+        pass
+    
+    def redo(self, event=None):
+        pass
+    
+    def jump_to(self, doc_id):
+        pass
+    
+    def update_control_panel(self):
+        pass
+    
+    def update_sync_status(self):
+        pass
+    
+    def discard(self, widget_id):
+        widget = self.widgets.pop(widget_id, None)
+        if widget is not None:
+            widget.window.destroy()
+    
+    def close(self):
+        for widget_id in list(self.widgets):
+            self.discard(widget_id)
+        self.workers.shutdown()
+
+
+def render_app(context):
+    if "render_app" not in context.cache:
+        app = context.cache["render_app"] = RenderApp(tk_root(), context.path)
+        context.cleanups.append(app.close)
+    return context.cache["render_app"]
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def shown(app, widget_id):
+    """The widget, constructed and laid out once"""
+    if widget_id not in app.widgets:
+        app.widgets[widget_id] = widgets_gui.WIDGET_CLASSES[widget_id](app.root, app)
+        app.root.update_idletasks()
+    return app.widgets[widget_id]
+
+
+def register(widget_id):
+    cls = widgets_gui.WIDGET_CLASSES[widget_id]
+    
+    @benchmark(f"render/{widget_id}/construct")
+    def construct(context):
+        app = render_app(context)
+        
+        def build():
+            app.widgets[widget_id] = cls(app.root, app)
+            app.root.update_idletasks()
+        return (
+            lambda: app.discard(widget_id), build,
+            lambda: {"tk_widgets": count_widgets(app.widgets[widget_id].window)}
+        )
+    
+    @benchmark(f"render/{widget_id}/redraw")
+    def redraw(context):
+        app = render_app(context)
+        widget = shown(app, widget_id)
+        method = getattr(widget, widgets_gui.WIDGET_REDRAW_METHODS[widget_id])
+        
+        def run():
+            method()
+            app.root.update_idletasks()
+        return None, run, lambda: {"tk_widgets": count_widgets(widget.window)}
+    
+    @benchmark(f"render/{widget_id}/theme")
+    def theme(context):
+        app = render_app(context)
+        widget = shown(app, widget_id)
+        themes = cycle(widgets_gui.THEMES.values())
+        
+        def run():
+            widget.theme = next(themes)
+            widget.update_theme()
+            app.root.update_idletasks()
+        return run
+
+
+for widget_id in widgets_gui.WIDGET_CLASSES:
+    register(widget_id)
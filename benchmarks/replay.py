@@ -0,0 +1,179 @@
+"""
+Keystroke replay: end-to-end input latency of the planner text fields
+Each key is sent as KeyPress + KeyRelease through event_generate, so the
+real bindings run (edit, save, change fan-out, redraws); the latency of a
+key is the time until Tk has nothing left to do. Streams are synthetic or
+recorded as JSON [[delay_ms, keysym], ...]:
+    
+    python -m benchmarks.replay --record keys.json
+    python -m benchmarks.replay --keys keys.json --realtime
+"""
+
+import argparse
+from datetime import datetime
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import widgets_gui
+from benchmarks.generate import WORDS
+from benchmarks.runner import SCALES, Context, Skip, benchmark
+from benchmarks.render import render_app, shown, tk_root
+
+KEYSYMS = {" ": "space", ",": "comma", ".": "period", "-": "minus", ":": "colon", "\n": "Return"}
+TARGETS = {
+    "calendar": lambda widget: widget.event_rows[0]["text"],
+    "day_planner": lambda widget: widget.time_entries[9]["entry"],
+    "week_planner": lambda widget: widget.day_columns[0]["text"],
+    "monthly_planner": lambda widget: widget.section_texts["goals"]["text"],
+    "sticky_notes": lambda widget: next(w for w in descendants(widget.notes_frame) if isinstance(w, widgets_gui.tk.Text)),
+}
+
+
+def descendants(widget):
+    for child in widget.winfo_children():
+        yield child
+        yield from descendants(child)
+
+
+def synthetic_keys(count=200, seed=0, mean_delay_ms=120):
+    """[[delay_ms, keysym], ...] of typed words with the odd corrected typo"""
+    rng = random.Random(seed)
+    keys = []
+    while len(keys) < count:
+        for char in rng.choice(WORDS) + " ":
+            keys.append([rng.expovariate(1 / mean_delay_ms), KEYSYMS.get(char, char)])
+        if rng.random() < 0.1:
+            keys.append([rng.expovariate(1 / mean_delay_ms), rng.choice("etaoin")])
+            keys.append([rng.expovariate(1 / mean_delay_ms), "BackSpace"])
+    return keys[:count]
+
+
+def prepare_target(app, name):
+    """Show the widget, point it at an editable entry and return (widget, text field)"""
+    widget = shown(app, name)
+    if name in ("calendar", "day_planner"):
+        widget.show_date(max(app.data["day_planner"], default=datetime.now().strftime("%Y-%m-%d")))
+    if name == "calendar" and not widget.event_rows:
+        app.store.calendar.add(widget.selected_date, "")
+    elif name == "sticky_notes" and not app.store.notes.all():
+        app.store.notes.add("")
+    app.root.update()
+    return widget, TARGETS[name](widget)
+
+
+def clear(field):
+    field.delete("1.0" if isinstance(field, widgets_gui.tk.Text) else 0, "end")
+
+
+def replay(root, field, keys, realtime=False):
+    """Per-key latencies in seconds; realtime waits out the recorded delays with the loop running"""
+    field.focus_force()
+    latencies = []
+    for delay_ms, keysym in keys:
+        if realtime:
+            deadline = time.perf_counter() + delay_ms / 1000
+            while time.perf_counter() < deadline:
+                root.update()
+                time.sleep(0.001)
+        start = time.perf_counter()
+        field.event_generate("<KeyPress>", keysym=keysym)
+        field.event_generate("<KeyRelease>", keysym=keysym)
+        root.update()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentiles(latencies):
+    """p50/p90/p99/max in milliseconds"""
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p90_ms": round(cuts[89] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def register(name):
+    @benchmark(f"replay/{name}")
+    def run(context):
+        # The stream goes in back to back; the time is for all of it and
+        # the report has the per-key percentiles of the last run
+        app = render_app(context)
+        widget, field = prepare_target(app, name)
+        keys = synthetic_keys()
+        last = {}
+        
+        def type_stream():
+            last["latencies"] = replay(app.root, field, keys)
+        return lambda: clear(field), type_stream, lambda: percentiles(last["latencies"])
+
+
+for name in TARGETS:
+    register(name)
+
+
+def record(path):
+    """Open a text box and save what is typed into it, with timing, as a replay stream"""
+    root = tk_root()
+    root.deiconify()
+    root.title("Type, then close the window")
+    text = widgets_gui.tk.Text(root, width=60, height=10)
+    text.pack()
+    text.focus_set()
+    keys, last = [], [time.perf_counter()]
+    
+    def on_key(event):
+        now = time.perf_counter()
+        keys.append([round((now - last[0]) * 1000, 1), event.keysym])
+        last[0] = now
+    text.bind("<KeyPress>", on_key, add="+")
+    root.protocol("WM_DELETE_WINDOW", root.quit)
+    root.mainloop()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(keys, f)
+    print(f"Recorded {len(keys)} keys to {path}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description=__doc__.splitlines()[1])
+    parser.add_argument("--target", action="append", choices=TARGETS, help="repeatable (default: all)")
+    parser.add_argument("--scale", choices=SCALES, default="medium")
+    parser.add_argument("--keys", help="recorded stream (default: 200 synthetic keys)")
+    parser.add_argument("--realtime", action="store_true", help="wait out the recorded delays between keys")
+    parser.add_argument("--record", metavar="PATH", help="record a stream instead of replaying")
+    args = parser.parse_args(argv)
+    
+    if args.record:
+        record(args.record)
+        return 0
+    if args.keys:
+        with open(args.keys, "r", encoding="utf-8") as f:
+            keys = json.load(f)
+    else:
+        keys = synthetic_keys()
+    with tempfile.TemporaryDirectory(prefix="widgets-replay-") as workdir:
+        context = Context(args.scale, SCALES[args.scale], workdir)
+        try:
+            app = render_app(context)
+        except Skip as e:
+            print(f"Cannot replay: {e}", file=sys.stderr)
+            return 1
+        try:
+            for name in args.target or TARGETS:
+                widget, field = prepare_target(app, name)
+                clear(field)
+                result = percentiles(replay(app.root, field, keys, args.realtime))
+                print(f"{name:<16} " + "  ".join(f"{k}={v}" for k, v in result.items()))
+        finally:
+            for cleanup in reversed(context.cleanups):
+                cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
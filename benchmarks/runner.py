@@ -0,0 +1,173 @@
+"""
+Benchmark registry, timing, JSON results and baseline comparison
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generate import generate_data, write_data
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SCALES = {
+    "small": {"years": 1, "todos": 1000, "notes": 200, "habits": 20},
+    "medium": {"years": 3, "todos": 10000, "notes": 2000, "habits": 100},
+    "large": {"years": 10, "todos": 10000, "notes": 2000, "habits": 300},
+}
+SUITES = ("benchmarks.data_layer", "benchmarks.memory", "benchmarks.render", "benchmarks.replay")
+# name -> setup(context). The setup returns the function to time, or
+# (prepare, fn) with an untimed prepare() before every run, or
+# (prepare, fn, report) where report() returns extra numbers to record
+BENCHMARKS = {}
+
+
+class Skip(Exception):
+    """Raised by a setup that cannot run here (no display, missing module)"""
+
+
+def benchmark(name):
+    """Register a setup function; only the callable it returns is timed"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    """One scale's generated data, written to a scratch directory"""
+    
+    def __init__(self, scale, params, workdir):
+        self.scale = scale
+        self.params = params
+        self.workdir = workdir
+        self.path = os.path.join(workdir, f"data_{scale}.json")
+        self.cache = {}      # for suites to share expensive setup within a scale
+        self.cleanups = []   # called when the scale is done
+        write_data(self.path, generate_data(**params))
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.text = f.read()
+    
+    def fresh_data(self):
+        """A private copy of the data that a benchmark may change"""
+        return json.loads(self.text)
+    
+    def scratch(self, name):
+        return os.path.join(self.workdir, f"{self.scale}_{name}")
+
+
+def measure(setup, repeat):
+    if not isinstance(setup, tuple):
+        setup = (None, setup)
+    prepare, fn, report = setup + (None,) * (3 - len(setup))
+    times = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    result = {"min": min(times), "median": statistics.median(times), "runs": repeat}
+    if report is not None:
+        result.update(report())
+    return result
+
+
+def run(scales, pattern="", repeat=5, log=print):
+    """Run the matching benchmarks at each scale; returns the results document"""
+    for suite in SUITES:
+        importlib.import_module(suite)  # registers its benchmarks
+    results, skipped = {}, {}
+    with tempfile.TemporaryDirectory(prefix="widgets-bench-") as workdir:
+        for scale in scales:
+            context = Context(scale, SCALES[scale], workdir)
+            try:
+                for name, setup in BENCHMARKS.items():
+                    if pattern not in name:
+                        continue
+                    try:
+                        result = measure(setup(context), repeat)
+                    except Skip as e:
+                        skipped[str(e)] = skipped.get(str(e), 0) + 1
+                        continue
+                    results[f"{scale}/{name}"] = result
+                    extra = "".join(f"  {k}={v}" for k, v in result.items() if k not in ("min", "median", "runs"))
+                    log(f"{scale:>6}/{name:<32} {result['median'] * 1000:10.2f} ms  (min {result['min'] * 1000:.2f}){extra}")
+            finally:
+                for cleanup in reversed(context.cleanups):
+                    cleanup()
+    for reason, count in skipped.items():
+        log(f"skipped {count} benchmarks: {reason}")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "scales": {scale: SCALES[scale] for scale in scales},
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.25, floor=0.001):
+    """[(name, baseline time, new time)] for runs slower than baseline by more than tolerance"""
+    # Best-of-N times are compared, as the least disturbed by other load;
+    # differences under `floor` seconds are timer noise, whatever the ratio
+    regressions = []
+    for name, result in results["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        if result["min"] > old["min"] * (1 + tolerance) and result["min"] - old["min"] > floor:
+            regressions.append((name, old["min"], result["min"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Desktop Widgets benchmarks")
+    parser.add_argument("--scale", action="append", choices=SCALES, help="repeatable (default: small, medium)")
+    parser.add_argument("-k", dest="pattern", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write the results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    
+    results = run(args.scale or ["small", "medium"], args.pattern, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        # Keep the entries this run did not touch
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                merged = json.load(f)
+            merged["results"].update(results["results"])
+            merged["meta"] = results["meta"]
+            results = merged
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline yet (run with --save-baseline to store one)")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, old, new in regressions:
+        print(f"SLOWER  {name}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms ({new / old - 1:+.0%})", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
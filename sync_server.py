@@ -0,0 +1,164 @@
+"""
+Reference sync server for Desktop Widgets
+Stores the newest value of every synced field and hands out changes by
+sequence number. Standard library only - run it on any machine both
+computers can reach:
+    
+    python sync_server.py --host 0.0.0.0 --port 8765 --token SECRET
+
+Without --token it only listens on a loopback address.
+"""
+
+import argparse
+import ipaddress
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# HybridClock stamps from main.py: wall ms, counter, node
+STAMP_RE = re.compile(r"\d{13}:\d{5}:[^:]+")
+
+
+def check_changes(changes):
+    """Raise ValueError unless changes is a list of [section, key, field, value, stamp]"""
+    if not isinstance(changes, list):
+        raise ValueError("changes must be a list")
+    for change in changes:
+        if not isinstance(change, list) or len(change) != 5:
+            raise ValueError(f"bad change: {change!r}")
+        section, key, field, value, stamp = change
+        if not all(isinstance(part, str) for part in (section, key, field, stamp)):
+            raise ValueError(f"bad change: {change!r}")
+        if not STAMP_RE.fullmatch(stamp):
+            raise ValueError(f"bad stamp: {stamp!r}")
+
+
+class SyncStore:
+    """Newest [section, key, field, value, stamp, seq] per field, ordered by seq"""
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.entries = {}  # (section, key, field) -> [section, key, field, value, stamp, seq]
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.seq = saved["seq"]
+            for entry in sorted(saved["entries"], key=lambda e: e[5]):
+                self.entries[tuple(entry[:3])] = entry
+    
+    def exchange(self, node, since, changes):
+        """Store the changes that are newer than what we have; return (cursor, changes after since)"""
+        # All or nothing: one malformed entry would break every later exchange
+        check_changes(changes)
+        with self.lock:
+            stored = False
+            for section, key, field, value, stamp in changes:
+                ident = (section, key, field)
+                current = self.entries.get(ident)
+                if current is not None and stamp <= current[4]:
+                    continue
+                # Re-insert so dict order stays seq order and "since" scans stop early
+                self.entries.pop(ident, None)
+                self.seq += 1
+                self.entries[ident] = [section, key, field, value, stamp, self.seq]
+                stored = True
+            if stored:
+                self.save()
+            
+            suffix = ":" + node
+            newer = []
+            for entry in reversed(self.entries.values()):
+                if entry[5] <= since:
+                    break
+                if not entry[4].endswith(suffix):
+                    newer.append(entry[:5])
+            newer.reverse()
+            return self.seq, newer
+    
+    def save(self):
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"seq": self.seq, "entries": list(self.entries.values())}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    store = None
+    token = ""
+    
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"ok": True, "seq": self.store.seq})
+        else:
+            self.send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        if self.path != "/sync":
+            self.send_json(404, {"error": "not found"})
+            return
+        if self.token and self.headers.get("Authorization") != f"Bearer {self.token}":
+            self.send_json(401, {"error": "bad token"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            cursor, changes = self.store.exchange(
+                str(request["node"]), int(request.get("since", 0)), request.get("changes", [])
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        self.send_json(200, {"cursor": cursor, "changes": changes})
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, data=None, token=""):
+    handler = type("Handler", (SyncHandler,), {"store": SyncStore(data), "token": token})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desktop Widgets sync server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default=os.path.join(os.path.expanduser("~"), "desktop_widgets_sync_store.json"))
+    parser.add_argument("--token", default="", help="shared secret clients must send")
+    args = parser.parse_args()
+    if not args.token and not is_loopback(args.host):
+        parser.error("--token is required to listen on a non-loopback address")
+    
+    server = make_server(args.host, args.port, args.data, args.token)
+    print(f"Sync server listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
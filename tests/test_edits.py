@@ -0,0 +1,76 @@
+"""
+Editor text saved through ChangeWatcher against undo and changes from
+elsewhere; needs a display (or Xvfb) and is skipped without one
+"""
+
+import os
+import tempfile
+import unittest
+
+import widgets_data
+import widgets_gui
+from benchmarks import render
+from benchmarks.runner import Skip
+
+
+class EditApp:
+    """Store and change fan-out of DesktopWidgetsApp, with its undo and redo"""
+    
+    undo = widgets_gui.DesktopWidgetsApp.undo
+    redo = widgets_gui.DesktopWidgetsApp.redo
+    flush_edits = widgets_gui.DesktopWidgetsApp.flush_edits
+    on_store_change = render.RenderApp.on_store_change
+    
+    def __init__(self, root, directory):
+        self.root = root
+        self.store = widgets_data.DataStore(os.path.join(directory, "data.json"), os.path.join(directory, "layout.json"))
+        self.data = self.store.data
+        self.date_index = widgets_data.DateIndex(self.data)
+        self.store.listeners.append(self.date_index.update)
+        self.store.listeners.append(self.on_store_change)
+        self.widgets = {}
+    
+    def update_control_panel(self):
+        pass
+
+
+class EditWatchTest(unittest.TestCase):
+    
+    def setUp(self):
+        try:
+            root = render.tk_root()
+        except Skip as e:
+            raise unittest.SkipTest(str(e))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.app = EditApp(root, tmp.name)
+        self.widget = self.app.widgets["day_planner"] = widgets_gui.DayPlannerWidget(root, self.app)
+        self.addCleanup(self.widget.window.destroy)
+        self.day = self.widget.current_date
+        self.entry = self.widget.time_entries[9]["entry"]
+        
+        self.app.store.day_plan.set_slot(self.day, 9, "Gym")
+        self.assertEqual(self.entry.get(), "Gym")
+        self.app.store.history.last_time = 0  # what follows is a new typing burst
+    
+    def slot(self):
+        return self.app.store.day_plan.get(self.day).get("9", "")
+    
+    def test_undo_within_the_save_delay_undoes_the_typing(self):
+        self.entry.insert("end", " class")
+        self.assertEqual(self.slot(), "Gym")  # not saved yet
+        
+        self.app.undo()
+        self.assertEqual((self.slot(), self.entry.get()), ("Gym", "Gym"))
+        self.app.redo()
+        self.assertEqual((self.slot(), self.entry.get()), ("Gym class", "Gym class"))
+    
+    def test_change_from_elsewhere_keeps_a_pending_edit(self):
+        self.entry.insert("end", " class")
+        self.app.store.day_plan.set_slot(self.day, 10, "Lunch")
+        self.assertEqual((self.slot(), self.entry.get()), ("Gym class", "Gym class"))
+        self.assertEqual(self.widget.time_entries[10]["entry"].get(), "Lunch")
+
+
+if __name__ == "__main__":
+    unittest.main()
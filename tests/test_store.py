@@ -0,0 +1,320 @@
+"""
+Headless tests of the data layer: DataStore, its repositories, change
+notifications, undo history, three-way merges and records
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import widgets_data
+
+
+class StoreTestCase(unittest.TestCase):
+    """A DataStore on a data and layout file in a private temporary directory"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.json")
+        self.store = self.open_store()
+        self.events = []
+        self.store.listeners.append(lambda section, key, source: self.events.append((section, key, source)))
+    
+    def open_store(self):
+        return widgets_data.DataStore(self.path, os.path.join(self.tmp.name, "layout.json"))
+    
+    def write_data(self, data):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    
+    def read_data(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class DataStoreTest(StoreTestCase):
+    
+    def test_missing_file_gives_defaults(self):
+        defaults = widgets_data.DataStore.default_data()
+        self.assertEqual(set(self.store.data), set(defaults))
+        self.assertEqual(self.store.todos.all(), [])
+        self.assertEqual(self.store.data["calendar_events"], {})
+    
+    def test_save_and_load_round_trip(self):
+        task = self.store.todos.add("Pay rent", widgets_data.TODO_PRIORITIES[0], due="2026-03-01")
+        note = self.store.notes.add("Call mum")
+        event = self.store.calendar.add("2026-03-02", "Dentist", start="09:30")
+        self.store.day_plan.set_slot("2026-03-02", 9, "Standup")
+        
+        reloaded = self.open_store()
+        self.assertIsInstance(reloaded.todos.all()[0], widgets_data.Todo)
+        self.assertEqual(dict(reloaded.todos.all()[0]), dict(task))
+        self.assertEqual(dict(reloaded.notes.all()[0]), dict(note))
+        self.assertIsInstance(reloaded.calendar.get("2026-03-02")[0], widgets_data.CalendarEvent)
+        self.assertEqual(dict(reloaded.calendar.find("2026-03-02", event["id"])), dict(event))
+        self.assertEqual(reloaded.day_plan.get("2026-03-02"), {"9": "Standup"})
+    
+    def test_load_gives_old_records_ids(self):
+        self.write_data({"todos": [{"text": "No id yet", "done": False}], "sticky_notes": [{"text": "Old note"}]})
+        store = self.open_store()
+        self.assertIn("id", store.todos.all()[0])
+        self.assertIn("id", store.notes.all()[0])
+        self.assertEqual(self.read_data()["todos"][0]["id"], store.todos.all()[0]["id"])
+    
+    def test_load_migrates_calendar_strings(self):
+        self.write_data({"calendar_events": {"2026-01-05": "14:00 Review; 09:00 Gym", "2026-01-06": "  "}})
+        days = self.open_store().data["calendar_events"]
+        self.assertEqual([(e["start"], e["text"]) for e in days["2026-01-05"]], [("09:00", "Gym"), ("14:00", "Review")])
+        self.assertNotIn("2026-01-06", days)
+        self.assertIsInstance(self.read_data()["calendar_events"]["2026-01-05"], list)
+    
+    def test_save_merges_edits_made_by_another_writer(self):
+        other = self.open_store()
+        self.store.day_plan.set_slot("2026-01-05", 9, "Mine")
+        other.day_plan.set_slot("2026-01-06", 10, "Theirs")
+        
+        self.assertTrue(self.store.check_external_changes())
+        self.assertEqual(self.store.day_plan.get("2026-01-06"), {"10": "Theirs"})
+        self.assertIn(("day_planner", "2026-01-06", None), self.events)
+        self.assertEqual(set(self.read_data()["day_planner"]), {"2026-01-05", "2026-01-06"})
+    
+    
+    def test_background_save_keeps_one_write_in_flight(self):
+        self.store.executor = executor = QueuedExecutor()
+        other = self.open_store()
+        other.day_plan.set_slot("2026-01-06", 10, "Theirs")
+        # Merging their edit saves from inside this save
+        self.store.day_plan.set_slot("2026-01-05", 9, "Mine")
+        self.assertEqual(len(executor.jobs), 1)
+        executor.run()
+        self.assertFalse(self.store.writing)
+        self.assertEqual(executor.jobs, [])
+        self.assertEqual(set(self.read_data()["day_planner"]), {"2026-01-05", "2026-01-06"})
+
+
+class QueuedExecutor:
+    """Holds submitted jobs until run(), like a WorkerPool whose workers are busy"""
+    
+    def __init__(self):
+        self.jobs = []
+    
+    def submit(self, fn, *args, priority=None, on_done=None, on_error=None):
+        self.jobs.append((fn, args, on_done))
+    
+    def run(self):
+        while self.jobs:
+            fn, args, on_done = self.jobs.pop(0)
+            on_done(fn(None, *args))
+
+
+class RepositoryTest(StoreTestCase):
+    
+    def test_blank_text_deletes_a_planner_slot(self):
+        self.assertTrue(self.store.day_plan.set_slot("2026-01-05", 9, "Gym"))
+        self.assertFalse(self.store.day_plan.set_slot("2026-01-05", 9, "Gym"))
+        self.assertTrue(self.store.day_plan.set_slot("2026-01-05", 9, "  "))
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {})
+    
+    def test_calendar_days_stay_sorted(self):
+        day = "2026-01-05"
+        late = self.store.calendar.add(day, "Review", start="15:00")
+        self.store.calendar.add(day, "Holiday")
+        early = self.store.calendar.add(day, "Gym", start="07:00", end="08:00")
+        self.assertEqual([e["text"] for e in self.store.calendar.get(day)], ["Holiday", "Gym", "Review"])
+        
+        self.store.calendar.update(day, late["id"], start="06:00")
+        self.assertEqual([e["text"] for e in self.store.calendar.get(day)], ["Holiday", "Review", "Gym"])
+        self.assertEqual(self.store.calendar.overlapping(day, "07:30", "09:00"), [early])
+    
+    def test_removing_the_last_event_removes_the_day(self):
+        event = self.store.calendar.add("2026-01-05", "Dentist")
+        self.store.calendar.remove("2026-01-05", event["id"])
+        self.assertNotIn("2026-01-05", self.store.data["calendar_events"])
+    
+    def test_todos(self):
+        task = self.store.todos.add("Pay rent", widgets_data.TODO_PRIORITIES[1], due="not a date")
+        self.assertNotIn("due", task)
+        self.store.todos.set_done(task["id"], True)
+        self.assertTrue(self.store.todos.all()[0]["done"])
+        self.store.todos.remove(task["id"])
+        self.assertEqual(self.store.todos.all(), [])
+    
+    def test_new_notes_go_first(self):
+        first = self.store.notes.add("First")
+        second = self.store.notes.add("Second")
+        self.assertEqual([n["id"] for n in self.store.notes.all()], [second["id"], first["id"]])
+
+
+class NotificationTest(StoreTestCase):
+    
+    def test_commit_saves_and_notifies_once(self):
+        source = object()
+        self.store.day_plan.set_slot("2026-01-05", 9, "Gym", source)
+        self.assertEqual(self.events, [("day_planner", "2026-01-05", source)])
+        self.assertEqual(self.read_data()["day_planner"], {"2026-01-05": {"9": "Gym"}})
+    
+    def test_transaction_notifies_once_per_key_at_the_end(self):
+        source = object()
+        with self.store.transaction():
+            self.store.day_plan.set_slot("2026-01-05", 9, "Gym", source)
+            self.store.day_plan.set_slot("2026-01-05", 10, "Work", source)
+            self.store.day_plan.set_slot("2026-01-06", 9, "Gym", source)
+            self.store.day_plan.set_slot("2026-01-06", 10, "Work")
+            self.assertEqual(self.events, [])
+            self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.events, [("day_planner", "2026-01-05", source), ("day_planner", "2026-01-06", None)])
+        self.assertEqual(len(self.read_data()["day_planner"]), 2)
+    
+    def test_transaction_by_section(self):
+        with self.store.transaction(by_section=True):
+            with self.store.transaction():
+                self.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+            self.store.day_plan.set_slot("2026-01-06", 9, "Gym")
+            self.store.week_plan.set_day("2026-01-05", 0, "Plan")
+        self.assertEqual(sorted(self.events), [("day_planner", None, None), ("week_planner", None, None)])
+    
+    def test_unchanged_values_do_not_notify(self):
+        self.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.assertEqual(len(self.events), 1)
+
+
+class UndoTest(StoreTestCase):
+    
+    def test_undo_and_redo_an_edit(self):
+        self.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.store.history.last_time = 0  # not part of the same typing burst
+        self.store.day_plan.set_slot("2026-01-05", 9, "Yoga")
+        
+        self.store.undo()
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {"9": "Gym"})
+        self.assertEqual(self.read_data()["day_planner"], {"2026-01-05": {"9": "Gym"}})
+        self.store.undo()
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {})
+        self.store.redo()
+        self.store.redo()
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {"9": "Yoga"})
+        self.assertEqual(self.events[-1], ("day_planner", "2026-01-05", None))
+    
+    def test_typing_burst_undoes_in_one_step(self):
+        for text in ("G", "Gy", "Gym"):
+            self.store.day_plan.set_slot("2026-01-05", 9, text)
+        self.store.undo()
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {})
+    
+    def test_transaction_undoes_in_one_step(self):
+        task = self.store.todos.add("A", widgets_data.TODO_PRIORITIES[1])
+        other = self.store.todos.add("B", widgets_data.TODO_PRIORITIES[1])
+        task["order"], other["order"] = 0, 1
+        self.store.todos.swap_order(task, other)
+        self.assertEqual((task["order"], other["order"]), (1, 0))
+        self.store.undo()
+        self.assertEqual((task["order"], other["order"]), (0, 1))
+    
+    def test_undo_record_insert_and_remove(self):
+        task = self.store.todos.add("A", widgets_data.TODO_PRIORITIES[1])
+        self.store.todos.remove(task["id"])
+        self.store.undo()
+        self.assertEqual([t["id"] for t in self.store.todos.all()], [task["id"]])
+        self.store.undo()
+        self.assertEqual(self.store.todos.all(), [])
+        self.assertIn(("todos", task["id"], None), self.events)
+    
+    def test_new_edit_clears_redo(self):
+        self.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.store.undo()
+        self.store.day_plan.set_slot("2026-01-06", 9, "Gym")
+        self.store.redo()
+        self.assertEqual(self.store.day_plan.get("2026-01-05"), {})
+    
+    def test_history_is_bounded_by_size(self):
+        history = widgets_data.UndoHistory(max_bytes=1000)
+        data = {}
+        for i in range(50):
+            history.last_time = 0
+            path = ("day_planner", "2026-01-05", str(i))
+            path_value = "x" * 100
+            widgets_data.path_set(data, path, path_value)
+            history.record(("set", path, widgets_data.MISSING, path_value))
+        self.assertLessEqual(history.total_bytes, 1000)
+        self.assertLess(len(history.undo_stack), 50)
+        history.undo(data)
+        self.assertNotIn("49", data["day_planner"]["2026-01-05"])
+
+
+class Merge3Test(unittest.TestCase):
+    
+    def merge(self, base, local, remote, path=("day_planner",)):
+        conflicts = []
+        return widgets_data.merge3(base, local, remote, list(path), conflicts), conflicts
+    
+    def test_edits_to_different_keys_both_survive(self):
+        base = {"a": "1", "b": "1"}
+        merged, conflicts = self.merge(base, {"a": "2", "b": "1"}, {"a": "1", "b": "2", "c": "3"})
+        self.assertEqual(merged, {"a": "2", "b": "2", "c": "3"})
+        self.assertEqual(conflicts, [])
+    
+    def test_deletion_against_unchanged_value(self):
+        merged, _ = self.merge({"a": "1", "b": "1"}, {"a": "1", "b": "1"}, {"a": "1"})
+        self.assertEqual(merged, {"a": "1"})
+    
+    def test_conflict_keeps_local_and_reports_path(self):
+        merged, conflicts = self.merge({"k": {"9": "a"}}, {"k": {"9": "b"}}, {"k": {"9": "c"}})
+        self.assertEqual(merged, {"k": {"9": "b"}})
+        self.assertEqual(conflicts, ["day_planner/k/9"])
+    
+    def test_record_lists_merge_by_id(self):
+        base = [widgets_data.Todo({"id": "a", "text": "A"}), widgets_data.Todo({"id": "b", "text": "B"})]
+        local = [widgets_data.Todo({"id": "a", "text": "A2"})]
+        remote = [widgets_data.Todo({"id": "a", "text": "A"}), widgets_data.Todo({"id": "b", "text": "B"}),
+                  widgets_data.Todo({"id": "c", "text": "C"})]
+        merged, conflicts = self.merge(base, local, remote, ("todos",))
+        self.assertEqual([dict(t) for t in merged], [{"id": "a", "text": "A2"}, {"id": "c", "text": "C"}])
+        self.assertTrue(all(isinstance(t, widgets_data.Todo) for t in merged))
+        self.assertEqual(conflicts, [])
+    
+    def test_append_sections_keep_both_sides(self):
+        merged, conflicts = self.merge([1], [1, 2], [1, 3], ("pomodoro_log",))
+        self.assertEqual(merged, [1, 2, 3])
+        self.assertEqual(conflicts, [])
+
+
+class RecordTest(unittest.TestCase):
+    
+    def test_to_records_and_json_round_trip(self):
+        data = {
+            "todos": [{"id": "a", "text": "Pay", "done": False, "priority": widgets_data.TODO_PRIORITIES[2],
+                       "due": "2026-01-01", "tag": "home"}],
+            "sticky_notes": [{"id": "n", "text": "Hi", "time": "Jan 01, 09:00"}],
+            "calendar_events": {"2026-01-01": [{"id": "e", "text": "Gym", "start": "07:00"}]},
+        }
+        original = json.loads(json.dumps(data))
+        widgets_data.to_records(data)
+        todo = data["todos"][0]
+        self.assertIsInstance(todo, widgets_data.Todo)
+        self.assertIsInstance(data["sticky_notes"][0], widgets_data.StickyNote)
+        self.assertIsInstance(data["calendar_events"]["2026-01-01"][0], widgets_data.CalendarEvent)
+        self.assertEqual(todo["priority"], widgets_data.TODO_PRIORITIES[2])
+        self.assertEqual(todo.extra, {"tag": "home"})
+        self.assertEqual(json.loads(json.dumps(data, default=widgets_data.json_default)), original)
+    
+    def test_records_behave_as_dicts(self):
+        todo = widgets_data.Todo({"id": "a", "text": "Pay"})
+        todo["order"] = 3
+        todo["note"] = "extra"
+        del todo["text"]
+        self.assertNotIn("text", todo)
+        self.assertEqual(dict(todo), {"id": "a", "order": 3, "note": "extra"})
+        self.assertEqual(todo.get("text", ""), "")
+        with self.assertRaises(KeyError):
+            del todo["text"]
+    
+    def test_json_default_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            json.dumps({"x": object()}, default=widgets_data.json_default)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Two headless SyncClients exchanging changes through a localhost sync_server
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+import widgets_data
+import sync_server
+
+TOKEN = "secret"
+
+
+class Node:
+    """What SyncClient needs of the app: a store, a worker pool and a status hook"""
+    
+    def __init__(self, directory, server):
+        self.store = widgets_data.DataStore(os.path.join(directory, "data.json"), os.path.join(directory, "layout.json"))
+        self.workers = widgets_data.WorkerPool()
+        self.workers.shutdown()  # jobs run inline from here on
+        self.sync_client = widgets_data.SyncClient(self)
+        self.sync_client.state.update(server=server, token=TOKEN)
+        self.store.listeners.append(self.sync_client.update)
+    
+    def update_sync_status(self):
+        pass
+    
+    def sync(self):
+        if not self.sync_client.sync_now():
+            raise AssertionError("sync did not start")
+        if not self.sync_client.status.startswith("Synced"):
+            raise AssertionError(self.sync_client.status)
+    
+    def todo(self, task_id):
+        return next(task for task in self.store.todos.all() if task["id"] == task_id)
+
+
+class SyncTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.server = sync_server.make_server("127.0.0.1", 0, None, TOKEN)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # Both clients load their state before either saves it, so they get their own node ids
+        state_file = widgets_data.SYNC_STATE_FILE
+        widgets_data.SYNC_STATE_FILE = os.path.join(tmp.name, "sync.json")
+        self.addCleanup(setattr, widgets_data, "SYNC_STATE_FILE", state_file)
+        self.a = self.node(tmp.name, "a")
+        self.b = self.node(tmp.name, "b")
+        self.assertNotEqual(self.a.sync_client.state["node"], self.b.sync_client.state["node"])
+    
+    def node(self, directory, name):
+        path = os.path.join(directory, name)
+        os.mkdir(path)
+        return Node(path, self.url)
+    
+    def round(self, *nodes):
+        for node in nodes:
+            node.sync()
+    
+    def post(self, body, token=TOKEN):
+        request = urllib.request.Request(
+            self.url + "/sync", data=body, method="POST",
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    
+    def test_new_todo_and_slot_reach_the_other_client(self):
+        task = self.a.store.todos.add("Pay rent", widgets_data.TODO_PRIORITIES[0])
+        self.a.store.day_plan.set_slot("2026-01-05", 9, "Standup")
+        self.round(self.a, self.b)
+        self.assertEqual(self.b.todo(task["id"])["text"], "Pay rent")
+        self.assertEqual(self.b.todo(task["id"])["priority"], widgets_data.TODO_PRIORITIES[0])
+        self.assertEqual(self.b.store.day_plan.get("2026-01-05"), {"9": "Standup"})
+    
+    def test_concurrent_edits_to_different_fields_both_survive(self):
+        task = self.a.store.todos.add("Pay rent", widgets_data.TODO_PRIORITIES[1])
+        self.round(self.a, self.b)
+        
+        self.a.store.set_value(("todos", task["id"], "text"), "Pay the rent")
+        self.a.store.commit("todos", task["id"])
+        self.b.store.todos.set_done(task["id"], True)
+        self.round(self.a, self.b, self.a)
+        
+        for node in (self.a, self.b):
+            self.assertEqual(node.todo(task["id"])["text"], "Pay the rent")
+            self.assertTrue(node.todo(task["id"])["done"])
+    
+    def test_later_stamp_wins_on_the_same_field(self):
+        self.a.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.round(self.a, self.b)
+        
+        self.a.store.day_plan.set_slot("2026-01-05", 9, "Yoga")
+        time.sleep(0.01)
+        self.b.store.day_plan.set_slot("2026-01-05", 9, "Run")
+        # The earlier edit reaching the server last must not win either
+        self.round(self.b, self.a, self.b)
+        
+        for node in (self.a, self.b):
+            self.assertEqual(node.store.day_plan.get("2026-01-05"), {"9": "Run"})
+    
+    def test_deletes_propagate(self):
+        task = self.a.store.todos.add("Pay rent", widgets_data.TODO_PRIORITIES[1])
+        self.a.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.round(self.a, self.b)
+        
+        self.b.store.todos.remove(task["id"])
+        self.b.store.day_plan.set_slot("2026-01-05", 9, "")
+        self.round(self.b, self.a)
+        self.assertEqual(self.a.store.todos.all(), [])
+        self.assertEqual(self.a.store.day_plan.get("2026-01-05"), {})
+    
+    def test_bad_token_is_refused(self):
+        status, _ = self.post(b'{"node": "x", "since": 0, "changes": []}', token="wrong")
+        self.assertEqual(status, 401)
+    
+    def test_malformed_requests_are_refused_and_not_stored(self):
+        stamp = "0000000000001:00000:x"
+        for body in (b"not json", b"[]", b'{"since": 0}',
+                     json.dumps({"node": "x", "changes": [["todos", "k", "text", "v", 5]]}).encode(),
+                     json.dumps({"node": "x", "changes": [["todos", "k", "text", "v"]]}).encode(),
+                     json.dumps({"node": "x", "changes": [["todos", 1, "text", "v", stamp]]}).encode(),
+                     json.dumps({"node": "x", "changes": [["todos", "k", "text", "v", "yesterday"]]}).encode(),
+                     json.dumps({"node": "x", "changes": {"todos": 1}}).encode()):
+            status, _ = self.post(body)
+            self.assertEqual(status, 400, body)
+        
+        # Nothing was kept, so clients still sync
+        status, payload = self.post(json.dumps({"node": "y", "since": 0, "changes": []}).encode())
+        self.assertEqual((status, payload["changes"]), (200, []))
+        self.a.store.day_plan.set_slot("2026-01-05", 9, "Gym")
+        self.round(self.a, self.b)
+        self.assertEqual(self.b.store.day_plan.get("2026-01-05"), {"9": "Gym"})
+
+
+if __name__ == "__main__":
+    unittest.main()
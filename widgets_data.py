@@ -0,0 +1,3314 @@
+"""
+Desktop Widgets data: the store behind every widget, its file, undo, sync,
+search, import and export, and the `main.py todo|event|...` command line.
+Nothing here imports tkinter, so the command line starts without it; the
+widgets and the app that shows them are in widgets_gui.
+"""
+
+from datetime import datetime, timedelta, date, timezone
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import re
+import uuid
+import zlib
+import bisect
+import csv
+import heapq
+import io
+import queue
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+
+# ============== DATA FILE ==============
+DATA_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_data_v2.json")
+SEARCH_INDEX_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_search_v1.idx")
+
+
+def new_record_id():
+    """Stable id for list records (todos, sticky notes)"""
+    return uuid.uuid4().hex[:12]
+
+
+# ============== TRACING ==============
+# Widget classes are wrapped with @trace_methods: their load_*, update_*,
+# save_*, on_* methods, create_content and event handlers record a span
+# into a ring buffer while tracing is on. Off, a call costs one flag check.
+# Dump with the control panel, `main.py trace dump` or SIGUSR1, and open
+# the file in chrome://tracing or ui.perfetto.dev.
+TRACE_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_trace.json")
+TRACE_PREFIXES = ("load_", "update_", "save_", "on_", "create_content")
+
+
+class Tracer:
+    """Fixed-size ring buffer of timed spans, exportable as Chrome trace-event JSON"""
+    
+    def __init__(self, size=50000):
+        self.enabled = os.environ.get("DESKTOP_WIDGETS_TRACE") == "1"
+        self.spans = deque(maxlen=size)  # (name, start_ns, end_ns, thread id, detail)
+        self.thread_names = {}
+    
+    def record(self, name, start, detail=""):
+        # deque.append is atomic, so worker threads can record too
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.spans.append((name, start, time.perf_counter_ns(), tid, detail))
+    
+    @contextmanager
+    def span(self, name, detail=""):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, detail)
+    
+    def chrome_events(self):
+        pid = os.getpid()
+        spans = list(self.spans)
+        for tid in {span[3] for span in spans}:
+            yield {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": self.thread_names[tid]}}
+        for name, start, end, tid, detail in spans:
+            yield {
+                "name": name, "cat": "widgets", "ph": "X", "pid": pid, "tid": tid,
+                "ts": start / 1000, "dur": (end - start) / 1000, "args": {"detail": detail} if detail else {}
+            }
+    
+    def dump(self, path=TRACE_FILE):
+        """Write the buffer as Chrome trace-event JSON; returns (path, span count)"""
+        events = list(self.chrome_events())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path, sum(1 for event in events if event["ph"] == "X")
+
+
+TRACER = Tracer()
+
+
+def traced(fn, name=None):
+    """Wrap fn so that each call is a span while TRACER is enabled"""
+    name = name or fn.__qualname__
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not TRACER.enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            TRACER.record(name, start, getattr(args[0], "widget_id", "") if args else "")
+    return wrapper
+
+
+def trace_methods(cls):
+    """Class decorator: trace hot-path methods and anything that takes an `event`"""
+    for attr, value in list(vars(cls).items()):
+        if not hasattr(value, "__code__"):
+            continue  # static and class methods, nested classes
+        code = value.__code__
+        if attr.startswith(TRACE_PREFIXES) or "event" in code.co_varnames[:code.co_argcount]:
+            setattr(cls, attr, traced(value))
+    return cls
+
+
+# ============== TODO ORDERING ==============
+TODO_PRIORITIES = ["🔴 High", "🟡 Medium", "🟢 Low"]
+TODO_PRIORITY_RANK = {label: rank for rank, label in enumerate(TODO_PRIORITIES)}
+TODO_SORT_MODES = {"Priority": "priority", "Manual": "manual", "Due date": "due", "Created": "created"}
+
+
+class TodoIndex:
+    """Todos bucketed by (done, priority), each bucket kept in sort order"""
+    
+    # Buckets hold (sort_key, task_id) tuples kept sorted with bisect, so a
+    # change moves one entry and the done/total counters are bucket lengths.
+    # A filter view is the concatenation of the matching buckets (or a lazy
+    # merge of them when the active sort is not priority-major).
+    
+    def __init__(self, data, sort_mode="priority"):
+        self.data = data
+        self.sort_mode = sort_mode if sort_mode in TODO_SORT_MODES.values() else "priority"
+        self.rebuild()
+    
+    def rebuild(self):
+        self.buckets = {(done, rank): [] for done in (0, 1) for rank in range(len(TODO_PRIORITIES))}
+        self.entries = {}    # task_id -> (bucket, entry)
+        self.tasks = {}      # task_id -> task dict
+        self.next_order = 0
+        
+        tasks = self.data.get("todos", [])
+        for task in tasks:
+            if "order" in task:
+                self.next_order = max(self.next_order, task["order"] + 1)
+        for task in tasks:
+            # Tasks from before manual ordering keep their list position
+            if "order" not in task:
+                task["order"] = self.next_order
+                self.next_order += 1
+        
+        for task in tasks:
+            entry = (self.sort_key(task), task["id"])
+            bucket = self.bucket_of(task)
+            self.buckets[bucket].append(entry)
+            self.entries[task["id"]] = (bucket, entry)
+            self.tasks[task["id"]] = task
+        for bucket in self.buckets.values():
+            bucket.sort()
+    
+    @staticmethod
+    def bucket_of(task):
+        return (1 if task.get("done") else 0, TODO_PRIORITY_RANK.get(task.get("priority"), 1))
+    
+    def sort_key(self, task):
+        mode = self.sort_mode
+        if mode == "manual":
+            return task["order"]
+        if mode == "due":
+            return (task.get("due") or "9999-12-31", task.get("created", ""))
+        if mode == "created":
+            # Newest first
+            try:
+                return -datetime.fromisoformat(task.get("created", "")).timestamp()
+            except ValueError:
+                return 0.0
+        return task.get("created", "")
+    
+    def set_sort(self, mode):
+        if mode != self.sort_mode:
+            self.sort_mode = mode
+            self.rebuild()
+    
+    def add(self, task):
+        task_id = task["id"]
+        if "order" not in task:
+            task["order"] = self.next_order
+        self.next_order = max(self.next_order, task["order"] + 1)
+        
+        entry = (self.sort_key(task), task_id)
+        bucket = self.bucket_of(task)
+        bisect.insort(self.buckets[bucket], entry)
+        self.entries[task_id] = (bucket, entry)
+        self.tasks[task_id] = task
+    
+    def discard(self, task_id):
+        located = self.entries.pop(task_id, None)
+        if located is None:
+            return
+        bucket, entry = located
+        entries = self.buckets[bucket]
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+        del self.tasks[task_id]
+    
+    def refresh(self, task):
+        """Re-position a task after its done flag, priority or sort field changed"""
+        self.discard(task["id"])
+        self.add(task)
+    
+    def update(self, task_id=None):
+        """Resync from the data list after a change made elsewhere"""
+        if task_id is None:
+            self.rebuild()
+            return
+        for task in self.data.get("todos", []):
+            if task.get("id") == task_id:
+                self.refresh(task)
+                return
+        self.discard(task_id)
+    
+    def view(self, filter_val="all"):
+        """Tasks for a filter in display order, without sorting or scanning"""
+        states = {"all": (0, 1), "active": (0,), "done": (1,)}.get(filter_val, (0, 1))
+        for done in states:
+            buckets = [self.buckets[(done, rank)] for rank in range(len(TODO_PRIORITIES))]
+            if self.sort_mode == "priority":
+                entries = (entry for bucket in buckets for entry in bucket)
+            else:
+                entries = heapq.merge(*buckets)
+            for _, task_id in entries:
+                yield self.tasks[task_id]
+    
+    def counts(self):
+        """(done, total) from the bucket sizes"""
+        done = sum(len(self.buckets[(1, rank)]) for rank in range(len(TODO_PRIORITIES)))
+        return done, done + sum(len(self.buckets[(0, rank)]) for rank in range(len(TODO_PRIORITIES)))
+    
+    def neighbour(self, task_id, step):
+        """The task `step` places away in the same done-state list, or None"""
+        task = self.tasks[task_id]
+        ordered = list(self.view("done" if task.get("done") else "active"))
+        target = ordered.index(task) + step
+        return ordered[target] if 0 <= target < len(ordered) else None
+
+
+# ============== POMODORO SESSION LEDGER ==============
+class SessionLedger:
+    """Append-only log of finished pomodoro intervals with running rollups"""
+    
+    # Rows are [start, end, kind, seconds(, label)] with epoch-second times.
+    # Rollup buckets hold [work_seconds, break_seconds, work_sessions] per
+    # day, ISO week and month and are updated on append, never rescanned.
+    
+    def __init__(self, data):
+        self.data = data
+        if "pomodoro_log" not in data:
+            data["pomodoro_log"] = []
+        self.log = data["pomodoro_log"]
+        
+        rollups = data.get("pomodoro_rollups")
+        if not isinstance(rollups, dict) or rollups.get("count") != len(self.log):
+            # Missing or out of step with the log (older file, crash between
+            # writes) - rebuild once, afterwards everything is incremental
+            self.rebuild_rollups()
+        self.rollups = data["pomodoro_rollups"]
+    
+    @staticmethod
+    def period_keys(timestamp):
+        dt = datetime.fromtimestamp(timestamp)
+        iso_year, iso_week, _ = dt.isocalendar()
+        return {
+            "day": dt.strftime("%Y-%m-%d"),
+            "week": f"{iso_year}-W{iso_week:02d}",
+            "month": dt.strftime("%Y-%m")
+        }
+    
+    def rebuild_rollups(self):
+        self.rollups = {"count": 0, "total": [0, 0, 0], "day": {}, "week": {}, "month": {}}
+        self.data["pomodoro_rollups"] = self.rollups
+        for row in self.log:
+            self.add_to_rollups(row[0], row[2], row[3])
+    
+    def add_to_rollups(self, start, kind, seconds):
+        slot = 0 if kind == "work" else 1
+        targets = [self.rollups["total"]]
+        for period, key in self.period_keys(start).items():
+            bucket = self.rollups[period]
+            if key not in bucket:
+                bucket[key] = [0, 0, 0]
+            targets.append(bucket[key])
+        
+        for totals in targets:
+            totals[slot] += seconds
+            if kind == "work":
+                totals[2] += 1
+        self.rollups["count"] += 1
+    
+    def update(self, section, key=None, source=None):
+        """Change listener: if the log was replaced (external merge, sync), rebuild the rollups"""
+        if section == "pomodoro_log" and self.data.get("pomodoro_log") is not self.log:
+            self.log = self.data.setdefault("pomodoro_log", [])
+            self.rebuild_rollups()
+    
+    def record(self, start, end, kind, seconds, label=""):
+        """Append a finished interval and fold it into the rollups"""
+        row = [int(start), int(end), kind, int(seconds)]
+        if label:
+            row.append(label)
+        self.log.append(row)
+        self.add_to_rollups(row[0], kind, row[3])
+        return row
+    
+    def totals(self, period, key):
+        """[work_seconds, break_seconds, work_sessions] for a period key"""
+        if period == "total":
+            return self.rollups["total"]
+        return self.rollups[period].get(key, [0, 0, 0])
+    
+    def summary(self, now=None):
+        """Focus minutes and session counts for today, this week and all time"""
+        keys = self.period_keys(now if now is not None else time.time())
+        today = self.totals("day", keys["day"])
+        week = self.totals("week", keys["week"])
+        total = self.totals("total", None)
+        return {
+            "today_minutes": today[0] // 60,
+            "week_minutes": week[0] // 60,
+            "total_minutes": total[0] // 60,
+            "today_sessions": today[2]
+        }
+
+
+# ============== HABIT STATISTICS ==============
+def longest_run(bits):
+    """Length of the longest run of set bits, in O(log run) big-int operations"""
+    if not bits:
+        return 0
+    # starts[k] marks the bits that begin a run of at least 2**k ones
+    starts = [bits]
+    while True:
+        step = 1 << (len(starts) - 1)
+        longer = starts[-1] & (starts[-1] >> step)
+        if not longer:
+            break
+        starts.append(longer)
+    
+    length = 1 << (len(starts) - 1)
+    current = starts[-1]
+    for k in range(len(starts) - 2, -1, -1):
+        candidate = current & (starts[k] >> length)
+        if candidate:
+            current = candidate
+            length += 1 << k
+    return length
+
+
+class HabitStats:
+    """Per-habit completion bitsets over all history with cached streaks and rates"""
+    
+    # Bit i of a habit's integer is day ordinal (base + i). Streaks and rates
+    # are computed with whole-integer shifts, masks and bit counts, cached,
+    # and adjusted in place when a single day is toggled.
+    
+    RATE_WINDOWS = (7, 30, 365)
+    
+    def __init__(self, data):
+        self.data = data
+        self.build()
+    
+    def build(self):
+        self.bits = {}
+        self.base = None
+        self.cache = {}
+        for week_key, habits in self.data.get("habit_tracking", {}).items():
+            try:
+                week_start = date_key_to_ordinal(week_key)
+            except ValueError:
+                continue
+            for habit_key, days in habits.items():
+                for day in days:
+                    self.set_bit(habit_key, week_start + day, True)
+    
+    def update(self, section, key=None, source=None):
+        """Change listener: resync one tracked week, or everything"""
+        if section != "habit_tracking":
+            return
+        if key is None:
+            self.build()
+            return
+        
+        week_start = date_key_to_ordinal(key)
+        week = self.data.get("habit_tracking", {}).get(key, {})
+        for habit_key in set(self.bits) | set(week):
+            days = week.get(habit_key, [])
+            for day in range(7):
+                if self.is_set(habit_key, week_start + day) != (day in days):
+                    self.set_day(habit_key, week_start + day, day in days)
+    
+    def set_bit(self, habit_key, ordinal, done):
+        if self.base is None:
+            self.base = ordinal
+        elif ordinal < self.base:
+            shift = self.base - ordinal
+            self.bits = {k: v << shift for k, v in self.bits.items()}
+            self.base = ordinal
+        
+        mask = 1 << (ordinal - self.base)
+        bits = self.bits.get(habit_key, 0)
+        self.bits[habit_key] = bits | mask if done else bits & ~mask
+    
+    def is_set(self, habit_key, ordinal):
+        if self.base is None or ordinal < self.base:
+            return False
+        return bool(self.bits.get(habit_key, 0) >> (ordinal - self.base) & 1)
+    
+    def set_day(self, habit_key, ordinal, done):
+        """Record a toggle and adjust the cached stats without a recount"""
+        if self.is_set(habit_key, ordinal) == done:
+            return
+        self.set_bit(habit_key, ordinal, done)
+        
+        stats = self.cache.get(habit_key)
+        if stats is None or stats["today"] != date.today().toordinal():
+            self.cache.pop(habit_key, None)
+            return
+        
+        delta = 1 if done else -1
+        for window in self.RATE_WINDOWS:
+            if stats["today"] - window < ordinal <= stats["today"]:
+                stats["counts"][window] += delta
+        
+        # Streaks near the toggled day change; they are recomputed lazily
+        if stats["current"] is not None and ordinal >= stats["today"] - stats["current"] - 1:
+            stats["current"] = None
+        if done:
+            if stats["longest"] is not None:
+                stats["longest"] = max(stats["longest"], self.run_through(habit_key, ordinal))
+        else:
+            stats["longest"] = None
+    
+    def window_bits(self, habit_key, first, last):
+        """Bits for ordinals first..last, bit 0 = first"""
+        bits = self.bits.get(habit_key, 0)
+        if self.base is None or last < self.base:
+            return 0
+        if first < self.base:
+            bits <<= self.base - first
+        else:
+            bits >>= first - self.base
+        return bits & ((1 << (last - first + 1)) - 1)
+    
+    def run_ending_at(self, habit_key, ordinal):
+        """Consecutive done days ending at ordinal (inclusive)"""
+        if self.base is None or ordinal < self.base:
+            return 0
+        width = ordinal - self.base + 1
+        gaps = ~self.bits.get(habit_key, 0) & ((1 << width) - 1)
+        return width if not gaps else width - gaps.bit_length()
+    
+    def run_through(self, habit_key, ordinal):
+        """Length of the run of done days containing ordinal"""
+        if not self.is_set(habit_key, ordinal):
+            return 0
+        bits = self.bits.get(habit_key, 0) >> (ordinal - self.base)
+        after = (~bits & (bits + 1)).bit_length() - 1
+        return self.run_ending_at(habit_key, ordinal) + after - 1
+    
+    def stats(self, habit_key):
+        """Current/longest streak and 7/30/365-day completion rates"""
+        today = date.today().toordinal()
+        stats = self.cache.get(habit_key)
+        if stats is None or stats["today"] != today:
+            stats = {
+                "today": today,
+                "current": None,
+                "longest": None,
+                "counts": {w: self.window_bits(habit_key, today - w + 1, today).bit_count() for w in self.RATE_WINDOWS}
+            }
+            self.cache[habit_key] = stats
+        
+        if stats["current"] is None:
+            # A streak stays alive through today until today is missed
+            end = today if self.is_set(habit_key, today) else today - 1
+            stats["current"] = self.run_ending_at(habit_key, end)
+        if stats["longest"] is None:
+            stats["longest"] = longest_run(self.bits.get(habit_key, 0))
+        
+        return {
+            "current": stats["current"],
+            "longest": stats["longest"],
+            "rates": {w: stats["counts"][w] / w for w in self.RATE_WINDOWS}
+        }
+
+
+# ============== MONTHLY PLAN ==============
+# (label, key, lines) of each section; the monthly planner widget draws
+# them and the Markdown export writes them in this order
+MONTH_PLAN_SECTIONS = [
+    ("🎯 Main Goals", "goals", 4),
+    ("📋 Key Tasks", "tasks", 4),
+    ("💡 Ideas & Projects", "ideas", 3),
+    ("📚 Learning", "learning", 2),
+    ("💪 Habits to Build", "habits", 2),
+    ("📝 Notes", "notes", 3)
+]
+
+
+# ============== SEARCH INDEX ==============
+SEARCH_SECTIONS = ("calendar_events", "day_planner", "week_planner", "monthly_planner", "sticky_notes", "todos")
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+SEARCH_PREFIX_TERMS = 32
+
+
+class SearchIndex:
+    """Inverted index over the text of all planner, note and todo entries"""
+    
+    # Documents are addressed as "section|key|sub": key is the date/week/month
+    # key (or record id for list sections) and sub the hour, weekday or
+    # monthly section. Internally each document gets a small integer number
+    # so postings are int sets, and each keeps a crc32 of its text so a
+    # persisted index is reconciled at startup without re-tokenizing.
+    
+    BLOBS = 7
+    MAGIC = b"DWSI1\n"
+    
+    def __init__(self, data):
+        self.data = data
+        self.clear()
+    
+    def clear(self):
+        self.doc_ids = []     # num -> doc_id (None for free slots)
+        self.doc_nums = {}    # doc_id -> num
+        self.doc_crcs = array("I")
+        self.doc_terms = []   # num -> tuple of terms, None while still on disk
+        self.doc_keys = []    # num -> sort_key, None until first ranked after a load
+        self.free_nums = []
+        self.postings = {}    # term -> set(num); empty for a stored term that is gone
+        self.groups = {}      # (section, key) -> set(num), None until first needed
+        self.vocab = []
+        self.vocab_dirty = True
+        self.dirty = False
+        self.stamp = None
+        
+        # Postings and per-document terms of a loaded index stay packed in
+        # arrays and are only turned into Python sets when touched. The
+        # arrays are never changed; pack() copies what is untouched as is.
+        self.stored_terms = []
+        self.stored_term_nums = {}
+        self.post_offsets = self.post_data = array("I")
+        self.term_offsets = self.term_data = array("I")
+    
+    @staticmethod
+    def tokenize(text):
+        return set(SEARCH_TOKEN_RE.findall(text.lower()))
+    
+    @staticmethod
+    def split_doc_id(doc_id):
+        section, key, sub = doc_id.split("|", 2)
+        return section, key, sub
+    
+    @staticmethod
+    def data_stamp():
+        try:
+            st = os.stat(DATA_FILE)
+            return [st.st_mtime_ns, st.st_size]
+        except OSError:
+            return None
+    
+    def iter_docs(self, section, key=None):
+        """Yield (doc_id, text) for a whole section or for one of its keys"""
+        if section == "calendar_events":
+            days = self.data.get(section, {})
+            keys = days.keys() if key is None else [key]
+            for k in keys:
+                for event in days.get(k, []):
+                    if event.get("text"):
+                        yield f"{section}|{k}|{event['id']}", event["text"]
+        elif section in ("day_planner", "week_planner", "monthly_planner"):
+            entries = self.data.get(section, {})
+            keys = entries.keys() if key is None else [key]
+            for k in keys:
+                for sub, text in entries.get(k, {}).items():
+                    if text:
+                        yield f"{section}|{k}|{sub}", text
+        else:
+            for record in self.data.get(section, []):
+                record_id = record.get("id")
+                if record_id and (key is None or record_id == key):
+                    if record.get("text"):
+                        yield f"{section}|{record_id}|", record["text"]
+                    if key is not None:
+                        break
+    
+    def posting(self, term):
+        """Doc number set for a term, unpacking it from the loaded arrays once"""
+        nums = self.postings.get(term)
+        if nums is None:
+            i = self.stored_term_nums.get(term)
+            if i is None:
+                return None
+            nums = self.postings[term] = set(self.post_data[self.post_offsets[i]:self.post_offsets[i + 1]])
+        return nums
+    
+    def terms_of(self, num):
+        terms = self.doc_terms[num]
+        if terms is None:
+            stored = self.stored_terms
+            terms = self.doc_terms[num] = tuple(
+                stored[t] for t in self.term_data[self.term_offsets[num]:self.term_offsets[num + 1]]
+            )
+        return terms
+    
+    def group_index(self):
+        """(section, key) -> doc numbers, built on first edit after a load"""
+        if self.groups is None:
+            self.groups = {}
+            for num, doc_id in enumerate(self.doc_ids):
+                if doc_id is not None:
+                    section, key, _ = doc_id.split("|", 2)
+                    group = self.groups.get((section, key))
+                    if group is None:
+                        self.groups[(section, key)] = {num}
+                    else:
+                        group.add(num)
+        return self.groups
+    
+    def add_doc(self, doc_id, crc, terms):
+        if self.free_nums:
+            num = self.free_nums.pop()
+            self.doc_ids[num] = doc_id
+            self.doc_crcs[num] = crc
+            self.doc_terms[num] = terms
+            self.doc_keys[num] = self.sort_key(doc_id)
+        else:
+            num = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self.doc_crcs.append(crc)
+            self.doc_terms.append(terms)
+            self.doc_keys.append(self.sort_key(doc_id))
+        self.doc_nums[doc_id] = num
+        
+        section, key, _ = self.split_doc_id(doc_id)
+        self.group_index().setdefault((section, key), set()).add(num)
+        for term in terms:
+            nums = self.posting(term)
+            if nums is None:
+                nums = self.postings[term] = set()
+            if not nums:
+                self.vocab_dirty = True
+            nums.add(num)
+    
+    def remove_doc(self, num):
+        doc_id = self.doc_ids[num]
+        section, key, _ = self.split_doc_id(doc_id)
+        groups = self.group_index()
+        group = groups.get((section, key))
+        if group is not None:
+            group.discard(num)
+            if not group:
+                del groups[(section, key)]
+        for term in self.terms_of(num):
+            nums = self.posting(term)
+            if nums is not None:
+                nums.discard(num)
+                if not nums:
+                    if term not in self.stored_term_nums:
+                        del self.postings[term]
+                    self.vocab_dirty = True
+        
+        del self.doc_nums[doc_id]
+        self.doc_ids[num] = None
+        self.doc_terms[num] = ()
+        self.doc_keys[num] = None
+        self.free_nums.append(num)
+        self.dirty = True
+    
+    def index_doc(self, doc_id, text):
+        crc = zlib.crc32(text.encode("utf-8"))
+        num = self.doc_nums.get(doc_id)
+        if num is not None:
+            if self.doc_crcs[num] == crc:
+                return
+            self.remove_doc(num)
+        self.add_doc(doc_id, crc, tuple(self.tokenize(text)))
+        self.dirty = True
+    
+    def update(self, section, key=None, source=None):
+        """Re-index one key of a section (or the whole section if key is None)"""
+        if section not in SEARCH_SECTIONS:
+            return
+        groups = self.group_index()
+        if key is None:
+            stale = {n for (s, _), nums in groups.items() if s == section for n in nums}
+        else:
+            stale = set(groups.get((section, key), ()))
+        
+        for doc_id, text in self.iter_docs(section, key):
+            stale.discard(self.doc_nums.get(doc_id))
+            self.index_doc(doc_id, text)
+        
+        for num in stale:
+            self.remove_doc(num)
+    
+    def rebuild(self):
+        for section in SEARCH_SECTIONS:
+            self.update(section)
+    
+    def load(self, path=SEARCH_INDEX_FILE):
+        """Load the persisted index, reconciling it if the data file moved on"""
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    raise ValueError("unknown search index format")
+                header = json.loads(f.readline())
+                if len(header["sizes"]) != self.BLOBS:
+                    raise ValueError("unknown search index layout")
+                blobs = []
+                for size in header["sizes"]:
+                    blob = f.read(size)
+                    if len(blob) != size:
+                        raise ValueError("truncated search index")
+                    blobs.append(blob)
+            
+            doc_ids = blobs[0].decode("utf-8").split("\n") if blobs[0] else []
+            self.doc_ids = [doc_id or None for doc_id in doc_ids]
+            # Blank names are slots of terms that were gone when it was packed
+            self.stored_terms = blobs[1].decode("utf-8").split("\n") if blobs[1] else []
+            self.stored_term_nums = {term: i for i, term in enumerate(self.stored_terms) if term}
+            arrays = []
+            for blob in blobs[2:]:
+                packed = array("I")
+                packed.frombytes(blob)
+                arrays.append(packed)
+            self.doc_crcs, self.post_offsets, self.post_data, self.term_offsets, self.term_data = arrays
+            self.check_arrays()
+            self.doc_terms = [None] * len(self.doc_ids)
+            self.doc_keys = [None] * len(self.doc_ids)
+            self.doc_nums = dict(zip(doc_ids, range(len(doc_ids))))
+            if "" in self.doc_nums:
+                del self.doc_nums[""]
+                self.free_nums = [num for num, doc_id in enumerate(self.doc_ids) if doc_id is None]
+                for num in self.free_nums:
+                    self.doc_terms[num] = ()
+            self.groups = None
+            self.stamp = header.get("stamp")
+        except Exception:
+            self.clear()
+        
+        # Unchanged data file: nothing to do. Otherwise only entries whose
+        # text changed since the index was written are tokenized again.
+        if self.stamp is None or self.stamp != self.data_stamp():
+            self.rebuild()
+    
+    def check_arrays(self):
+        """Raise ValueError unless the loaded arrays fit together"""
+        docs, terms = len(self.doc_ids), len(self.stored_terms)
+        for offsets, values, count in ((self.post_offsets, self.post_data, terms),
+                                       (self.term_offsets, self.term_data, docs)):
+            if len(offsets) != count + 1 or offsets[0] != 0 or offsets[-1] != len(values):
+                raise ValueError("inconsistent search index")
+            if any(a > b for a, b in zip(offsets, offsets[1:])):
+                raise ValueError("inconsistent search index")
+        if len(self.doc_crcs) != docs:
+            raise ValueError("inconsistent search index")
+    
+    def save(self, path=SEARCH_INDEX_FILE):
+        """Write the index in packed form; call right after the data is saved"""
+        packed = self.pack()
+        stamp = self.data_stamp()
+        try:
+            if packed is not None:
+                self.mark_saved(self.write_packed(None, packed, path))
+            elif self.stamp is not None and self.stamp != stamp:
+                # Only other sections changed since: the saved index is still right
+                self.mark_saved(self.restamp(path, stamp))
+        except Exception as e:
+            self.write_failed(e)
+    
+    def pack(self):
+        """(stamp, parts) for write_packed, or None if nothing changed since the last one"""
+        if not self.dirty:
+            return None
+        stamp = self.data_stamp()
+        
+        # Stored terms keep their numbers, so the term lists of documents
+        # never touched since the load are copied across unchanged. Terms
+        # that are gone leave a blank slot that new terms fill first.
+        terms = list(self.stored_terms)
+        term_nums = dict(self.stored_term_nums)
+        free = [i for i, term in enumerate(terms) if not term]
+        for term, nums in self.postings.items():
+            i = term_nums.get(term)
+            if i is not None and not nums:
+                terms[i] = ""
+                free.append(i)
+        free.reverse()
+        for term, nums in self.postings.items():
+            if nums and term not in term_nums:
+                if free:
+                    term_nums[term] = i = free.pop()
+                    terms[i] = term
+                else:
+                    term_nums[term] = len(terms)
+                    terms.append(term)
+        
+        old_offsets, old_data = self.post_offsets, self.post_data
+        post_offsets, post_data = array("I", [0]), array("I")
+        for i, term in enumerate(terms):
+            nums = self.postings.get(term) if term else None
+            if nums is not None:
+                post_data.extend(nums)
+            elif term and i < len(old_offsets) - 1:
+                post_data.extend(old_data[old_offsets[i]:old_offsets[i + 1]])
+            post_offsets.append(len(post_data))
+        
+        old_offsets, old_data = self.term_offsets, self.term_data
+        term_offsets, term_data = array("I", [0]), array("I")
+        run = None  # first doc of the current run of untouched docs
+        for num, doc_terms in enumerate(self.doc_terms + [()]):
+            if doc_terms is None:
+                if run is None:
+                    run = num
+                continue
+            if run is not None:
+                # Copy a whole run of untouched docs at once, offsets shifted
+                shift = len(term_data) - old_offsets[run]
+                term_data.extend(old_data[old_offsets[run]:old_offsets[num]])
+                if shift:
+                    term_offsets.extend(offset + shift for offset in old_offsets[run + 1:num + 1])
+                else:
+                    term_offsets.extend(old_offsets[run + 1:num + 1])
+                run = None
+            if num < len(self.doc_terms):
+                term_data.extend(term_nums[t] for t in doc_terms)
+                term_offsets.append(len(term_data))
+        
+        blobs = [
+            "\n".join(doc_id or "" for doc_id in self.doc_ids).encode("utf-8"),
+            "\n".join(terms).encode("utf-8"),
+            self.doc_crcs.tobytes(),
+            post_offsets.tobytes(),
+            post_data.tobytes(),
+            term_offsets.tobytes(),
+            term_data.tobytes()
+        ]
+        header = json.dumps({"stamp": stamp, "sizes": [len(b) for b in blobs]}).encode("utf-8") + b"\n"
+        # Edits from here on make it dirty again
+        self.dirty = False
+        return stamp, [self.MAGIC, header] + blobs
+    
+    @staticmethod
+    def write_packed(job, packed, path=SEARCH_INDEX_FILE):
+        """Write pack() output; safe on a worker thread. Returns the stamp"""
+        stamp, parts = packed
+        # Aside and renamed over, so a crash never leaves a truncated index
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            for part in parts:
+                f.write(part)
+        os.replace(temp_path, path)
+        return stamp
+    
+    @classmethod
+    def restamp(cls, path, stamp):
+        """Rewrite only the stamp of a saved index that is still current"""
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError("unknown search index format")
+            header = json.loads(f.readline())
+            body = f.read()
+        header["stamp"] = stamp
+        return cls.write_packed(None, (stamp, [cls.MAGIC, json.dumps(header).encode("utf-8") + b"\n", body]), path)
+    
+    def mark_saved(self, stamp):
+        self.stamp = stamp
+    
+    def write_failed(self, error):
+        self.dirty = True
+        print(f"Search index save error: {error}")
+    
+    def expand_prefix(self, prefix, limit=SEARCH_PREFIX_TERMS):
+        if self.vocab_dirty:
+            postings = self.postings
+            self.vocab = sorted({term for term, nums in postings.items() if nums}
+                                | {term for term in self.stored_term_nums if term not in postings})
+            self.vocab_dirty = False
+        start = bisect.bisect_left(self.vocab, prefix)
+        terms = []
+        for term in self.vocab[start:start + limit]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+    
+    def search(self, query, limit=100):
+        """Return up to `limit` doc ids matching all query words, newest first"""
+        words = SEARCH_TOKEN_RE.findall(query.lower())
+        if not words:
+            return []
+        
+        candidates = []
+        for word in words[:-1]:
+            nums = self.posting(word)
+            if not nums:
+                return []
+            candidates.append(nums)
+        candidates.sort(key=len)
+        result = None
+        for nums in candidates:
+            result = nums if result is None else result & nums
+            if not result:
+                return []
+        
+        # The last word is matched as a prefix so results follow typing; the
+        # expansion is capped and each term narrowed by the other words first
+        last = words[-1]
+        if len(last) < 2:
+            postings = [self.posting(last)]
+        else:
+            postings = [self.posting(t) for t in self.expand_prefix(last)]
+        postings = [nums if result is None else nums & result for nums in postings if nums]
+        if not postings:
+            return []
+        result = postings[0] if len(postings) == 1 else set().union(*postings)
+        if not result:
+            return []
+        
+        doc_ids, keys = self.doc_ids, self.doc_keys
+        for num in result:
+            if keys[num] is None:
+                keys[num] = self.sort_key(doc_ids[num])
+        return [doc_ids[n] for n in heapq.nlargest(limit, result, key=keys.__getitem__)]
+    
+    @classmethod
+    def sort_key(cls, doc_id):
+        """Newest date key first; undated records (notes, todos) last"""
+        section, key, sub = cls.split_doc_id(doc_id)
+        if section in ("sticky_notes", "todos"):
+            return f"\0{section}\0{key}"
+        return f"{key}\0{section}\0{sub}"
+    
+    def get_text(self, doc_id):
+        section, key, sub = self.split_doc_id(doc_id)
+        if section == "calendar_events":
+            for event in self.data.get(section, {}).get(key, []):
+                if event.get("id") == sub:
+                    return event_label(event)
+            return ""
+        if section in ("day_planner", "week_planner", "monthly_planner"):
+            return self.data.get(section, {}).get(key, {}).get(sub, "")
+        for record in self.data.get(section, []):
+            if record.get("id") == key:
+                return record.get("text", "")
+        return ""
+
+
+# ============== DATE INDEX ==============
+DATE_SECTIONS = ("calendar_events", "day_planner", "week_planner", "monthly_planner", "habit_tracking")
+MONTH_SECTIONS = ("monthly_planner",)
+
+
+@functools.lru_cache(maxsize=8192)
+def date_key_to_ordinal(key):
+    """'YYYY-MM-DD' (or 'YYYY-MM' for the first of the month) -> day ordinal"""
+    return date(int(key[:4]), int(key[5:7]), int(key[8:10]) if len(key) > 7 else 1).toordinal()
+
+
+@functools.lru_cache(maxsize=8192)
+def ordinal_to_date_key(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+@functools.lru_cache(maxsize=1024)
+def long_date_label(key):
+    return date.fromordinal(date_key_to_ordinal(key)).strftime("%A, %B %d, %Y")
+
+
+class DateIndex:
+    """Sorted day ordinals of the non-empty keys of each date-keyed section"""
+    
+    def __init__(self, data):
+        self.data = data
+        self.ordinals = {}
+        for section in DATE_SECTIONS:
+            self.update(section)
+    
+    def to_key(self, section, ordinal):
+        key = ordinal_to_date_key(ordinal)
+        return key[:7] if section in MONTH_SECTIONS else key
+    
+    def update(self, section, key=None, source=None):
+        """Keep the sorted ordinals in step with one edited key (or a whole section)"""
+        if section not in DATE_SECTIONS:
+            return
+        entries = self.data.get(section, {})
+        if key is None:
+            ordinals = set()
+            for k, value in entries.items():
+                if value:
+                    try:
+                        ordinals.add(date_key_to_ordinal(k))
+                    except ValueError:
+                        pass
+            self.ordinals[section] = sorted(ordinals)
+            return
+        
+        try:
+            ordinal = date_key_to_ordinal(key)
+        except ValueError:
+            return
+        ordinals = self.ordinals.setdefault(section, [])
+        i = bisect.bisect_left(ordinals, ordinal)
+        present = i < len(ordinals) and ordinals[i] == ordinal
+        if entries.get(key) and not present:
+            ordinals.insert(i, ordinal)
+        elif not entries.get(key) and present:
+            del ordinals[i]
+    
+    def range_ordinals(self, section, first, last):
+        """Ordinals with content between first and last (inclusive)"""
+        ordinals = self.ordinals.get(section, [])
+        return ordinals[bisect.bisect_left(ordinals, first):bisect.bisect_right(ordinals, last)]
+    
+    def range_keys(self, section, first_key, last_key):
+        """Keys with content between two keys of the section's format (inclusive)"""
+        first = date_key_to_ordinal(first_key)
+        last = date_key_to_ordinal(last_key)
+        return [self.to_key(section, o) for o in self.range_ordinals(section, first, last)]
+    
+    def next_key(self, section, key):
+        """Nearest later key with content, or None"""
+        ordinals = self.ordinals.get(section, [])
+        i = bisect.bisect_right(ordinals, date_key_to_ordinal(key))
+        return self.to_key(section, ordinals[i]) if i < len(ordinals) else None
+    
+    def prev_key(self, section, key):
+        """Nearest earlier key with content, or None"""
+        ordinals = self.ordinals.get(section, [])
+        i = bisect.bisect_left(ordinals, date_key_to_ordinal(key))
+        return self.to_key(section, ordinals[i - 1]) if i > 0 else None
+
+
+# ============== RECORDS ==============
+# Todos and sticky notes are held in memory as slotted records rather than
+# dicts: no per-record hash table, the priority as a small int, due dates
+# interned. They still read and write like the dicts they replace (the undo
+# paths, merges, sync and widgets all say task["text"]); DataStore turns
+# them into records on load and back into JSON objects on save.
+class Record(MutableMapping):
+    """A slotted record that behaves as a dict; unknown keys go to `extra`"""
+    
+    __slots__ = ("extra",)
+    FIELDS = ()  # keys kept in slots, in on-disk order
+    CODED = ()   # the FIELDS whose stored form decode() changes
+    
+    def __init__(self, fields=()):
+        self.extra = None
+        # Runs once per record on every load; skip the per-key __setitem__
+        fields = fields.items() if isinstance(fields, (dict, Record)) else fields
+        slots, encode = self.FIELDS, self.encode
+        for key, value in fields:
+            if key in slots:
+                setattr(self, key, encode(key, value))
+            else:
+                self[key] = value
+    
+    def encode(self, key, value):
+        return value
+    
+    def decode(self, key, value):
+        return value
+    
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return self.decode(key, getattr(self, key))
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, self.encode(key, value))
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+    
+    def __contains__(self, key):
+        if key in self.FIELDS:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+    
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_json()!r})"
+    
+    def to_json(self):
+        # Called for every record on every save, so not dict(self.items())
+        data = {key: getattr(self, key) for key in self.FIELDS if hasattr(self, key)}
+        for key in self.CODED:
+            if key in data:
+                data[key] = self.decode(key, data[key])
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class Todo(Record):
+    __slots__ = FIELDS = ("id", "text", "done", "priority", "created", "due", "order")
+    CODED = ("priority",)
+    
+    def encode(self, key, value):
+        if key == "priority":
+            return TODO_PRIORITY_RANK.get(value, value)  # unknown labels stay strings
+        if key == "due" and isinstance(value, str):
+            return sys.intern(value)
+        return value
+    
+    def decode(self, key, value):
+        if key == "priority" and isinstance(value, int):
+            return TODO_PRIORITIES[value]
+        return value
+
+
+class StickyNote(Record):
+    __slots__ = FIELDS = ("id", "text", "time")
+
+
+class CalendarEvent(Record):
+    __slots__ = FIELDS = ("id", "text", "start", "end", "color")
+    
+    def encode(self, key, value):
+        # "HH:MM" times and colours repeat across thousands of days
+        if key in ("start", "end", "color") and isinstance(value, str):
+            return sys.intern(value)
+        return value
+
+
+RECORD_TYPES = {"todos": Todo, "sticky_notes": StickyNote}
+
+
+def to_records(data):
+    """Turn the JSON objects of the record sections into records, in place; returns data"""
+    for section, cls in RECORD_TYPES.items():
+        items = data.get(section)
+        if isinstance(items, list):
+            data[section] = [cls(item) if isinstance(item, dict) else item for item in items]
+    days = data.get("calendar_events")
+    if isinstance(days, dict):
+        for day, events in days.items():
+            if isinstance(events, list):
+                days[day] = [CalendarEvent(event) if isinstance(event, dict) else event for event in events]
+    return data
+
+
+# A calendar day is a list of events ({"id", "text"} plus optional "start"
+# and "end" as "HH:MM" and a "color"), kept in event_sort_key order on
+# every write so readers never sort: all-day events first, then by time.
+EVENT_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def event_time(text):
+    """'9:05' -> '09:05', '' -> ''; ValueError for anything else"""
+    text = text.strip()
+    if not text:
+        return ""
+    match = EVENT_TIME_RE.fullmatch(text)
+    if match is None or int(match[1]) > 23 or int(match[2]) > 59:
+        raise ValueError(f"not a time: '{text}'")
+    return f"{int(match[1]):02d}:{match[2]}"
+
+
+def event_sort_key(event):
+    return (event.get("start", ""), event.get("end", ""))
+
+
+def event_label(event):
+    """'09:00-10:30 Dentist', '09:00 Dentist' or 'Dentist'"""
+    start, end = event.get("start", ""), event.get("end", "")
+    when = f"{start}-{end}" if start and end else start
+    return f"{when} {event.get('text', '')}" if when else event.get("text", "")
+
+
+def events_overlapping(events, start, end):
+    """The timed events of a sorted day that overlap [start, end)"""
+    found = []
+    for event in events:
+        event_start = event.get("start", "")
+        if not event_start:
+            continue
+        if event_start >= end:
+            break  # Sorted by start: nothing later can overlap
+        event_end = event.get("end", "")
+        # An event without an end (or ending before it starts) is a point in time
+        if event_start < event_end and event_end > start or event_start >= start:
+            found.append(event)
+    return found
+
+
+def split_event_time(text):
+    """'09:30 Dentist' -> ('09:30', 'Dentist'); ('', text) without a leading time"""
+    text = text.strip()
+    head, _, rest = text.partition(" ")
+    try:
+        start = event_time(head)
+    except ValueError:
+        return "", text
+    return (start, rest.strip()) if start and rest.strip() else ("", text)
+
+
+def calendar_events_from_text(text):
+    """The events of a day from before days held lists ("HH:MM a; HH:MM b" imports become one each)"""
+    parts = [split_event_time(part) for part in text.split(IMPORT_SEPARATOR)]
+    if len(parts) == 1 or not all(start for start, _ in parts):
+        parts = [split_event_time(text)]
+    events = []
+    for start, text in parts:
+        event = CalendarEvent({"id": new_record_id(), "text": text})
+        if start:
+            event["start"] = start
+        events.append(event)
+    events.sort(key=event_sort_key)
+    return events
+
+
+def migrate_calendar_events(data):
+    """Turn single-string calendar days into event lists; True if any were found"""
+    days = data.get("calendar_events")
+    if not isinstance(days, dict):
+        return False
+    old = [day for day, value in days.items() if isinstance(value, str)]
+    for day in old:
+        if days[day].strip():
+            days[day] = calendar_events_from_text(days[day])
+        else:
+            del days[day]
+    return bool(old)
+
+
+def json_default(value):
+    """json.dump(s) default= hook for records"""
+    if isinstance(value, Record):
+        return value.to_json()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# ============== UNDO HISTORY ==============
+MISSING = object()
+
+
+def path_child(node, part, create=False):
+    """Step one path component into a dict or list; list items may be addressed by record id"""
+    if isinstance(node, list):
+        if isinstance(part, int):
+            return node[part] if 0 <= part < len(node) else None
+        for record in node:
+            if isinstance(record, (dict, Record)) and record.get("id") == part:
+                return record
+        return None
+    child = node.get(part)
+    if child is None and create:
+        child = node[part] = {}
+    return child
+
+
+def path_get(data, path):
+    node = data
+    for part in path:
+        node = path_child(node, part)
+        if node is None:
+            return MISSING
+    return node
+
+
+def path_set(data, path, value):
+    """Set (or with MISSING, delete) the value at path, creating dicts on the way"""
+    node = data
+    for part in path[:-1]:
+        node = path_child(node, part, create=value is not MISSING)
+        if node is None:
+            return
+    if value is MISSING:
+        node.pop(path[-1], None)
+    else:
+        node[path[-1]] = value
+
+
+class UndoHistory:
+    """Bounded undo/redo stacks of small inverse operations on the data dict"""
+    
+    # Operations are ("set", path, old, new), ("insert", path, index, value)
+    # and ("remove", path, index, value), or ("group", [ops]). Repeated sets
+    # of the same path within COALESCE_SECONDS merge into one operation so a
+    # typing burst undoes in one step. The stacks are bounded by an estimate
+    # of the bytes they hold rather than by a count.
+    
+    COALESCE_SECONDS = 2.0
+    
+    def __init__(self, max_bytes=2 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.total_bytes = 0
+        self.last_time = 0
+        self.open_group = None
+    
+    @staticmethod
+    def value_size(value):
+        if value is MISSING or value is None:
+            return 0
+        if isinstance(value, str):
+            return len(value)
+        return len(json.dumps(value, ensure_ascii=False, default=lambda v: v.to_json() if isinstance(v, Record) else str(v)))
+    
+    def op_size(self, op):
+        if op[0] == "group":
+            return sum(self.op_size(sub) for sub in op[1])
+        return 64 + self.value_size(op[2]) + self.value_size(op[3])
+    
+    def record(self, op):
+        if self.open_group is not None:
+            self.open_group.append(op)
+            return
+        
+        now = time.monotonic()
+        self.redo_stack.clear()
+        last = self.undo_stack[-1] if self.undo_stack else None
+        if (op[0] == "set" and last is not None and last[0] == "set" and last[1] == op[1]
+                and now - self.last_time < self.COALESCE_SECONDS):
+            # Same field edited again: keep the oldest value, take the newest
+            self.undo_stack.pop()
+            self.total_bytes -= self.op_size(last)
+            op = ("set", op[1], last[2], op[3])
+        
+        self.last_time = now
+        self.undo_stack.append(op)
+        self.total_bytes += self.op_size(op)
+        while self.total_bytes > self.max_bytes and len(self.undo_stack) > 1:
+            self.total_bytes -= self.op_size(self.undo_stack.popleft())
+    
+    @contextmanager
+    def group(self):
+        """Record everything inside the block as one undo step"""
+        if self.open_group is not None:
+            yield
+            return
+        self.open_group = []
+        try:
+            yield
+        finally:
+            ops, self.open_group = self.open_group, None
+            if len(ops) == 1:
+                self.record(ops[0])
+            elif ops:
+                self.record(("group", ops))
+                # A group never merges with a following typing burst
+                self.last_time = 0
+    
+    def apply(self, data, op, reverse):
+        """Apply an operation forwards or backwards; returns the touched paths"""
+        kind = op[0]
+        if kind == "group":
+            paths = []
+            for sub in (reversed(op[1]) if reverse else op[1]):
+                paths.extend(self.apply(data, sub, reverse))
+            return paths
+        
+        if kind == "set":
+            path_set(data, op[1], op[2] if reverse else op[3])
+            return [op[1]]
+        
+        items = path_get(data, op[1])
+        if items is MISSING:
+            items = []
+            path_set(data, op[1], items)
+        inserting = (kind == "insert") != reverse
+        if inserting:
+            items.insert(op[2], op[3])
+        elif op[2] < len(items):
+            del items[op[2]]
+        return [op[1] + (op[3].get("id"),) if isinstance(op[3], (dict, Record)) else op[1]]
+    
+    def undo(self, data):
+        if not self.undo_stack:
+            return []
+        op = self.undo_stack.pop()
+        self.total_bytes -= self.op_size(op)
+        self.redo_stack.append(op)
+        self.last_time = 0
+        return self.apply(data, op, reverse=True)
+    
+    def redo(self, data):
+        if not self.redo_stack:
+            return []
+        op = self.redo_stack.pop()
+        self.undo_stack.append(op)
+        self.total_bytes += self.op_size(op)
+        self.last_time = 0
+        return self.apply(data, op, reverse=False)
+    
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.total_bytes = 0
+
+
+# ============== BACKGROUND WORK ==============
+class Job:
+    """One unit of background work; the worker calls fn(job, *args)"""
+    
+    def __init__(self, pool, fn, args, on_done, on_error, on_progress):
+        self.pool = pool
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancelled = False
+        self.progress_value = None
+        self.progress_posted = False
+    
+    def cancel(self):
+        """Skip the job if it has not started; long jobs should poll job.cancelled"""
+        self.cancelled = True
+    
+    def report(self, done, total=None):
+        """Worker side: pass progress to on_progress on the UI thread (coalesced)"""
+        if self.on_progress is None or self.cancelled:
+            return
+        with self.pool.lock:
+            self.progress_value = (done, total)
+            if self.progress_posted:
+                return
+            self.progress_posted = True
+        self.pool.results.put((self.deliver_progress, ()))
+    
+    def deliver_progress(self):
+        with self.pool.lock:
+            value = self.progress_value
+            self.progress_posted = False
+        if not self.cancelled:
+            self.on_progress(*value)
+    
+    def finish(self, result, error):
+        self.pool.outstanding -= 1
+        if self.cancelled:
+            return
+        if error is not None:
+            if self.on_error is not None:
+                self.on_error(error)
+            else:
+                print(f"Background job error: {error!r}")
+        elif self.on_done is not None:
+            self.on_done(result)
+
+
+class WorkerPool:
+    """Small thread pool for disk and network work; callbacks run on the Tk thread"""
+    
+    # Workers never touch Tk or the store: they hand (callback, args) pairs
+    # to a queue that the Tk thread drains from one after() poll, which only
+    # runs while jobs are outstanding. Without a root (headless), call
+    # drain() yourself. After shutdown() new jobs run inline.
+    
+    HIGH, NORMAL, LOW = 0, 10, 20
+    
+    def __init__(self, root=None, workers=2, poll_ms=30):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.jobs = queue.PriorityQueue()
+        self.results = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.outstanding = 0
+        self.poll_job = None
+        self.closed = False
+        self.threads = [
+            threading.Thread(target=self.work, name=f"widgets-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    def submit(self, fn, *args, priority=NORMAL, on_done=None, on_error=None, on_progress=None):
+        """Queue fn(job, *args); lower priority numbers run first. Returns the Job"""
+        job = Job(self, fn, args, on_done, on_error, on_progress)
+        self.outstanding += 1
+        if self.closed:
+            self.run(job)
+            self.drain()
+            return job
+        self.sequence += 1
+        self.jobs.put((priority, self.sequence, job))
+        self.schedule_poll()
+        return job
+    
+    def run(self, job):
+        if job.cancelled:
+            self.results.put((job.finish, (None, None)))
+            return
+        try:
+            with TRACER.span(getattr(job.fn, "__qualname__", "job"), "worker"):
+                result, error = job.fn(job, *job.args), None
+        except Exception as e:
+            result, error = None, e
+        self.results.put((job.finish, (result, error)))
+    
+    def work(self):
+        while True:
+            priority, sequence, job = self.jobs.get()
+            if job is None:
+                return
+            self.run(job)
+    
+    def schedule_poll(self):
+        if self.poll_job is None and self.root is not None:
+            self.poll_job = self.root.after(self.poll_ms, self.poll)
+    
+    def poll(self):
+        self.poll_job = None
+        self.drain()
+        if self.outstanding:
+            self.schedule_poll()
+    
+    def drain(self):
+        """Run the callbacks of finished jobs; UI thread only"""
+        while True:
+            try:
+                callback, args = self.results.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+    
+    def shutdown(self):
+        """Finish queued jobs, deliver their callbacks and run later jobs inline"""
+        self.closed = True
+        for thread in self.threads:
+            self.sequence += 1
+            self.jobs.put((sys.maxsize, self.sequence, None))
+        for thread in self.threads:
+            thread.join(timeout=10)
+        self.drain()
+
+
+# ============== EXTERNAL CHANGES ==============
+# Sections computed from others; never merged, their owners rebuild them
+DERIVED_SECTIONS = ("pomodoro_rollups",)
+# Logs only ever appended to, so both sides' new rows can be kept. Not the
+# habit list: habit_tracking refers to habits by position.
+APPEND_SECTIONS = ("pomodoro_log",)
+
+
+def is_record_list(items):
+    return all(isinstance(item, (dict, Record)) and "id" in item for item in items)
+
+
+def merge3(base, local, remote, path, conflicts):
+    """Three-way merge of JSON values; on a real conflict local wins and the path is noted"""
+    if local == remote:
+        return local
+    if local == base:
+        return remote
+    if remote == base:
+        return local
+    
+    if isinstance(local, (dict, Record)) and isinstance(remote, (dict, Record)):
+        base = base if isinstance(base, (dict, Record)) else {}
+        merged = type(local)() if isinstance(local, Record) else {}
+        for key in list(local) + [k for k in remote if k not in local]:
+            value = merge3(base.get(key, MISSING), local.get(key, MISSING), remote.get(key, MISSING),
+                           path + [key], conflicts)
+            if value is not MISSING:
+                merged[key] = value
+        return merged
+    
+    if isinstance(local, list) and isinstance(remote, list):
+        base = base if isinstance(base, list) else []
+        if is_record_list(base) and is_record_list(local) and is_record_list(remote):
+            return merge_records(base, local, remote, path, conflicts)
+        if path[0] in APPEND_SECTIONS and local[:len(base)] == base and remote[:len(base)] == base:
+            return local + remote[len(base):]
+    
+    conflicts.append("/".join(str(part) for part in path))
+    return local
+
+
+def merge_records(base, local, remote, path, conflicts):
+    """Merge todo/note lists record by record (by id), keeping local order"""
+    base_by_id = {record["id"]: record for record in base}
+    remote_by_id = {record["id"]: record for record in remote}
+    local_ids = set()
+    merged = []
+    for record in local:
+        local_ids.add(record["id"])
+        value = merge3(base_by_id.get(record["id"], MISSING), record, remote_by_id.get(record["id"], MISSING),
+                       path + [record["id"]], conflicts)
+        if value is not MISSING:
+            merged.append(value)
+    
+    for record in remote:
+        if record["id"] not in local_ids:
+            value = merge3(base_by_id.get(record["id"], MISSING), MISSING, record,
+                           path + [record["id"]], conflicts)
+            if value is not MISSING:
+                merged.append(value)
+    return merged
+
+
+# ============== SYNC ==============
+SYNC_STATE_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_sync.json")
+SYNC_SECTIONS = ("calendar_events", "day_planner", "week_planner", "monthly_planner",
+                 "habit_tracking", "habits", "todos", "sticky_notes")
+RECORD_SECTIONS = ("todos", "sticky_notes")
+SYNC_INTERVAL_MS = 60000
+
+
+class HybridClock:
+    """Hybrid logical clock; stamps are fixed-width strings that sort in causal order"""
+    
+    def __init__(self, node, last=""):
+        self.node = node
+        self.wall, self.counter = 0, 0
+        if last:
+            self.observe(last)
+    
+    def now(self):
+        wall = int(time.time() * 1000)
+        if wall > self.wall:
+            self.wall, self.counter = wall, 0
+        else:
+            self.counter += 1
+        return f"{self.wall:013d}:{self.counter:05d}:{self.node}"
+    
+    def observe(self, stamp):
+        """Move past a stamp seen from another machine"""
+        wall, counter = stamp.split(":")[:2]
+        if (int(wall), int(counter)) > (self.wall, self.counter):
+            self.wall, self.counter = int(wall), int(counter)
+
+
+def sync_keys(data, section):
+    if section in RECORD_SECTIONS:
+        return [record["id"] for record in data.get(section, []) if "id" in record]
+    if section == "habits":
+        return [""]
+    return list(data.get(section, {}))
+
+
+def sync_fields(data, section, key):
+    """The {field: value} form of one synced record; {} if it does not exist"""
+    # Records are todos/notes by id, habits as one list, calendar days by
+    # event id, and every other section per key - a dict value maps to its
+    # fields, a string to "".
+    if section in RECORD_SECTIONS:
+        for record in data.get(section, []):
+            if record.get("id") == key:
+                fields = {field: value for field, value in record.items() if field != "id"}
+                fields["_alive"] = True
+                return fields
+        return {}
+    if section == "habits":
+        return {"list": list(data["habits"])} if data.get("habits") else {}
+    if section == "calendar_events":
+        # One field per event, so events added to a day on two machines both survive
+        return {event["id"]: {field: value for field, value in event.items() if field != "id"}
+                for event in data.get(section, {}).get(key, []) if "id" in event}
+    
+    value = data.get(section, {}).get(key)
+    if isinstance(value, dict):
+        return {field: list(v) if isinstance(v, list) else v for field, v in value.items()}
+    return {} if value in (None, "") else {"": value}
+
+
+def visible_fields(section, fields):
+    """Fields as sync_fields would report them (deleted todos/notes report nothing)"""
+    if section in RECORD_SECTIONS and not fields.get("_alive"):
+        return {}
+    return fields
+
+
+def apply_sync_fields(data, section, key, fields):
+    """Write a synced record back into data; no visible fields removes it"""
+    fields = visible_fields(section, fields)
+    if section in RECORD_SECTIONS:
+        records = data.setdefault(section, [])
+        index = next((i for i, record in enumerate(records) if record.get("id") == key), None)
+        if not fields:
+            if index is not None:
+                del records[index]
+            return
+        record = RECORD_TYPES[section]({"id": key})
+        record.update((field, value) for field, value in fields.items() if field != "_alive")
+        if index is not None:
+            records[index] = record
+        elif section == "sticky_notes":
+            records.insert(0, record)
+        else:
+            records.append(record)
+    elif section == "habits":
+        data["habits"] = list(fields.get("list", []))
+    elif section == "calendar_events":
+        events = [CalendarEvent(dict(value, id=event_id))
+                  for event_id, value in fields.items() if isinstance(value, dict)]
+        if events:
+            data.setdefault(section, {})[key] = sorted(events, key=event_sort_key)
+        else:
+            data.get(section, {}).pop(key, None)
+    elif not fields:
+        data.get(section, {}).pop(key, None)
+    elif "" in fields:
+        data.setdefault(section, {})[key] = fields[""]
+    else:
+        data.setdefault(section, {})[key] = {field: list(v) if isinstance(v, list) else v
+                                             for field, v in fields.items()}
+
+
+class SyncClient:
+    """Field-level delta sync through a sync_server.py rendezvous, off the Tk thread"""
+    
+    # Per field the state keeps the last synced value ("shadow") and its HLC
+    # stamp ("clocks"). Edits are noticed as store notifications, diffed
+    # against the shadow when a sync starts and queued in the outbox until
+    # the server acknowledges them. Incoming fields win only with a newer
+    # stamp, so concurrent edits to different fields of a record both survive.
+    
+    def __init__(self, app):
+        self.app = app
+        self.state = self.load_state()
+        self.clock = HybridClock(self.state["node"], self.state.get("clock", ""))
+        self.outbox = {(s, k, f): [v, stamp] for s, k, f, v, stamp in self.state.get("outbox", [])}
+        # Anything may have changed while we were not running: compare it all once
+        self.dirty = {(section, None): self.clock.now() for section in SYNC_SECTIONS}
+        self.job = None
+        self.status = "Not configured" if not self.state.get("server") else "Waiting"
+    
+    def load_state(self):
+        state = {}
+        try:
+            with open(SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            pass
+        state.setdefault("node", uuid.uuid4().hex[:8])
+        state.setdefault("cursor", 0)
+        state.setdefault("clocks", {})
+        state.setdefault("shadow", {})
+        return state
+    
+    def save_state(self):
+        self.state["clock"] = self.clock.now()
+        self.state["outbox"] = [[s, k, f, v, stamp] for (s, k, f), (v, stamp) in self.outbox.items()]
+        try:
+            with open(SYNC_STATE_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Sync state save error: {e}")
+    
+    def update(self, section, key=None, source=None):
+        """Change listener: remember what was edited and when; diffing waits for the next sync"""
+        if section in SYNC_SECTIONS:
+            self.dirty[(section, key if section != "habits" else "")] = self.clock.now()
+    
+    def collect(self):
+        """Turn dirty records into outbox entries by diffing them against the shadow"""
+        dirty, self.dirty = self.dirty, {}
+        for (section, key), stamp in dirty.items():
+            if key is None:
+                keys = set(sync_keys(self.app.store.data, section)) | set(self.state["shadow"].get(section, {}))
+                for k in keys:
+                    self.collect_record(section, k, stamp)
+            else:
+                self.collect_record(section, key, stamp)
+    
+    def collect_record(self, section, key, stamp):
+        shadow = self.state["shadow"].setdefault(section, {})
+        current = sync_fields(self.app.store.data, section, key)
+        old = shadow.get(key, {})
+        if current == visible_fields(section, old):
+            return
+        
+        clocks = self.state["clocks"].setdefault(section, {}).setdefault(key, {})
+        for field in set(current) | set(old):
+            value = current.get(field)
+            if value != old.get(field):
+                clocks[field] = stamp
+                self.outbox[(section, key, field)] = [value, stamp]
+        if current:
+            shadow[key] = current
+        else:
+            shadow.pop(key, None)
+    
+    def sync_now(self):
+        """Start a background exchange; False if one is running or no server is set"""
+        if self.job is not None or not self.state.get("server"):
+            return False
+        self.collect()
+        request = {
+            "node": self.state["node"],
+            "since": self.state["cursor"],
+            "changes": [[s, k, f, v, stamp] for (s, k, f), (v, stamp) in self.outbox.items()]
+        }
+        self.status = "Syncing..."
+        # Set first: a pool that has shut down runs the job, callbacks and
+        # all, before submit() returns
+        self.job = True
+        job = self.app.workers.submit(
+            self.exchange, self.state["server"], self.state.get("token", ""), request,
+            on_done=lambda payload: self.finish(request["changes"], payload),
+            on_error=self.failed
+        )
+        if self.job is not None:
+            self.job = job
+        return True
+    
+    @staticmethod
+    def exchange(job, server, token, request):
+        # Runs on a worker thread: network only, no Tk or store access
+        import urllib.request
+        body = json.dumps(request, ensure_ascii=False).encode("utf-8")
+        http_request = urllib.request.Request(
+            server.rstrip("/") + "/sync", data=body, method="POST",
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+        )
+        with urllib.request.urlopen(http_request, timeout=30) as response:
+            return json.loads(response.read())
+    
+    def finish(self, sent, payload):
+        self.job = None
+        for section, key, field, value, stamp in sent:
+            if self.outbox.get((section, key, field), [None, None])[1] == stamp:
+                del self.outbox[(section, key, field)]
+        received = self.apply(payload.get("changes", []))
+        self.state["cursor"] = payload.get("cursor", self.state["cursor"])
+        self.save_state()
+        self.status = f"Synced {datetime.now().strftime('%H:%M')} ({len(sent)} out, {received} in)"
+        self.app.update_sync_status()
+    
+    def failed(self, error):
+        self.job = None
+        self.status = f"Sync failed: {error}"[:80]
+        self.app.update_sync_status()
+    
+    def apply(self, changes):
+        """Merge incoming fields (newer stamp wins); returns how many were taken"""
+        self.collect()  # Edits made while the request was in flight get their stamps first
+        clocks = self.state["clocks"]
+        touched = {}
+        for section, key, field, value, stamp in changes:
+            if section not in SYNC_SECTIONS:
+                continue
+            self.clock.observe(stamp)
+            record_clocks = clocks.setdefault(section, {}).setdefault(key, {})
+            if stamp <= record_clocks.get(field, ""):
+                continue
+            record_clocks[field] = stamp
+            self.outbox.pop((section, key, field), None)
+            touched.setdefault((section, key), {})[field] = value
+        if not touched:
+            return 0
+        
+        store = self.app.store
+        with store.transaction():
+            for (section, key), fields in touched.items():
+                shadow = self.state["shadow"].setdefault(section, {})
+                record = dict(shadow.get(key, {}))
+                for field, value in fields.items():
+                    if value is None:
+                        record.pop(field, None)
+                    else:
+                        record[field] = value
+                if record:
+                    shadow[key] = record
+                else:
+                    shadow.pop(key, None)
+                apply_sync_fields(store.data, section, key, record)
+                store.commit(section, None if section == "habits" else key)
+        # Recorded undo operations may not line up with the new data
+        store.history.clear()
+        return sum(len(fields) for fields in touched.values())
+    
+    def tick(self):
+        self.sync_now()
+        self.app.root.after(SYNC_INTERVAL_MS, self.tick)
+
+
+# ============== DATA STORE ==============
+class DataStore:
+    """The data file plus undo history, change listeners and batched transactions"""
+    
+    # No Tk in here: widgets, indexes and the CLI all go through this and
+    # its repositories, so the model also runs (and benchmarks) headless.
+    # Listeners are called as listener(section, key, source).
+    
+    def __init__(self, path=None, layout_path=None):
+        self.path = path or DATA_FILE
+        self.history = UndoHistory()
+        self.listeners = []
+        self.pending = None  # (section, key) -> source while in a transaction
+        # With an executor (a WorkerPool) only the JSON encoding stays on the
+        # calling thread; the file is written in the background, one write
+        # in flight at a time
+        self.executor = None
+        self.writing = False
+        self.save_queued = False
+        self.load()
+        
+        self.calendar = CalendarRepository(self)
+        self.todos = TodoRepository(self)
+        self.day_plan = DayPlanRepository(self)
+        self.week_plan = WeekPlanRepository(self)
+        self.month_plan = MonthPlanRepository(self)
+        self.notes = NoteRepository(self)
+        self.habits = HabitRepository(self)
+        self.layout = LayoutStore(self, layout_path)
+        self.pomodoro = SessionLedger(self.data)
+        self.listeners.append(self.pomodoro.update)
+    
+    @staticmethod
+    def default_data():
+        return {
+            "default_theme": "🌊 Ocean Blue",
+            "calendar_events": {},
+            "todos": [],
+            "day_planner": {},
+            "week_planner": {},
+            "monthly_planner": {},
+            "sticky_notes": [],
+            "habits": [],
+            "habit_tracking": {},
+            "pomodoro_log": [],
+            "pomodoro_rollups": {}
+        }
+    
+    @staticmethod
+    def stamp_of(path):
+        try:
+            st = os.stat(path)
+            return [st.st_mtime_ns, st.st_size]
+        except OSError:
+            return None
+    
+    def stamp(self):
+        return self.stamp_of(self.path)
+    
+    def load(self):
+        # What was last read from / written to disk: the base for merging
+        # external edits (see check_external_changes)
+        self.disk_text = None
+        self.disk_stamp = None
+        self.data = self.default_data()
+        for attempt in range(3):
+            if not os.path.exists(self.path):
+                break
+            try:
+                self.disk_stamp = self.stamp()
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.disk_text = f.read()
+                self.data = to_records(json.loads(self.disk_text))
+                break
+            except (OSError, ValueError):
+                # Possibly caught another writer mid-save; look again
+                self.disk_text = None
+                time.sleep(0.05)
+        
+        self.ensure_record_ids()
+        if migrate_calendar_events(self.data):
+            self.save()
+    
+    def ensure_record_ids(self):
+        """Give todos and sticky notes from older data files a stable id"""
+        changed = False
+        for section in ("todos", "sticky_notes"):
+            for record in self.data.get(section, []):
+                if "id" not in record:
+                    record["id"] = new_record_id()
+                    changed = True
+        if changed:
+            self.save()
+    
+    @classmethod
+    def write_file(cls, path, text, expected_stamp):
+        """Write text aside and rename it over path; None if path moved off expected_stamp first"""
+        # Readers (CLI, sync tools) never see half a file this way
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if cls.stamp_of(path) != expected_stamp:
+            os.remove(temp_path)
+            return None
+        try:
+            os.replace(temp_path, path)
+        except PermissionError:
+            # Windows refuses the rename while someone else has the file
+            # open; write in place as before
+            os.remove(temp_path)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return cls.stamp_of(path)
+    
+    @traced
+    def save(self):
+        if self.executor is not None:
+            self.save_in_background()
+            return
+        try:
+            for attempt in range(3):
+                # Fold in edits made to the file behind our back before
+                # overwriting it, and again if another one lands meanwhile
+                self.check_external_changes()
+                text = json.dumps(self.data, indent=2, ensure_ascii=False, default=json_default)
+                expected = self.disk_stamp if attempt < 2 else self.stamp()
+                stamp = self.write_file(self.path, text, expected)
+                if stamp is not None:
+                    self.disk_text, self.disk_stamp = text, stamp
+                    return
+        except Exception as e:
+            print(f"Save error: {e}")
+    
+    def save_in_background(self):
+        if self.writing:
+            self.save_queued = True  # Saved again when the write in flight lands
+            return
+        self.check_external_changes()
+        if self.writing:
+            return  # The merge saved, and that write already holds everything
+        text = json.dumps(self.data, indent=2, ensure_ascii=False, default=json_default)
+        self.writing = True
+        self.executor.submit(
+            self.write_job, text, self.disk_stamp, priority=WorkerPool.HIGH,
+            on_done=self.written, on_error=self.write_failed
+        )
+    
+    def write_job(self, job, text, expected_stamp):
+        return text, self.write_file(self.path, text, expected_stamp)
+    
+    def written(self, result):
+        text, stamp = result
+        self.writing = False
+        if stamp is None:
+            # Changed on disk meanwhile: save() merges it in and writes again
+            self.save_queued = True
+        else:
+            self.disk_text, self.disk_stamp = text, stamp
+        if self.save_queued:
+            self.save_queued = False
+            self.save()
+    
+    def write_failed(self, error):
+        self.writing = False
+        print(f"Save error: {error}")
+    
+    def check_external_changes(self):
+        """Three-way merge the file if someone else changed it; returns True if data changed"""
+        if self.writing:
+            return False  # Our own write may be half done; look again when it lands
+        stamp = self.stamp()
+        if stamp is None or stamp == self.disk_stamp:
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                text = f.read()
+            remote = to_records(json.loads(text))
+        except (OSError, ValueError):
+            return False  # Half-written; the next event or save retries
+        if not isinstance(remote, dict):
+            return False
+        for section in ("todos", "sticky_notes"):
+            for record in remote.get(section, []):
+                if isinstance(record, (dict, Record)) and "id" not in record:
+                    record["id"] = new_record_id()
+        migrate_calendar_events(remote)
+        
+        base = json.loads(self.disk_text) if self.disk_text else {}
+        self.disk_text = text
+        self.disk_stamp = stamp
+        
+        conflicts = []
+        changed = {}
+        for section in list(self.data) + [s for s in remote if s not in self.data]:
+            if section in DERIVED_SECTIONS:
+                continue
+            local = self.data.get(section, MISSING)
+            merged = merge3(base.get(section, MISSING), local, remote.get(section, MISSING), [section], conflicts)
+            if merged is not local:
+                changed[section] = local
+                if merged is MISSING:
+                    del self.data[section]
+                else:
+                    self.data[section] = merged
+        if conflicts:
+            print(f"Kept local values for conflicting external edits: {', '.join(conflicts)}")
+        if not changed:
+            return False
+        if "calendar_events" in changed:
+            # Merged days interleave both sides' events; put them back in time order
+            for events in self.data.get("calendar_events", {}).values():
+                if isinstance(events, list):
+                    events.sort(key=event_sort_key)
+        
+        # Recorded operations may not line up with the merged data any more
+        self.history.clear()
+        for section, old in changed.items():
+            new = self.data.get(section, MISSING)
+            if isinstance(old, dict) and isinstance(new, dict):
+                keys = [k for k in set(old) | set(new) if old.get(k, MISSING) != new.get(k, MISSING)]
+                if len(keys) <= 50:
+                    for key in keys:
+                        self.notify(section, key)
+                    continue
+            self.notify(section)
+        
+        if self.data != remote:
+            self.save()
+        return True
+    
+    def set_value(self, path, value):
+        """Set data at path (creating dicts on the way), recording the inverse for undo"""
+        path = tuple(path)
+        old = path_get(self.data, path)
+        if old is value or old == value:
+            return False
+        path_set(self.data, path, value)
+        self.history.record(("set", path, old, value))
+        return True
+    
+    def delete_value(self, path):
+        return self.set_value(path, MISSING)
+    
+    def list_insert(self, path, index, value):
+        """Insert into the list at path (append if index is None), recorded for undo"""
+        path = tuple(path)
+        items = path_get(self.data, path)
+        if items is MISSING:
+            items = []
+            path_set(self.data, path, items)
+        if index is None:
+            index = len(items)
+        items.insert(index, value)
+        self.history.record(("insert", path, index, value))
+    
+    def list_remove(self, path, index):
+        path = tuple(path)
+        value = path_get(self.data, path).pop(index)
+        self.history.record(("remove", path, index, value))
+        return value
+    
+    def remove_record(self, section, record_id):
+        """Remove a todo/note by id; returns it, or None if it was not found"""
+        for i, record in enumerate(self.data.get(section, [])):
+            if record.get("id") == record_id:
+                return self.list_remove((section,), i)
+        return None
+    
+    def undo(self):
+        self.replay(self.history.undo(self.data))
+    
+    def redo(self):
+        self.replay(self.history.redo(self.data))
+    
+    def replay(self, paths):
+        if not paths:
+            return
+        with self.transaction():
+            for path in paths:
+                self.commit(path[0], path[1] if len(path) > 1 else None)
+    
+    @traced
+    def notify(self, section, key=None, source=None):
+        for listener in self.listeners:
+            listener(section, key, source)
+    
+    def commit(self, section, key=None, source=None):
+        """Save and announce an edit to section/key (deferred to the end of a transaction)"""
+        if self.pending is None:
+            self.save()
+            self.notify(section, key, source)
+        elif (section, key) in self.pending and self.pending[(section, key)] is not source:
+            self.pending[(section, key)] = None
+        else:
+            self.pending[(section, key)] = source
+    
+    @contextmanager
+    def transaction(self, by_section=False):
+        """Batch edits: one undo step, one save, one notification per (section, key) - or per section"""
+        if self.pending is not None:
+            yield
+            return
+        self.pending = {}
+        try:
+            with self.history.group():
+                yield
+        finally:
+            pending, self.pending = self.pending, None
+            if by_section:
+                # Bulk changes: listeners rebuild a whole section once instead of key by key
+                sections = {}
+                for (section, key), source in pending.items():
+                    previous = sections.get((section, None), source)
+                    sections[(section, None)] = source if previous is source else None
+                pending = sections
+            if pending:
+                self.save()
+                for (section, key), source in pending.items():
+                    self.notify(section, key, source)
+
+
+class Repository:
+    """Typed access to one section; writes are undoable and go out as change notifications"""
+    
+    section = None
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def entries(self):
+        return self.store.data.get(self.section, {})
+    
+    def put(self, key, field, text, source=None):
+        """Set a text field of an entry (blank deletes it); False if nothing changed"""
+        path = (self.section, key) if field is None else (self.section, key, field)
+        if text.strip():
+            changed = self.store.set_value(path, text)
+        else:
+            changed = self.store.delete_value(path)
+        if changed:
+            self.store.commit(self.section, key, source)
+        return changed
+
+
+class CalendarRepository(Repository):
+    section = "calendar_events"
+    
+    def get(self, day):
+        """The day's events in event_sort_key order"""
+        return self.entries().get(day, [])
+    
+    def find(self, day, event_id):
+        return next((event for event in self.get(day) if event.get("id") == event_id), None)
+    
+    def position(self, day, event):
+        """Index that keeps the day sorted if event goes in (after its equals)"""
+        keys = [event_sort_key(other) for other in self.get(day) if other is not event]
+        return bisect.bisect_right(keys, event_sort_key(event))
+    
+    def overlapping(self, day, start, end):
+        return events_overlapping(self.get(day), start, end)
+    
+    def add(self, day, text, start="", end="", color="", source=None):
+        event = CalendarEvent({"id": new_record_id(), "text": text})
+        for field, value in (("start", start), ("end", end), ("color", color)):
+            if value:
+                event[field] = value
+        self.store.list_insert((self.section, day), self.position(day, event), event)
+        self.store.commit(self.section, day, source)
+        return event
+    
+    def update(self, day, event_id, source=None, **fields):
+        """Change fields of one event (a blank time or colour removes it); False if nothing changed"""
+        event = self.find(day, event_id)
+        if event is None:
+            return False
+        key = event_sort_key(event)
+        changed = False
+        with self.store.transaction():
+            for field, value in fields.items():
+                path = (self.section, day, event_id, field)
+                if value or field == "text":
+                    changed = self.store.set_value(path, value) or changed
+                else:
+                    changed = self.store.delete_value(path) or changed
+            if event_sort_key(event) != key:
+                # A new time moves the event to keep the day sorted
+                index = next(i for i, other in enumerate(self.get(day)) if other is event)
+                self.store.list_remove((self.section, day), index)
+                self.store.list_insert((self.section, day), self.position(day, event), event)
+            if changed:
+                self.store.commit(self.section, day, source)
+        return changed
+    
+    def remove(self, day, event_id, source=None):
+        events = self.get(day)
+        index = next((i for i, event in enumerate(events) if event.get("id") == event_id), None)
+        if index is None:
+            return False
+        if len(events) == 1:
+            self.store.delete_value((self.section, day))  # No empty days left behind
+        else:
+            self.store.list_remove((self.section, day), index)
+        self.store.commit(self.section, day, source)
+        return True
+
+
+class DayPlanRepository(Repository):
+    section = "day_planner"
+    
+    def get(self, day):
+        """{hour string: text} for one date"""
+        return self.entries().get(day, {})
+    
+    def set_slot(self, day, hour, text, source=None):
+        return self.put(day, str(hour), text, source)
+
+
+class WeekPlanRepository(Repository):
+    section = "week_planner"
+    
+    def get(self, week_key):
+        """{weekday string: text} for the week starting on week_key"""
+        return self.entries().get(week_key, {})
+    
+    def set_day(self, week_key, weekday, text, source=None):
+        return self.put(week_key, str(weekday), text, source)
+
+
+class MonthPlanRepository(Repository):
+    section = "monthly_planner"
+    
+    def get(self, month_key):
+        return self.entries().get(month_key, {})
+    
+    def set_section(self, month_key, name, text, source=None):
+        return self.put(month_key, name, text, source)
+
+
+class TodoRepository(Repository):
+    section = "todos"
+    
+    def all(self):
+        return self.store.data.get(self.section, [])
+    
+    def add(self, text, priority, due="", source=None, done=False):
+        task = Todo({
+            "id": new_record_id(),
+            "text": text,
+            "done": done,
+            "priority": priority,
+            "created": datetime.now().isoformat()
+        })
+        try:
+            task["due"] = datetime.strptime(due, "%Y-%m-%d").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+        self.store.list_insert((self.section,), None, task)
+        self.store.commit(self.section, task["id"], source)
+        return task
+    
+    def set_done(self, task_id, done, source=None):
+        if self.store.set_value((self.section, task_id, "done"), done):
+            self.store.commit(self.section, task_id, source)
+    
+    def remove(self, task_id, source=None):
+        if self.store.remove_record(self.section, task_id) is not None:
+            self.store.commit(self.section, task_id, source)
+    
+    def swap_order(self, task, other, source=None):
+        """Exchange the manual-order positions of two tasks as one undo step"""
+        task_order, other_order = task["order"], other["order"]
+        with self.store.transaction():
+            self.store.set_value((self.section, task["id"], "order"), other_order)
+            self.store.set_value((self.section, other["id"], "order"), task_order)
+            self.store.commit(self.section, task["id"], source)
+            self.store.commit(self.section, other["id"], source)
+
+
+class NoteRepository(Repository):
+    section = "sticky_notes"
+    
+    def all(self):
+        return self.store.data.get(self.section, [])
+    
+    def add(self, text="", source=None):
+        note = StickyNote({
+            "id": new_record_id(),
+            "text": text,
+            "time": datetime.now().strftime("%b %d, %H:%M")
+        })
+        self.store.list_insert((self.section,), 0, note)
+        self.store.commit(self.section, note["id"], source)
+        return note
+    
+    def set_text(self, note_id, text, source=None):
+        if self.store.set_value((self.section, note_id, "text"), text):
+            self.store.commit(self.section, note_id, source)
+    
+    def remove(self, note_id, source=None):
+        if self.store.remove_record(self.section, note_id) is not None:
+            self.store.commit(self.section, note_id, source)
+
+
+class HabitRepository(Repository):
+    section = "habits"
+    
+    def names(self):
+        return self.store.data.get(self.section, [])
+    
+    def add(self, name, source=None):
+        self.store.list_insert((self.section,), None, name)
+        self.store.commit(self.section, None, source)
+    
+    def remove(self, index, source=None):
+        if index < len(self.names()):
+            self.store.list_remove((self.section,), index)
+            self.store.commit(self.section, None, source)
+    
+    def week(self, week_key):
+        """{habit index string: [weekdays done]} for one week"""
+        return self.store.data.get("habit_tracking", {}).get(week_key, {})
+    
+    def set_day(self, week_key, habit_index, weekday, done, source=None):
+        """Check or uncheck one day; False if it already was that way"""
+        habit_key = str(habit_index)
+        days = self.week(week_key).get(habit_key, [])
+        if done and weekday not in days:
+            days = days + [weekday]
+        elif not done and weekday in days:
+            days = [d for d in days if d != weekday]
+        else:
+            return False
+        # A new list, not an in-place edit, so the undo record keeps the old one
+        self.store.set_value(("habit_tracking", week_key, habit_key), days)
+        self.store.commit("habit_tracking", week_key, source)
+        return True
+
+
+# ============== LAYOUT ==============
+# Where widgets sit, how big they are, which are hidden and their themes
+# live in a small file of their own, not in the data file: a drag or resize
+# rewrites a few hundred bytes instead of every todo and note, and geometry
+# never shows up in undo, sync, merges or exports. Geometry and visibility
+# are kept per screen setup, so docking or undocking a laptop switches to
+# the arrangement last used on that setup.
+LAYOUT_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_layout.json")
+LEGACY_LAYOUT_SECTIONS = ("widget_positions", "widget_sizes", "widget_themes", "hidden_widgets")
+
+
+def empty_layout_profile():
+    return {"positions": {}, "sizes": {}, "hidden": []}
+
+
+class LayoutStore:
+    """Widget geometry and visibility per screen setup, widget themes, and view settings"""
+    
+    # File: {"screen": last used signature, "themes": {widget_id: theme},
+    # "profiles": {signature: {"positions", "sizes", "hidden"}}}. Before the
+    # app has looked at the screen (and in the CLI) the profile is "".
+    # View settings (todo sort, agenda length, default theme) stay in the data
+    # file; they are preferences, not geometry.
+    
+    def __init__(self, store, path=None):
+        self.store = store
+        self.path = path or LAYOUT_FILE
+        self.data = self.load()
+        self.screen = self.data["screen"]
+    
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self.migrate()
+        except (OSError, ValueError) as e:
+            print(f"Layout load error: {e}")
+            data = {}
+        data.setdefault("screen", "")
+        data.setdefault("themes", {})
+        data.setdefault("profiles", {})
+        return data
+    
+    def migrate(self):
+        """Move geometry, visibility and themes out of an older data file"""
+        legacy = {section: self.store.data.pop(section) for section in LEGACY_LAYOUT_SECTIONS
+                  if section in self.store.data}
+        profile = {
+            "positions": legacy.get("widget_positions", {}),
+            "sizes": legacy.get("widget_sizes", {}),
+            "hidden": legacy.get("hidden_widgets", []),
+        }
+        data = {"screen": "", "themes": legacy.get("widget_themes", {}), "profiles": {"": profile}}
+        if legacy:
+            # Layout first: if we stop in between, it is not lost, only still duplicated
+            self.data = data
+            self.save()
+            self.store.save()
+        return data
+    
+    def save(self):
+        text = json.dumps(self.data, ensure_ascii=False)
+        try:
+            DataStore.write_file(self.path, text, DataStore.stamp_of(self.path))
+        except OSError as e:
+            print(f"Layout save error: {e}")
+    
+    def profile(self):
+        return self.data["profiles"].get(self.screen) or empty_layout_profile()
+    
+    def profiles(self):
+        return sorted(name for name in self.data["profiles"] if name)
+    
+    def use_screen(self, signature):
+        """Switch to the profile of a screen setup; True if that changed the profile in use"""
+        if signature == self.screen:
+            return False
+        profiles = self.data["profiles"]
+        if signature not in profiles:
+            # A setup seen for the first time starts out as the arrangement in use
+            profiles[signature] = json.loads(json.dumps(self.profile()))
+        if self.screen == "":
+            # The placeholder from before the screen was known; it became this one
+            profiles.pop("", None)
+        self.screen = self.data["screen"] = signature
+        self.save()
+        return True
+    
+    def edit_profile(self):
+        profile = self.data["profiles"].get(self.screen)
+        if profile is None:
+            profile = self.data["profiles"][self.screen] = empty_layout_profile()
+        return profile
+    
+    def theme(self, widget_id):
+        return self.data["themes"].get(widget_id, self.default_theme())
+    
+    def default_theme(self):
+        return self.store.data.get("default_theme", "🌊 Ocean Blue")
+    
+    def set_theme(self, widget_id, theme_name):
+        self.data["themes"][widget_id] = theme_name
+        self.save()
+    
+    def position(self, widget_id):
+        return self.profile()["positions"].get(widget_id, {"x": 100, "y": 100})
+    
+    def set_position(self, widget_id, x, y):
+        self.edit_profile()["positions"][widget_id] = {"x": x, "y": y}
+        self.save()
+    
+    def size(self, widget_id, default_size):
+        return self.profile()["sizes"].get(widget_id, {"w": default_size[0], "h": default_size[1]})
+    
+    def set_size(self, widget_id, w, h):
+        self.edit_profile()["sizes"][widget_id] = {"w": w, "h": h}
+        self.save()
+    
+    def hidden(self):
+        return self.profile()["hidden"]
+    
+    def set_hidden(self, widget_id, hidden):
+        widgets = [w for w in self.hidden() if w != widget_id]
+        if hidden:
+            widgets.append(widget_id)
+        if widgets != self.hidden():
+            self.edit_profile()["hidden"] = widgets
+            self.save()
+    
+    def setting(self, name, default):
+        """A view preference such as the todo sort mode or agenda length"""
+        return self.store.data.get(name, default)
+    
+    def set_setting(self, name, value):
+        self.store.data[name] = value
+        self.store.commit(name)
+
+
+# ============== IMPORT ==============
+# Calendars and task lists come in as .ics or .csv. Parsing streams the file
+# on a worker thread and produces plain item dicts only; the Tk thread then
+# applies them in one store transaction - one undo step, one save and one
+# refresh per affected widget, however big the file is.
+IMPORT_PLANNER_HOURS = range(5, 24)
+IMPORT_SEPARATOR = "; "
+IMPORT_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%d.%m.%Y", "%Y%m%d")
+IMPORT_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M:%S %p", "%I %p")
+IMPORT_TRUE = ("1", "x", "y", "yes", "true", "done", "completed")
+CSV_COLUMNS = {
+    "kind": ("type", "kind"),
+    "text": ("summary", "subject", "title", "task", "text", "name", "event"),
+    "date": ("date", "start date", "start", "day", "dtstart"),
+    "time": ("time", "start time"),
+    "all_day": ("all day event", "all day", "all-day"),
+    "due": ("due", "due date", "deadline"),
+    "priority": ("priority",),
+    "done": ("done", "completed", "status"),
+}
+
+
+def import_time(text):
+    """'9:30', '09:30:00', '9:30 PM' -> (hour, minute), or None if empty"""
+    text = text.strip().upper()
+    if not text:
+        return None
+    for fmt in IMPORT_TIME_FORMATS:
+        try:
+            moment = datetime.strptime(text, fmt)
+            return moment.hour, moment.minute
+        except ValueError:
+            pass
+    raise ValueError(f"unknown time '{text}'")
+
+
+def import_when(text):
+    """'2024-03-01', '03/01/2024 9:00 AM', '2024-03-01T09:00' -> (YYYY-MM-DD or None, time or None)"""
+    day_part, _, time_part = text.strip().replace("T", " ").partition(" ")
+    if not day_part:
+        return None, None
+    for fmt in IMPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(day_part, fmt).strftime("%Y-%m-%d"), import_time(time_part)
+        except ValueError:
+            pass
+    raise ValueError(f"unknown date '{day_part}'")
+
+
+def import_priority(value):
+    """iCalendar 1-9 (1 is highest) or high/medium/low -> a TODO_PRIORITIES label"""
+    value = value.strip().lower()
+    if value.isdigit() and int(value):
+        rank = 0 if int(value) <= 4 else 1 if int(value) == 5 else 2
+    else:
+        rank = {"high": 0, "h": 0, "low": 2, "l": 2}.get(value.split()[-1] if value else "", 1)
+    return TODO_PRIORITIES[rank]
+
+
+def read_import_lines(job, f, total):
+    """Decoded lines of a binary file, reporting bytes read to the job"""
+    done = reported = 0
+    for number, raw in enumerate(f):
+        done += len(raw)
+        if job is not None and done - reported >= 65536:
+            job.report(done, total)
+            reported = done
+        yield raw.decode("utf-8-sig" if number == 0 else "utf-8", "replace")
+    if job is not None:
+        job.report(done, total)
+
+
+def unfold_ics(lines):
+    """RFC 5545 content lines: a line starting with a space or tab continues the previous one"""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def split_ics_line(line):
+    """'DTSTART;TZID="Europe/Berlin":20240301T090000' -> ('DTSTART', {'TZID': ...}, '2024...')"""
+    quoted = False
+    for i, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            break
+    else:
+        return line.upper(), {}, ""
+    name, *params = line[:i].split(";")
+    params = dict(param.partition("=")[::2] for param in params)
+    return name.upper(), {k.upper(): v.strip('"') for k, v in params.items()}, line[i + 1:]
+
+
+def ics_text(value):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def ics_when(value, params):
+    """DATE or DATE-TIME value -> (YYYY-MM-DD, (hour, minute) or None)"""
+    # Floating and TZID times are taken as wall-clock time; only UTC ("Z")
+    # times are converted, to the local zone
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d").strftime("%Y-%m-%d"), None
+    moment = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        moment = moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return moment.strftime("%Y-%m-%d"), (moment.hour, moment.minute)
+
+
+def ics_item(component, props):
+    summary = " ".join(ics_text(props.get("SUMMARY", ({}, ""))[1]).split())
+    if not summary:
+        return None
+    if component == "VEVENT":
+        day, at = ics_when(props["DTSTART"][1], props["DTSTART"][0])
+        return {"kind": "event", "date": day, "time": at, "text": summary}
+    due = ics_when(props["DUE"][1], props["DUE"][0])[0] if "DUE" in props else ""
+    return {
+        "kind": "todo", "text": summary, "due": due,
+        "priority": import_priority(props.get("PRIORITY", ({}, ""))[1]),
+        "done": props.get("STATUS", ({}, ""))[1].upper() == "COMPLETED" or "COMPLETED" in props
+    }
+
+
+def iter_ics(lines):
+    """One item per VEVENT and VTODO; None for ones that cannot be read"""
+    component, props, nested = None, {}, 0
+    for line in unfold_ics(lines):
+        name, params, value = split_ics_line(line)
+        if component is None:
+            if name == "BEGIN" and value.upper() in ("VEVENT", "VTODO"):
+                component, props, nested = value.upper(), {}, 0
+        elif name == "BEGIN":
+            nested += 1  # VALARM and friends: their properties are not the event's
+        elif name == "END" and nested:
+            nested -= 1
+        elif name == "END":
+            try:
+                yield ics_item(component, props)
+            except (KeyError, ValueError):
+                yield None
+            component = None
+        elif not nested:
+            props.setdefault(name, (params, value))
+
+
+def csv_item(values):
+    text = " ".join(values.get("text", "").split())
+    if not text:
+        return None
+    day, at = import_when(values.get("date", ""))
+    if values.get("time"):
+        at = import_time(values["time"])
+    if values.get("all_day", "").lower() in IMPORT_TRUE:
+        at = None
+    
+    kind = values.get("kind", "").lower()
+    if kind in ("todo", "task") or (not kind and not day):
+        return {
+            "kind": "todo", "text": text, "due": import_when(values.get("due", ""))[0] or day or "",
+            "priority": import_priority(values.get("priority", "")),
+            "done": values.get("done", "").lower() in IMPORT_TRUE
+        }
+    if day is None:
+        return None
+    return {"kind": "event", "date": day, "time": at, "text": text}
+
+
+def iter_csv(lines):
+    """One item per row; the header names the columns (see CSV_COLUMNS)"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        return
+    columns = {}
+    for index, name in enumerate(header):
+        for field, aliases in CSV_COLUMNS.items():
+            if name.strip().lower() in aliases and field not in columns:
+                columns[field] = index
+    if "text" not in columns:
+        raise ValueError("the CSV header needs a title, summary, subject or task column")
+    
+    for row in reader:
+        values = {field: row[i].strip() for field, i in columns.items() if i < len(row)}
+        try:
+            yield csv_item(values)
+        except ValueError:
+            yield None
+
+
+def parse_import_file(job, path):
+    """Stream-parse an .ics or .csv file into (items, skipped); runs on a worker (job may be None)"""
+    parse = iter_ics if path.lower().endswith((".ics", ".ical")) else iter_csv
+    items, skipped = [], 0
+    with open(path, "rb") as f:
+        for item in parse(read_import_lines(job, f, os.fstat(f.fileno()).st_size)):
+            if job is not None and job.cancelled:
+                break
+            if item is None:
+                skipped += 1
+            else:
+                items.append(item)
+    return items, skipped
+
+
+def join_entry(current, text):
+    """current with text appended, or None if it already lists text"""
+    if not current.strip():
+        return text
+    parts = [current] + current.split(IMPORT_SEPARATOR.strip())
+    if text.lower() in (part.strip().lower() for part in parts):
+        return None
+    return current + IMPORT_SEPARATOR + text
+
+
+def apply_import(store, items, source=None):
+    """Add the items the store does not already have as one transaction; returns counts"""
+    # Timed events inside the planner's hours fill day planner slots, all
+    # other events go to the calendar; tasks match on text and due date,
+    # calendar events on text and start time
+    counts = {"events": 0, "slots": 0, "todos": 0, "duplicates": 0}
+    known_tasks = {(task.get("text", "").lower(), task.get("due", "")) for task in store.todos.all()}
+    with store.transaction(by_section=True):
+        for item in items:
+            text = item["text"]
+            if item["kind"] == "todo":
+                if (text.lower(), item["due"]) in known_tasks:
+                    counts["duplicates"] += 1
+                    continue
+                known_tasks.add((text.lower(), item["due"]))
+                store.todos.add(text, item["priority"], item["due"], source, done=item["done"])
+                counts["todos"] += 1
+                continue
+            
+            start = "" if item["time"] is None else "%02d:%02d" % item["time"]
+            if any(event.get("text", "").lower() == text.lower() and event.get("start", "") == start
+                   for event in store.calendar.get(item["date"])):
+                counts["duplicates"] += 1
+                continue
+            if item["time"] is not None and item["time"][0] in IMPORT_PLANNER_HOURS:
+                hour, minute = item["time"]
+                text = text if minute == 0 else f"{start} {text}"
+                joined = join_entry(store.day_plan.get(item["date"]).get(str(hour), ""), text)
+                if joined is None:
+                    counts["duplicates"] += 1
+                else:
+                    store.day_plan.set_slot(item["date"], hour, joined, source)
+                    counts["slots"] += 1
+                continue
+            store.calendar.add(item["date"], text, start, source=source)
+            counts["events"] += 1
+    return counts
+
+
+def describe_import(counts, skipped):
+    parts = [f"{counts['events']} events", f"{counts['slots']} planner slots", f"{counts['todos']} tasks"]
+    text = "Imported " + ", ".join(parts)
+    if counts["duplicates"]:
+        text += f"; {counts['duplicates']} duplicates skipped"
+    if skipped:
+        text += f"; {skipped} unreadable entries"
+    return text
+
+
+# ============== EXPORT ==============
+# Exporters are generators of text lines. They walk the store one day at a
+# time (looking keys up rather than copying sections) and the lines go
+# straight to a temp file, so memory does not grow with the history. The
+# date range defaults to the span of the exported entries.
+EXPORT_SECTIONS = {
+    "calendar": "calendar_events",
+    "planner": "day_planner",
+    "week": "week_planner",
+    "month": "monthly_planner",
+    "todos": "todos",
+}
+EXPORT_DEFAULT_SECTIONS = {
+    "ics": ("calendar_events", "day_planner", "todos"),
+    "csv": ("calendar_events", "day_planner", "todos"),
+    "md": ("calendar_events", "day_planner", "week_planner", "monthly_planner"),
+}
+EXPORT_PRIORITIES = {TODO_PRIORITIES[0]: 1, TODO_PRIORITIES[1]: 5, TODO_PRIORITIES[2]: 9}
+CSV_EXPORT_HEADER = ["type", "date", "time", "title", "due", "priority", "done"]
+
+
+def export_span(data, sections):
+    """(first, last) day ordinal of the dated entries in sections, or None"""
+    first = last = None
+    for section in sections:
+        if section == "todos":
+            keys = (task["due"] for task in data.get("todos", []) if task.get("due"))
+        else:
+            keys = (key for key, value in data.get(section, {}).items() if value)
+        for key in keys:
+            try:
+                ordinal = date_key_to_ordinal(key)
+            except ValueError:
+                continue
+            first = ordinal if first is None else min(first, ordinal)
+            last = ordinal if last is None else max(last, ordinal)
+    return None if first is None else (first, last)
+
+
+def iter_export(data, sections, start=None, end=None):
+    """(section, key, field, value) for the entries in [start, end], in date order"""
+    span = export_span(data, sections) if start is None or end is None else None
+    first = date_key_to_ordinal(start) if start else span and span[0]
+    last = date_key_to_ordinal(end) if end else span and span[1]
+    
+    for ordinal in range(first or 0, (last or -1) + 1):
+        day = date.fromordinal(ordinal)
+        key = day.isoformat()
+        if "monthly_planner" in sections and (day.day == 1 or ordinal == first):
+            month = data.get("monthly_planner", {}).get(key[:7], {})
+            for _, name, _ in MONTH_PLAN_SECTIONS:
+                if month.get(name, "").strip():
+                    yield "monthly_planner", key[:7], name, month[name]
+        if "week_planner" in sections and (day.weekday() == 0 or ordinal == first):
+            week_key = date.fromordinal(ordinal - day.weekday()).isoformat()
+            week = data.get("week_planner", {}).get(week_key, {})
+            for weekday in sorted(week, key=int):
+                if week[weekday].strip():
+                    yield "week_planner", week_key, int(weekday), week[weekday]
+        if "calendar_events" in sections:
+            for event in data.get("calendar_events", {}).get(key, []):
+                if event.get("text", "").strip():
+                    yield "calendar_events", key, None, event
+        if "day_planner" in sections:
+            slots = data.get("day_planner", {}).get(key, {})
+            for hour in sorted(slots, key=int):
+                if slots[hour].strip():
+                    yield "day_planner", key, int(hour), slots[hour]
+    
+    if "todos" in sections:
+        # Undated tasks only belong to an export without a date range
+        for task in data.get("todos", []):
+            due = task.get("due", "")
+            if (start or end) and not due or start and due < start or end and due > end:
+                continue
+            yield "todos", task.get("id", ""), None, task
+
+
+def ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def fold_ics(line):
+    """Fold a content line into 75-octet pieces, ending in CRLF"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    pieces, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            pieces.append("".join(current))
+            current, size, limit = [], 0, 74
+        current.append(char)
+        size += width
+    pieces.append("".join(current))
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def ics_export_lines(entries):
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield from ("BEGIN:VCALENDAR\r\n", "VERSION:2.0\r\n", "PRODID:-//Desktop Widgets//EN\r\n")
+    for section, key, field, value in entries:
+        if section == "todos":
+            lines = ["BEGIN:VTODO", f"UID:{value.get('id', '')}@desktop-widgets"]
+            if value.get("due"):
+                lines.append(f"DUE;VALUE=DATE:{value['due'].replace('-', '')}")
+            lines += [
+                f"PRIORITY:{EXPORT_PRIORITIES.get(value.get('priority'), 0)}",
+                f"STATUS:{'COMPLETED' if value.get('done') else 'NEEDS-ACTION'}",
+                f"SUMMARY:{ics_escape(value.get('text', ''))}", "END:VTODO"
+            ]
+        elif section == "calendar_events":
+            lines = ["BEGIN:VEVENT", f"UID:{value.get('id', key)}@desktop-widgets"]
+            start = value.get("start", "")
+            if start:
+                begin = datetime.fromisoformat(f"{key}T{start}")
+                end = value.get("end", "")
+                finish = datetime.fromisoformat(f"{key}T{end}") if end > start else begin + timedelta(hours=1)
+                lines += [f"DTSTART:{begin:%Y%m%dT%H%M%S}", f"DTEND:{finish:%Y%m%dT%H%M%S}"]
+            else:
+                day = date.fromisoformat(key)
+                lines += [f"DTSTART;VALUE=DATE:{day:%Y%m%d}", f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}"]
+            lines += [f"SUMMARY:{ics_escape(value.get('text', ''))}", "END:VEVENT"]
+        elif section == "day_planner":
+            start = datetime.fromisoformat(key) + timedelta(hours=field)
+            lines = [
+                "BEGIN:VEVENT", f"UID:{key}-{field:02d}@desktop-widgets",
+                f"DTSTART:{start:%Y%m%dT%H%M%S}", f"DTEND:{start + timedelta(hours=1):%Y%m%dT%H%M%S}",
+                f"SUMMARY:{ics_escape(value)}", "END:VEVENT"
+            ]
+        else:
+            continue
+        lines.insert(2, f"DTSTAMP:{stamp}")
+        for line in lines:
+            yield fold_ics(line)
+    yield "END:VCALENDAR\r\n"
+
+
+def csv_export_lines(entries):
+    """Rows with the header import_file() reads back"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    
+    def line(row):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+    
+    yield line(CSV_EXPORT_HEADER)
+    for section, key, field, value in entries:
+        if section == "todos":
+            yield line([
+                "todo", "", "", value.get("text", ""), value.get("due", ""),
+                value.get("priority", ""), "yes" if value.get("done") else ""
+            ])
+        elif section == "calendar_events":
+            yield line(["event", key, value.get("start", ""), value.get("text", ""), "", "", ""])
+        elif section == "day_planner":
+            yield line(["event", key, f"{field:02d}:00", value, "", "", ""])
+
+
+def markdown_item(label, text):
+    return f"- {label}{text.strip()}".replace("\n", "\n  ") + "\n"
+
+
+def markdown_export_lines(entries):
+    """A journal: months with their goals, weeks with their plans, then the days"""
+    month_titles = {name: title for title, name, _ in MONTH_PLAN_SECTIONS}
+    yield "# Desktop Widgets Journal\n"
+    month = week = day = tasks = None
+    for section, key, field, value in entries:
+        if section == "todos":
+            if not tasks:
+                tasks = True
+                yield "\n## Tasks\n\n"
+            due = f" (due {value['due']})" if value.get("due") else ""
+            yield markdown_item(f"[{'x' if value.get('done') else ' '}] ", value.get("text", "") + due)
+            continue
+        if key[:7] != month:
+            month = key[:7]
+            yield f"\n## {datetime.strptime(month, '%Y-%m'):%B %Y}\n"
+        if section == "monthly_planner":
+            yield f"\n**{month_titles[field]}**\n\n{value.strip()}\n"
+        elif section == "week_planner":
+            if key != week:
+                week = key
+                yield f"\n### Week of {key}\n\n"
+            weekday = date.fromordinal(date_key_to_ordinal(key) + field)
+            yield markdown_item(f"**{weekday:%A}:** ", value)
+        else:
+            if key != day:
+                day = key
+                yield f"\n#### {datetime.strptime(key, '%Y-%m-%d'):%A, %Y-%m-%d}\n\n"
+            if section == "calendar_events":
+                yield markdown_item("📅 ", event_label(value))
+            else:
+                yield markdown_item(f"{field:02d}:00 ", value)
+
+
+def json_export_lines(data, sections):
+    """The raw data (whole sections; date ranges do not apply)"""
+    selected = data if sections is None else {s: data[s] for s in sections if s in data}
+    yield from json.JSONEncoder(indent=2, ensure_ascii=False, default=json_default).iterencode(selected)
+    yield "\n"
+
+
+EXPORT_FORMATS = {"ics": ics_export_lines, "csv": csv_export_lines, "md": markdown_export_lines}
+
+
+def export_lines(data, fmt, sections=None, start=None, end=None):
+    """Lines of an export; sections=None means the format's default sections"""
+    if fmt == "json":
+        return json_export_lines(data, sections)
+    if sections is None:
+        sections = EXPORT_DEFAULT_SECTIONS[fmt]
+    return EXPORT_FORMATS[fmt](iter_export(data, sections, start, end))
+
+
+class ExportWriter:
+    """Writes export lines to a temp file and moves it into place when done"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = path + ".tmp"
+        self.file = open(self.temp_path, "w", encoding="utf-8", newline="")
+        self.count = 0
+    
+    def write(self, lines, limit=None):
+        """Write up to limit more lines; True once lines is exhausted and the file is in place"""
+        for line in lines:
+            self.file.write(line)
+            self.count += 1
+            if limit is not None and self.count % limit == 0:
+                return False
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return True
+    
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+
+# ============== COMMAND LINE ==============
+# `main.py todo add ...` and friends work on the DataStore directly, without
+# tkinter. Saves merge with whatever is on disk and replace the file
+# atomically; a running GUI notices through its FileWatcher and merges too.
+CLI_COMMANDS = ("todo", "event", "plan", "note", "habit", "import", "export")
+CLI_PRIORITIES = {"high": TODO_PRIORITIES[0], "medium": TODO_PRIORITIES[1], "low": TODO_PRIORITIES[2]}
+CLI_EXPORT_FORMATS = ("json", "ics", "csv", "md")
+
+
+def cli_date(text):
+    """Accept YYYY-MM-DD, 'today', 'tomorrow' or 'yesterday'"""
+    offsets = {"today": 0, "tomorrow": 1, "yesterday": -1}
+    if text.lower() in offsets:
+        return (date.today() + timedelta(days=offsets[text.lower()])).strftime("%Y-%m-%d")
+    return datetime.strptime(text, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+def find_task(store, task_id):
+    matches = [task for task in store.todos.all() if task.get("id", "").startswith(task_id)]
+    if len(matches) != 1:
+        raise ValueError(f"{len(matches)} tasks match id '{task_id}'")
+    return matches[0]
+
+
+def format_task(task):
+    line = f"{task.get('id', '?'):12}  [{'x' if task.get('done') else ' '}] {task.get('priority', '')}  {task.get('text', '')}"
+    return line + (f"  (due {task['due']})" if task.get("due") else "")
+
+
+def cli_todo(store, args):
+    if args.action == "list":
+        for task in TodoIndex(store.data).view(args.filter):
+            print(format_task(task))
+    elif args.action == "add":
+        due = cli_date(args.due) if args.due else ""
+        print(format_task(store.todos.add(" ".join(args.text), CLI_PRIORITIES[args.priority], due)))
+    else:
+        task = find_task(store, args.id)
+        store.todos.set_done(task["id"], not args.undo)
+        print(format_task(task))
+    return 0
+
+
+def find_event(store, day, event_id):
+    matches = [event for event in store.calendar.get(day) if event.get("id", "").startswith(event_id)]
+    if len(matches) != 1:
+        raise ValueError(f"{len(matches)} events on {day} match id '{event_id}'")
+    return matches[0]
+
+
+def format_event(event):
+    return f"{event.get('id', '?'):12}  {event_label(event)}"
+
+
+def cli_event(store, args):
+    day = cli_date(args.date)
+    if args.action == "get":
+        for event in store.calendar.get(day):
+            print(format_event(event))
+    elif args.action == "add":
+        start, end = event_time(args.start), event_time(args.end)
+        print(format_event(store.calendar.add(day, " ".join(args.text), start, end, args.color)))
+    else:
+        store.calendar.remove(day, find_event(store, day, args.id)["id"])
+    return 0
+
+
+def cli_plan(store, args):
+    day = cli_date(args.date)
+    if args.hour is None or not args.text:
+        slots = store.day_plan.get(day)
+        for hour in sorted(slots, key=int):
+            if args.hour is None or int(hour) == args.hour:
+                print(f"{int(hour):02d}:00  {slots[hour]}")
+        return 0
+    
+    if not 5 <= args.hour <= 23:
+        raise ValueError("the day planner has slots for hours 5-23")
+    store.day_plan.set_slot(day, args.hour, " ".join(args.text))
+    return 0
+
+
+def cli_note(store, args):
+    store.notes.add(" ".join(args.text))
+    return 0
+
+
+def cli_habit(store, args):
+    day = date.fromisoformat(cli_date(args.date))
+    habits = store.habits.names()
+    if args.habit in habits:
+        index = habits.index(args.habit)
+    elif args.habit.isdigit() and int(args.habit) < len(habits):
+        index = int(args.habit)
+    else:
+        raise ValueError(f"no habit '{args.habit}' (have: {', '.join(habits) or 'none'})")
+    
+    week_key = (day - timedelta(days=day.weekday())).strftime("%Y-%m-%d")
+    store.habits.set_day(week_key, index, day.weekday(), not args.undo)
+    return 0
+
+
+def cli_import(store, args):
+    items, skipped = parse_import_file(None, args.file)
+    print(describe_import(apply_import(store, items), skipped))
+    return 0
+
+
+def cli_export(store, args):
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip(".").lower()
+    sections = [EXPORT_SECTIONS[name] for name in args.section] if args.section else None
+    lines = export_lines(
+        store.data, fmt if fmt in CLI_EXPORT_FORMATS else "json", sections,
+        cli_date(args.start) if args.start else None, cli_date(args.end) if args.end else None
+    )
+    if args.output == "-":
+        sys.stdout.writelines(lines)
+    else:
+        ExportWriter(args.output).write(lines)
+    return 0
+
+
+def build_cli_parser():
+    import argparse
+    parser = argparse.ArgumentParser(prog="main.py", description="Desktop Widgets data from the command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    todo = commands.add_parser("todo", help="list, add or complete tasks")
+    todo_actions = todo.add_subparsers(dest="action", required=True)
+    todo_add = todo_actions.add_parser("add")
+    todo_add.add_argument("text", nargs="+")
+    todo_add.add_argument("--priority", choices=CLI_PRIORITIES, default="medium")
+    todo_add.add_argument("--due", help="YYYY-MM-DD, today, tomorrow")
+    todo_list = todo_actions.add_parser("list")
+    todo_list.add_argument("filter", nargs="?", choices=("all", "active", "done"), default="active")
+    todo_done = todo_actions.add_parser("done")
+    todo_done.add_argument("id", help="task id (a unique prefix is enough)")
+    todo_done.add_argument("--undo", action="store_true", help="mark as not done")
+    todo.set_defaults(handler=cli_todo)
+    
+    event = commands.add_parser("event", help="calendar events of a day")
+    event_actions = event.add_subparsers(dest="action", required=True)
+    event_get = event_actions.add_parser("get")
+    event_get.add_argument("date")
+    event_add = event_actions.add_parser("add")
+    event_add.add_argument("date")
+    event_add.add_argument("text", nargs="+")
+    event_add.add_argument("--start", default="", help="HH:MM; without it the event lasts all day")
+    event_add.add_argument("--end", default="", help="HH:MM")
+    event_add.add_argument("--color", default="", help="e.g. #FF6B6B")
+    event_remove = event_actions.add_parser("remove")
+    event_remove.add_argument("date")
+    event_remove.add_argument("id", help="event id (a unique prefix is enough)")
+    event.set_defaults(handler=cli_event)
+    
+    plan = commands.add_parser("plan", help="day planner slots")
+    plan_actions = plan.add_subparsers(dest="action", required=True)
+    plan_day = plan_actions.add_parser("day", help="show a day, or set HOUR to TEXT")
+    plan_day.add_argument("date")
+    plan_day.add_argument("hour", nargs="?", type=int)
+    plan_day.add_argument("text", nargs="*")
+    plan.set_defaults(handler=cli_plan)
+    
+    note = commands.add_parser("note", help="sticky notes")
+    note_actions = note.add_subparsers(dest="action", required=True)
+    note_add = note_actions.add_parser("add")
+    note_add.add_argument("text", nargs="+")
+    note.set_defaults(handler=cli_note)
+    
+    habit = commands.add_parser("habit", help="habit tracking")
+    habit_actions = habit.add_subparsers(dest="action", required=True)
+    habit_check = habit_actions.add_parser("check")
+    habit_check.add_argument("habit", help="habit name or number")
+    habit_check.add_argument("--date", default="today")
+    habit_check.add_argument("--undo", action="store_true", help="uncheck instead")
+    habit.set_defaults(handler=cli_habit)
+    
+    import_ = commands.add_parser("import", help="add events and tasks from an .ics or .csv file")
+    import_.add_argument("file")
+    import_.set_defaults(handler=cli_import)
+    
+    export = commands.add_parser("export", help="write data as JSON, iCalendar, CSV or a Markdown journal")
+    export.add_argument("-o", "--output", default="-", help="file (default: stdout)")
+    export.add_argument("-f", "--format", choices=CLI_EXPORT_FORMATS, help="default: from the file extension, else json")
+    export.add_argument("--from", dest="start", help="first date (not for json)")
+    export.add_argument("--to", dest="end", help="last date (not for json)")
+    export.add_argument("--section", action="append", choices=EXPORT_SECTIONS, help="repeatable; default: all the format supports")
+    export.set_defaults(handler=cli_export)
+    return parser
+
+
+def run_cli(argv):
+    args = build_cli_parser().parse_args(argv)
+    try:
+        return args.handler(DataStore(), args)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
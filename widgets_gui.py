@@ -0,0 +1,3893 @@
+"""
+Desktop Widgets windows: the Tk widgets, the app that runs them, and the
+single-instance launch that hands commands to a running copy. What they
+show and edit lives in widgets_data.
+"""
+
+from datetime import datetime, timedelta, date
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import uuid
+import bisect
+import queue
+import signal
+import socket
+from collections import deque
+
+from widgets_data import (
+    CLI_EXPORT_FORMATS, DATA_FILE, DataStore, DateIndex, EXPORT_SECTIONS, ExportWriter, HabitStats,
+    MISSING, MONTH_PLAN_SECTIONS, Record, SearchIndex, SyncClient, TODO_PRIORITIES, TODO_SORT_MODES,
+    TRACER, TodoIndex, WorkerPool, apply_import, cli_date, date_key_to_ordinal, describe_import,
+    event_label, event_time, events_overlapping, export_lines, long_date_label, ordinal_to_date_key,
+    parse_import_file, trace_methods,
+)
+
+# Imported by load_gui(), so importing this module does not start Tk
+tk = ttk = messagebox = colorchooser = filedialog = ctypes = calendar = None
+
+
+def load_gui():
+    global tk, ttk, messagebox, colorchooser, filedialog, ctypes, calendar
+    import tkinter as tk
+    from tkinter import ttk, messagebox, colorchooser, filedialog
+    import ctypes
+    import calendar
+
+
+# ============== WINDOWS API ==============
+HWND_BOTTOM = 1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOACTIVATE = 0x0010
+
+
+# ============== BEAUTIFUL COLOR THEMES ==============
+THEMES = {
+    "🌸 Rose Pink": {
+        "bg": "#FFF5F5", "header": "#FEC8D8", "accent": "#FF6B9D",
+        "text": "#5D4E60", "button": "#FFD1DC", "entry": "#FFFFFF",
+        "border": "#FEC8D8", "highlight": "#FF85A2"
+    },
+    "🌊 Ocean Blue": {
+        "bg": "#F0F8FF", "header": "#87CEEB", "accent": "#4A90D9",
+        "text": "#2C3E50", "button": "#B8D4E8", "entry": "#FFFFFF",
+        "border": "#87CEEB", "highlight": "#5DADE2"
+    },
+    "🌿 Mint Green": {
+        "bg": "#F0FFF4", "header": "#98FB98", "accent": "#3CB371",
+        "text": "#2D4A3E", "button": "#B2F2BB", "entry": "#FFFFFF",
+        "border": "#98FB98", "highlight": "#66CDAA"
+    },
+    "🍇 Lavender": {
+        "bg": "#F8F0FF", "header": "#D8BFD8", "accent": "#9370DB",
+        "text": "#4A4063", "button": "#E6D5E8", "entry": "#FFFFFF",
+        "border": "#D8BFD8", "highlight": "#BA55D3"
+    },
+    "🌻 Sunny Yellow": {
+        "bg": "#FFFEF5", "header": "#FFE66D", "accent": "#F4B400",
+        "text": "#5D4E37", "button": "#FFF3B0", "entry": "#FFFFFF",
+        "border": "#FFE66D", "highlight": "#FFD93D"
+    },
+    "🍑 Peach": {
+        "bg": "#FFF8F0", "header": "#FFDAB9", "accent": "#FF8C69",
+        "text": "#5D4037", "button": "#FFE4C4", "entry": "#FFFFFF",
+        "border": "#FFDAB9", "highlight": "#FFA07A"
+    },
+    "🐬 Aqua Cyan": {
+        "bg": "#F0FFFF", "header": "#AFEEEE", "accent": "#20B2AA",
+        "text": "#2F4F4F", "button": "#B0E0E6", "entry": "#FFFFFF",
+        "border": "#AFEEEE", "highlight": "#48D1CC"
+    },
+    "🌺 Coral": {
+        "bg": "#FFF5EE", "header": "#FFB4A2", "accent": "#E07A5F",
+        "text": "#5D4037", "button": "#FFCDB2", "entry": "#FFFFFF",
+        "border": "#FFB4A2", "highlight": "#FF8A80"
+    },
+    "❄️ Ice Silver": {
+        "bg": "#F8F9FA", "header": "#DEE2E6", "accent": "#6C757D",
+        "text": "#343A40", "button": "#E9ECEF", "entry": "#FFFFFF",
+        "border": "#CED4DA", "highlight": "#ADB5BD"
+    },
+    "🌙 Soft Purple": {
+        "bg": "#FAF5FF", "header": "#E9D5FF", "accent": "#A855F7",
+        "text": "#4C1D95", "button": "#F3E8FF", "entry": "#FFFFFF",
+        "border": "#E9D5FF", "highlight": "#C084FC"
+    }
+}
+
+
+# ============== FONTS CONFIGURATION ==============
+FONTS = {
+    "title": ("Segoe UI Semibold", 12),
+    "header": ("Segoe UI Semibold", 11),
+    "normal": ("Segoe UI", 10),
+    "small": ("Segoe UI", 9),
+    "tiny": ("Segoe UI", 8),
+    "button": ("Segoe UI Semibold", 10),
+    "calendar_day": ("Segoe UI Semibold", 9),
+    "calendar_event": ("Segoe UI", 7),
+    "time": ("Consolas", 10),
+    "clock": ("Segoe UI Light", 24),
+}
+
+
+# ============== LAG MONITOR ==============
+LAG_LOG_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_lag.log")
+
+
+class LagMonitor:
+    """Heartbeat lateness histogram plus stack capture of Tk-loop stalls"""
+    
+    # The Tk thread reschedules a beat every `interval` ms and files how late
+    # it ran. A daemon thread watches the time the next beat is due; once it
+    # is `threshold` ms overdue the loop is stuck, so it grabs the Tk
+    # thread's stack from sys._current_frames() right then. The next beat
+    # closes the stall and writes it, stack included, to the log file.
+    
+    BUCKETS = (16, 33, 50, 100, 250, 500, 1000, 2500)  # ms upper bounds, then "more"
+    SUSPEND_MS = 30000  # lateness beyond this is a sleeping machine, not a stall
+    
+    def __init__(self, root, interval=100, threshold=250, log_path=LAG_LOG_FILE):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.log_path = log_path
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+        self.worst = 0
+        self.stalls = deque(maxlen=20)  # (when, ms, stack text)
+        self.stall = None
+        self.lock = threading.Lock()
+        self.running = False
+        self.due = time.monotonic()
+        self.tk_thread = None
+    
+    def start(self):
+        self.running = True
+        self.tk_thread = threading.get_ident()
+        self.due = time.monotonic() + self.interval / 1000
+        self.root.after(self.interval, self.beat)
+        threading.Thread(target=self.watch, name="lag-watchdog", daemon=True).start()
+    
+    def stop(self):
+        self.running = False
+    
+    def beat(self):
+        if not self.running:
+            return
+        now = time.monotonic()
+        lag = (now - self.due) * 1000
+        with self.lock:
+            stall, self.stall = self.stall, None
+            self.due = now + self.interval / 1000
+        self.root.after(self.interval, self.beat)
+        if lag > self.SUSPEND_MS:
+            return
+        
+        self.histogram[bisect.bisect_left(self.BUCKETS, lag)] += 1
+        self.worst = max(self.worst, lag)
+        if stall is not None:
+            when, stack = stall
+            self.stalls.append((when, lag, stack))
+            self.log(when, lag, stack)
+    
+    def watch(self):
+        current_frames = getattr(sys, "_current_frames", None)
+        while self.running:
+            time.sleep(self.threshold / 4000)
+            with self.lock:
+                overdue = (time.monotonic() - self.due) * 1000
+                if self.stall is not None or not self.threshold < overdue < self.SUSPEND_MS:
+                    continue
+                frame = current_frames().get(self.tk_thread) if current_frames else None
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else "(no stack)\n"
+                self.stall = (datetime.now(), stack)
+    
+    def log(self, when, lag, stack):
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(f"{when:%Y-%m-%d %H:%M:%S}  Tk loop stalled for {lag:.0f} ms in:\n{stack}\n")
+        except OSError:
+            pass
+    
+    def bucket_labels(self):
+        return [f"≤{ms} ms" for ms in self.BUCKETS] + [f">{self.BUCKETS[-1]} ms"]
+    
+    def summary(self):
+        """One line for the control panel"""
+        beats = sum(self.histogram)
+        if not beats:
+            return "Lag: no data yet"
+        smooth = self.histogram[0] * 100 // beats
+        return f"Lag: {smooth}% of beats ≤{self.BUCKETS[0]} ms, worst {self.worst:.0f} ms, {len(self.stalls)} stalls"
+    
+    def report(self):
+        """Histogram bars and the recent stalls with their stacks"""
+        beats = max(sum(self.histogram), 1)
+        lines = ["Heartbeat lateness", ""]
+        for label, count in zip(self.bucket_labels(), self.histogram):
+            lines.append(f"{label:>10}  {'█' * round(40 * count / beats):<40} {count}")
+        lines += ["", f"Stalls over {self.threshold} ms (log: {self.log_path})", ""]
+        for when, lag, stack in reversed(self.stalls):
+            lines.append(f"{when:%H:%M:%S}  {lag:.0f} ms")
+            lines.append(stack)
+        return "\n".join(lines)
+
+
+# ============== MEMORY DIAGNOSTICS ==============
+MEMORY_REPORT_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets_memory.txt")
+# The method each widget rebuilds its rows with (leak checks run it in a loop)
+WIDGET_REDRAW_METHODS = {
+    "calendar": "update_calendar",
+    "todo": "load_tasks",
+    "day_planner": "load_day_data",
+    "week_planner": "load_week_data",
+    "monthly_planner": "load_month_data",
+    "clock": "update_clock",
+    "sticky_notes": "load_notes",
+    "pomodoro": "update_display",
+    "habit_tracker": "load_habits",
+    "agenda": "load_agenda",
+}
+
+
+def python_commands(interp):
+    """Names of the Tcl commands that call back into Python"""
+    # Tkinter names them repr(id(func)) + func.__name__; Tk's own never start with a digit
+    names = map(str, interp.splitlist(interp.call("info", "commands")))
+    return {name for name in names if name[:1].isdigit()}
+
+
+def tcl_variables(interp):
+    """Names of the Tcl globals behind tk.*Var objects"""
+    names = map(str, interp.splitlist(interp.call("info", "globals")))
+    return {name for name in names if name.startswith("PY_VAR")}
+
+
+def tk_census(top):
+    """Widgets, the Tcl variables they are tied to and the Python callbacks they hold under top"""
+    widgets = callbacks = 0
+    variables = set()
+    pending = [top]
+    while pending:
+        widget = pending.pop()
+        widgets += 1
+        # Commands made by bind()/command=/after() on this widget; Tk frees them with it
+        callbacks += len(widget._tclCommands or ())
+        for option in ("variable", "textvariable"):
+            try:
+                name = str(widget.cget(option))
+            except tk.TclError:
+                continue
+            if name:
+                variables.add(name)
+        pending.extend(widget.winfo_children())
+    return {"widgets": widgets, "variables": len(variables), "callbacks": callbacks}
+
+
+def deep_size(value, seen):
+    """Bytes held by a JSON-like value (dicts, lists, records and what they contain)"""
+    total = 0
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, dict):
+            pending.extend(value)
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, Record):
+            pending.extend(getattr(value, key) for key in value.FIELDS if hasattr(value, key))
+            if value.extra is not None:
+                pending.append(value.extra)
+    return total
+
+
+class MemoryMonitor:
+    """Per-window Tk object counts, data sizes, allocators and counts that only ever grow"""
+    
+    # A count that rose at each of the last GROWTH_SAMPLES samples is
+    # reported: rows are rebuilt all the time, but across minutes the
+    # totals should go up and down with the data, not climb steadily
+    GROWTH_SAMPLES = 6
+    
+    def __init__(self, app):
+        self.app = app
+        self.history = {}  # (scope, counter) -> recent values
+        self.warned = set()
+    
+    def scopes(self):
+        scopes = [(widget_id, widget.window) for widget_id, widget in self.app.widgets.items()]
+        if getattr(self.app, "control_panel", None) is not None:
+            scopes.append(("control panel", self.app.control_panel))
+        return scopes
+    
+    def census(self):
+        """{scope: {counter: value}}; the "Tcl" scope is interpreter-wide"""
+        counts = {scope: tk_census(top) for scope, top in self.scopes()}
+        interp = self.app.root.tk
+        counts["Tcl"] = {"variables": len(tcl_variables(interp)), "callbacks": len(python_commands(interp))}
+        return counts
+    
+    def sample(self):
+        """Record one census; returns the (scope, counter) pairs that just started growing"""
+        for scope, counts in self.census().items():
+            for counter, value in counts.items():
+                values = self.history.get((scope, counter))
+                if values is None:
+                    values = self.history[(scope, counter)] = deque(maxlen=self.GROWTH_SAMPLES + 1)
+                values.append(value)
+        growing = {(scope, counter) for scope, counter, _, _ in self.growing()}
+        new, self.warned = growing - self.warned, growing
+        return sorted(new)
+    
+    def growing(self):
+        """(scope, counter, first, last) for counts that rose at every recent sample"""
+        found = []
+        for (scope, counter), values in self.history.items():
+            values = list(values)
+            if len(values) > self.GROWTH_SAMPLES and all(a < b for a, b in zip(values, values[1:])):
+                found.append((scope, counter, values[0], values[-1]))
+        return found
+    
+    def leak_check(self, cycles=20):
+        """Rebuild each widget `cycles` times; (widget id, callbacks left, variables left, sample names)"""
+        interp = self.app.root.tk
+        results = []
+        for widget_id, widget in self.app.widgets.items():
+            method = getattr(widget, WIDGET_REDRAW_METHODS.get(widget_id, ""), None)
+            if method is None:
+                continue
+            method()  # first-time setup is not a leak
+            commands, variables = python_commands(interp), tcl_variables(interp)
+            for _ in range(cycles):
+                method()
+            # Anything that outlives a rebuild belongs to a destroyed row
+            # (or a persistent widget re-bound every time)
+            leaked_commands = python_commands(interp) - commands
+            leaked_variables = tcl_variables(interp) - variables
+            results.append((widget_id, len(leaked_commands), len(leaked_variables),
+                            sorted(leaked_commands | leaked_variables)[:3]))
+        return results
+    
+    def section_sizes(self):
+        """(bytes, section, entries) largest first"""
+        seen = set()
+        sizes = []
+        for section, value in self.app.data.items():
+            entries = len(value) if isinstance(value, (dict, list)) else 1
+            sizes.append((deep_size(value, seen), section, entries))
+        return sorted(sizes, reverse=True)
+    
+    def summary(self):
+        """One line for the control panel"""
+        tcl = self.census()["Tcl"]
+        text = f"Memory: {tcl['callbacks']} Python callbacks, {tcl['variables']} Tk variables"
+        if self.warned:
+            text += "; growing: " + ", ".join(f"{scope} {counter}" for scope, counter in sorted(self.warned))
+        return text
+    
+    def report(self, leaks=None):
+        lines = ["Tk objects per window", "", f"{'':<16}{'widgets':>9}{'variables':>11}{'callbacks':>11}"]
+        census = self.census()
+        tcl = census.pop("Tcl")
+        for scope, counts in census.items():
+            lines.append(f"{scope:<16}{counts['widgets']:>9}{counts['variables']:>11}{counts['callbacks']:>11}")
+        lines.append(f"{'Tcl (all)':<16}{'':>9}{tcl['variables']:>11}{tcl['callbacks']:>11}")
+        
+        growing = self.growing()
+        lines += ["", f"Growing at each of the last {self.GROWTH_SAMPLES} samples"]
+        lines += [f"  {scope} {counter}: {first} -> {last}" for scope, counter, first, last in growing] or ["  nothing"]
+        
+        if leaks is not None:
+            lines += ["", "Left behind by repeated rebuilds"]
+            for widget_id, commands, variables, names in leaks:
+                verdict = "ok" if not commands and not variables else f"{commands} callbacks, {variables} variables  {' '.join(names)}"
+                lines.append(f"  {widget_id:<16}{verdict}")
+        
+        lines += ["", "Data sections in memory", ""]
+        for size, section, entries in self.section_sizes():
+            lines.append(f"  {section:<20}{entries:>8} entries{size / 1024:>10.0f} KiB")
+        
+        lines += ["", "Top allocators (tracemalloc)", ""]
+        if tracemalloc.is_tracing():
+            for stat in tracemalloc.take_snapshot().statistics("lineno")[:15]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:>8.0f} KiB {stat.count:>8}  {os.path.basename(frame.filename)}:{frame.lineno}")
+        else:
+            lines.append("  not tracing - tick Track allocations or set PYTHONTRACEMALLOC=1")
+        return "\n".join(lines)
+    
+    def dump(self, leaks=None, path=MEMORY_REPORT_FILE):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{datetime.now():%Y-%m-%d %H:%M:%S}\n\n{self.report(leaks)}\n")
+        return path
+
+
+# ============== EDIT WATCHING ==============
+EDIT_SAVE_DELAY_MS = 300
+
+
+class ChangeWatcher:
+    """Calls save(key, text) once a burst of real edits to a Text or Entry settles"""
+    
+    # A Text raises <<Modified>> when its modified flag goes from clear to
+    # set, and clearing the flag re-arms it; an Entry gets a StringVar whose
+    # write trace fires only when the content changes. So cursor keys, Shift
+    # and Ctrl cost nothing, and the content is read and saved once per
+    # burst rather than copied on every keypress. `key()` is taken when a
+    # burst starts, so an edit pending while the widget moves to another
+    # day or week is still saved where it was typed.
+    
+    def __init__(self, widget, save, key=lambda: None, delay=EDIT_SAVE_DELAY_MS):
+        self.widget = widget
+        self.save = save
+        self.key = key
+        self.delay = delay
+        self.job = None
+        self.pending = MISSING
+        self.muted = False
+        if isinstance(widget, tk.Text):
+            self.var = None
+            widget.edit_modified(False)
+            widget.bind("<<Modified>>", self.text_modified, add="+")
+        else:
+            self.var = tk.StringVar(widget, value=widget.get())
+            widget.config(textvariable=self.var)
+            self.trace = self.var.trace_add("write", self.entry_changed)
+            # The trace callback keeps this watcher (and so the variable) alive
+            widget.bind("<Destroy>", self.release, add="+")
+        widget.bind("<FocusOut>", self.flush, add="+")
+    
+    def get(self):
+        if self.var is not None:
+            return self.var.get()
+        return self.widget.get("1.0", "end-1c")
+    
+    def set(self, text):
+        """Replace the content (saving any pending edit first) without reporting it as an edit"""
+        self.flush()
+        # Pass a callable when the text comes from the store: it is read
+        # after the flush, so it includes the edit that was just saved
+        if callable(text):
+            text = text()
+        self.muted = True
+        try:
+            if self.var is not None:
+                self.var.set(text)
+            else:
+                self.widget.delete("1.0", "end")
+                self.widget.insert("1.0", text)
+                self.widget.edit_modified(False)
+        finally:
+            self.muted = False
+    
+    def release(self, event=None):
+        if self.trace is not None:
+            self.var.trace_remove("write", self.trace)
+            self.trace = None
+    
+    def text_modified(self, event=None):
+        # Also raised when the flag is cleared; only a set flag is an edit
+        if self.widget.edit_modified():
+            self.widget.edit_modified(False)
+            self.changed()
+    
+    def entry_changed(self, *trace_args):
+        if not self.muted:
+            self.changed()
+    
+    def changed(self):
+        if self.pending is MISSING:
+            self.pending = self.key()
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+        self.job = self.widget.after(self.delay, self.flush)
+    
+    def flush(self, event=None):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        if self.pending is MISSING or not self.widget.winfo_exists():
+            return
+        key, self.pending = self.pending, MISSING
+        self.save(key, self.get())
+
+
+# ============== BASE WIDGET CLASS ==============
+@trace_methods
+class BaseWidget:
+    """Enhanced base widget with individual theming"""
+    
+    def __init__(self, master, title, widget_id, app, default_size=(320, 420)):
+        self.app = app
+        self.widget_id = widget_id
+        self.master = master
+        self.title_text = title
+        self.default_size = default_size
+        self.watchers = []
+        
+        # Get individual theme for this widget
+        theme_name = app.store.layout.theme(widget_id)
+        self.theme = THEMES.get(theme_name, THEMES["🌊 Ocean Blue"])
+        self.current_theme_name = theme_name
+        
+        # Create window
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.window.overrideredirect(True)
+        
+        # Get saved position and size
+        pos = app.store.layout.position(widget_id)
+        size = app.store.layout.size(widget_id, default_size)
+        
+        self.window.geometry(f"{size['w']}x{size['h']}+{pos['x']}+{pos['y']}")
+        
+        # Dragging variables
+        self.drag_data = {"x": 0, "y": 0, "dragging": False}
+        self.resize_data = {"active": False}
+        
+        # Window attributes
+        self.window.attributes('-topmost', False)
+        self.window.attributes('-alpha', 0.97)
+        
+        # Main container with rounded appearance
+        self.container = tk.Frame(self.window, bg=self.theme["border"], bd=0)
+        self.container.pack(fill="both", expand=True, padx=1, pady=1)
+        
+        self.inner_container = tk.Frame(self.container, bg=self.theme["bg"])
+        self.inner_container.pack(fill="both", expand=True, padx=2, pady=2)
+        
+        # Create header
+        self.create_header(title)
+        
+        # Create content area
+        self.content = tk.Frame(self.inner_container, bg=self.theme["bg"])
+        self.content.pack(fill="both", expand=True, padx=8, pady=(5, 8))
+        
+        # Create resize grip
+        self.create_resize_grip()
+        
+        # Bind events
+        self.window.bind("<FocusIn>", lambda e: self.window.after(50, self.send_to_desktop))
+        self.window.bind("<Control-z>", self.app.undo)
+        self.window.bind("<Control-y>", self.app.redo)
+        
+        # Send to desktop
+        self.window.after(100, self.send_to_desktop)
+    
+    def create_header(self, title):
+        """Create beautiful header"""
+        self.header = tk.Frame(self.inner_container, bg=self.theme["header"], height=38)
+        self.header.pack(fill="x")
+        self.header.pack_propagate(False)
+        
+        # Left side - Title
+        self.title_label = tk.Label(
+            self.header,
+            text=f"  {title}",
+            bg=self.theme["header"],
+            fg=self.theme["text"],
+            font=FONTS["title"],
+            anchor="w"
+        )
+        self.title_label.pack(side="left", fill="x", expand=True)
+        
+        # Right side - Control buttons
+        controls = tk.Frame(self.header, bg=self.theme["header"])
+        controls.pack(side="right", padx=5)
+        
+        # Theme button
+        self.theme_btn = tk.Label(
+            controls,
+            text=" 🎨 ",
+            bg=self.theme["header"],
+            fg=self.theme["text"],
+            font=("Segoe UI", 11),
+            cursor="hand2"
+        )
+        self.theme_btn.pack(side="left", padx=2)
+        self.theme_btn.bind("<Button-1>", self.show_theme_menu)
+        self.theme_btn.bind("<Enter>", lambda e: self.theme_btn.config(bg=self.theme["highlight"]))
+        self.theme_btn.bind("<Leave>", lambda e: self.theme_btn.config(bg=self.theme["header"]))
+        
+        # Minimize button
+        self.min_btn = tk.Label(
+            controls,
+            text=" ─ ",
+            bg=self.theme["header"],
+            fg=self.theme["text"],
+            font=("Segoe UI", 11),
+            cursor="hand2"
+        )
+        self.min_btn.pack(side="left", padx=2)
+        self.min_btn.bind("<Button-1>", lambda e: self.window.iconify())
+        self.min_btn.bind("<Enter>", lambda e: self.min_btn.config(bg=self.theme["highlight"]))
+        self.min_btn.bind("<Leave>", lambda e: self.min_btn.config(bg=self.theme["header"]))
+        
+        # Close button
+        self.close_btn = tk.Label(
+            controls,
+            text=" ✕ ",
+            bg=self.theme["header"],
+            fg=self.theme["text"],
+            font=("Segoe UI", 11),
+            cursor="hand2"
+        )
+        self.close_btn.pack(side="left", padx=2)
+        self.close_btn.bind("<Button-1>", self.hide_widget)
+        self.close_btn.bind("<Enter>", lambda e: self.close_btn.config(bg="#FF6B6B", fg="white"))
+        self.close_btn.bind("<Leave>", lambda e: self.close_btn.config(bg=self.theme["header"], fg=self.theme["text"]))
+        
+        # Bind drag events
+        for widget in [self.header, self.title_label]:
+            widget.bind("<Button-1>", self.start_drag)
+            widget.bind("<B1-Motion>", self.do_drag)
+            widget.bind("<ButtonRelease-1>", self.stop_drag)
+    
+    def create_resize_grip(self):
+        """Create resize grip"""
+        self.resize_grip = tk.Label(
+            self.inner_container,
+            text="⋮⋮",
+            bg=self.theme["bg"],
+            fg=self.theme["border"],
+            font=("Segoe UI", 10),
+            cursor="size_nw_se"
+        )
+        self.resize_grip.place(relx=1.0, rely=1.0, anchor="se", x=-5, y=-5)
+        
+        self.resize_grip.bind("<Button-1>", self.start_resize)
+        self.resize_grip.bind("<B1-Motion>", self.do_resize)
+        self.resize_grip.bind("<ButtonRelease-1>", self.stop_resize)
+    
+    def show_theme_menu(self, event):
+        """Show theme selection dropdown"""
+        menu = tk.Menu(self.window, tearoff=0, font=FONTS["normal"])
+        menu.config(bg=self.theme["bg"], fg=self.theme["text"])
+        
+        for theme_name in THEMES.keys():
+            menu.add_command(
+                label=theme_name,
+                command=lambda tn=theme_name: self.change_individual_theme(tn)
+            )
+        
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def change_individual_theme(self, theme_name):
+        """Change theme for this widget only"""
+        self.theme = THEMES[theme_name]
+        self.current_theme_name = theme_name
+        
+        self.app.store.layout.set_theme(self.widget_id, theme_name)
+        
+        # Update appearance
+        self.update_theme()
+    
+    def start_drag(self, event):
+        self.drag_data["x"] = event.x_root - self.window.winfo_x()
+        self.drag_data["y"] = event.y_root - self.window.winfo_y()
+        self.drag_data["dragging"] = True
+    
+    def do_drag(self, event):
+        if self.drag_data["dragging"]:
+            x = event.x_root - self.drag_data["x"]
+            y = event.y_root - self.drag_data["y"]
+            self.window.geometry(f"+{x}+{y}")
+    
+    def stop_drag(self, event):
+        self.drag_data["dragging"] = False
+        self.save_position()
+    
+    def start_resize(self, event):
+        self.resize_data["active"] = True
+        self.resize_data["x"] = event.x_root
+        self.resize_data["y"] = event.y_root
+        self.resize_data["width"] = self.window.winfo_width()
+        self.resize_data["height"] = self.window.winfo_height()
+    
+    def do_resize(self, event):
+        if self.resize_data["active"]:
+            dx = event.x_root - self.resize_data["x"]
+            dy = event.y_root - self.resize_data["y"]
+            new_w = max(250, self.resize_data["width"] + dx)
+            new_h = max(200, self.resize_data["height"] + dy)
+            self.window.geometry(f"{new_w}x{new_h}")
+    
+    def stop_resize(self, event):
+        self.resize_data["active"] = False
+        self.save_size()
+        self.on_resize()
+    
+    def on_resize(self):
+        """Override in subclasses for resize handling"""
+        pass
+    
+    def on_data_changed(self, section, key):
+        """Override in subclasses to refresh after edits made elsewhere (undo, search, ...)"""
+        pass
+    
+    def save_position(self):
+        self.app.store.layout.set_position(self.widget_id, self.window.winfo_x(), self.window.winfo_y())
+    
+    def save_size(self):
+        self.app.store.layout.set_size(self.widget_id, self.window.winfo_width(), self.window.winfo_height())
+    
+    def apply_layout(self):
+        """Move, size and show or hide the window as the layout profile in use says"""
+        pos = self.app.store.layout.position(self.widget_id)
+        size = self.app.store.layout.size(self.widget_id, self.default_size)
+        self.window.geometry(f"{size['w']}x{size['h']}+{pos['x']}+{pos['y']}")
+        if self.widget_id in self.app.store.layout.hidden():
+            self.window.withdraw()
+        else:
+            self.window.deiconify()
+        self.on_resize()
+    
+    def send_to_desktop(self):
+        try:
+            hwnd = ctypes.windll.user32.GetParent(self.window.winfo_id())
+            ctypes.windll.user32.SetWindowPos(
+                hwnd, HWND_BOTTOM, 0, 0, 0, 0,
+                SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+            )
+        except:
+            pass
+    
+    def hide_widget(self, event=None):
+        self.window.withdraw()
+        self.app.store.layout.set_hidden(self.widget_id, True)
+        self.app.update_control_panel()
+    
+    def show_widget(self):
+        self.window.deiconify()
+        self.app.store.layout.set_hidden(self.widget_id, False)
+    
+    def watch_edits(self, widget, save, key=lambda: None):
+        """Save real edits to a Text or Entry of this widget (see ChangeWatcher)"""
+        watcher = ChangeWatcher(widget, save, key)
+        self.watchers.append(watcher)
+        return watcher
+    
+    def flush_edits(self):
+        """Save pending edits now, e.g. before rows are destroyed and rebuilt"""
+        for watcher in self.watchers:
+            watcher.flush()
+        self.watchers = [watcher for watcher in self.watchers if watcher.widget.winfo_exists()]
+    
+    def update_theme(self):
+        """Update widget colors - override in subclasses"""
+        self.container.config(bg=self.theme["border"])
+        self.inner_container.config(bg=self.theme["bg"])
+        self.header.config(bg=self.theme["header"])
+        self.title_label.config(bg=self.theme["header"], fg=self.theme["text"])
+        self.theme_btn.config(bg=self.theme["header"], fg=self.theme["text"])
+        self.min_btn.config(bg=self.theme["header"], fg=self.theme["text"])
+        self.close_btn.config(bg=self.theme["header"], fg=self.theme["text"])
+        self.content.config(bg=self.theme["bg"])
+        self.resize_grip.config(bg=self.theme["bg"], fg=self.theme["border"])
+
+
+# ============== ENHANCED CALENDAR WIDGET ==============
+@trace_methods
+class CalendarWidget(BaseWidget):
+    """Calendar with visible events below each date"""
+    
+    CELL_EVENTS = 2  # Events listed in a date cell; the rest show as "+N"
+    
+    def __init__(self, master, app):
+        super().__init__(master, "📅 Calendar", "calendar", app, (380, 480))
+        self.current_date = datetime.now()
+        self.selected_date = None
+        self.create_content()
+    
+    def create_content(self):
+        # Navigation
+        nav = tk.Frame(self.content, bg=self.theme["bg"])
+        nav.pack(fill="x", pady=(0, 8))
+        
+        self.prev_btn = tk.Button(
+            nav, text="◀ Prev", command=self.prev_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2",
+            activebackground=self.theme["highlight"]
+        )
+        self.prev_btn.pack(side="left")
+        
+        self.month_label = tk.Label(
+            nav, text="", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["header"]
+        )
+        self.month_label.pack(side="left", fill="x", expand=True)
+        
+        self.next_btn = tk.Button(
+            nav, text="Next ▶", command=self.next_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2",
+            activebackground=self.theme["highlight"]
+        )
+        self.next_btn.pack(side="right")
+        
+        # Day headers
+        days_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        days_frame.pack(fill="x", pady=(0, 3))
+        
+        self.day_headers = []
+        for day in ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]:
+            lbl = tk.Label(
+                days_frame, text=day, bg=self.theme["header"],
+                fg=self.theme["text"], font=FONTS["calendar_day"],
+                width=5, pady=3
+            )
+            lbl.pack(side="left", expand=True, fill="x", padx=1)
+            self.day_headers.append(lbl)
+        
+        # Calendar grid with scrollable frame
+        self.cal_container = tk.Frame(self.content, bg=self.theme["bg"])
+        self.cal_container.pack(fill="both", expand=True)
+        
+        self.cal_canvas = tk.Canvas(self.cal_container, bg=self.theme["bg"], highlightthickness=0)
+        self.cal_scrollbar = tk.Scrollbar(self.cal_container, orient="vertical", command=self.cal_canvas.yview)
+        
+        self.cal_frame = tk.Frame(self.cal_canvas, bg=self.theme["bg"])
+        
+        self.cal_canvas.pack(side="left", fill="both", expand=True)
+        self.cal_scrollbar.pack(side="right", fill="y")
+        self.cal_canvas.configure(yscrollcommand=self.cal_scrollbar.set)
+        
+        self.cal_window = self.cal_canvas.create_window((0, 0), window=self.cal_frame, anchor="nw")
+        
+        self.cal_frame.bind("<Configure>", self.on_frame_configure)
+        self.cal_canvas.bind("<Configure>", self.on_canvas_configure)
+        
+        # Create date cells
+        self.date_cells = []
+        for row in range(6):
+            row_cells = []
+            for col in range(7):
+                cell = self.create_date_cell(row, col)
+                row_cells.append(cell)
+            self.date_cells.append(row_cells)
+        
+        # Event editing section
+        self.edit_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        self.edit_frame.pack(fill="x", pady=(8, 0))
+        
+        self.selected_label = tk.Label(
+            self.edit_frame, text="📝 Select a date to add events",
+            bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["small"], anchor="w"
+        )
+        self.selected_label.pack(fill="x")
+        
+        # One row per event of the selected date, then a row to add one
+        self.event_list = tk.Frame(self.edit_frame, bg=self.theme["bg"])
+        self.event_list.pack(fill="x")
+        self.event_rows = []
+        
+        self.add_row = tk.Frame(self.edit_frame, bg=self.theme["bg"])
+        self.add_row.pack(fill="x", pady=(3, 0))
+        
+        self.new_start_entry = tk.Entry(
+            self.add_row, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid", width=5
+        )
+        self.new_start_entry.pack(side="left", padx=(0, 3))
+        self.new_start_entry.bind("<Return>", self.add_event)
+        
+        self.add_event_btn = tk.Button(
+            self.add_row, text="+", command=self.add_event,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2",
+            activebackground=self.theme["highlight"]
+        )
+        self.add_event_btn.pack(side="right", padx=(3, 0))
+        
+        self.event_entry = tk.Entry(
+            self.add_row, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        self.event_entry.pack(side="left", fill="x", expand=True)
+        self.event_entry.bind("<Return>", self.add_event)
+        
+        self.update_calendar()
+    
+    def create_date_cell(self, row, col):
+        """Create a date cell with space for events"""
+        cell_frame = tk.Frame(self.cal_frame, bg=self.theme["entry"], bd=1, relief="solid")
+        cell_frame.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
+        
+        # Configure grid weights
+        self.cal_frame.columnconfigure(col, weight=1)
+        self.cal_frame.rowconfigure(row, weight=1)
+        
+        # Date number
+        date_label = tk.Label(
+            cell_frame, text="", bg=self.theme["entry"],
+            fg=self.theme["text"], font=FONTS["calendar_day"],
+            anchor="nw", padx=3, pady=1
+        )
+        date_label.pack(fill="x", anchor="nw")
+        
+        # Event text (below date)
+        event_label = tk.Label(
+            cell_frame, text="", bg=self.theme["entry"],
+            fg=self.theme["accent"], font=FONTS["calendar_event"],
+            anchor="nw", padx=3, pady=0, justify="left",
+            wraplength=45
+        )
+        event_label.pack(fill="both", expand=True, anchor="nw")
+        
+        # Bind click events
+        for widget in [cell_frame, date_label, event_label]:
+            widget.bind("<Button-1>", lambda e, r=row, c=col: self.select_date(r, c))
+            widget.bind("<Enter>", lambda e, f=cell_frame: f.config(bg=self.theme["highlight"]))
+            widget.bind("<Leave>", lambda e, f=cell_frame, d=date_label, ev=event_label: self.reset_cell_bg(f, d, ev))
+        
+        return {
+            "frame": cell_frame,
+            "date_label": date_label,
+            "event_label": event_label,
+            "date_value": None
+        }
+    
+    def reset_cell_bg(self, frame, date_lbl, event_lbl):
+        """Reset cell background on mouse leave"""
+        bg = self.theme["entry"]
+        if hasattr(frame, 'is_today') and frame.is_today:
+            bg = self.theme["accent"]
+        elif hasattr(frame, 'is_selected') and frame.is_selected:
+            bg = self.theme["header"]
+        frame.config(bg=bg)
+        date_lbl.config(bg=bg)
+        event_lbl.config(bg=bg)
+    
+    def on_frame_configure(self, event):
+        self.cal_canvas.configure(scrollregion=self.cal_canvas.bbox("all"))
+    
+    def on_canvas_configure(self, event):
+        self.cal_canvas.itemconfig(self.cal_window, width=event.width)
+    
+    def update_calendar(self):
+        """Update calendar display with events"""
+        year = self.current_date.year
+        month = self.current_date.month
+        
+        self.month_label.config(text=f"{calendar.month_name[month]} {year}")
+        
+        cal = calendar.monthcalendar(year, month)
+        today = datetime.now()
+        events = self.app.store.calendar.entries()
+        
+        for row in range(6):
+            for col in range(7):
+                cell = self.date_cells[row][col]
+                frame = cell["frame"]
+                date_lbl = cell["date_label"]
+                event_lbl = cell["event_label"]
+                
+                if row < len(cal) and cal[row][col] != 0:
+                    day = cal[row][col]
+                    date_key = f"{year}-{month:02d}-{day:02d}"
+                    
+                    cell["date_value"] = date_key
+                    date_lbl.config(text=str(day))
+                    
+                    # Days are kept in time order, so the first few are the ones to show
+                    day_events = events.get(date_key, [])
+                    lines = []
+                    for event in day_events[:self.CELL_EVENTS]:
+                        label = event_label(event)
+                        lines.append(label[:12] + "…" if len(label) > 12 else label)
+                    if len(day_events) > self.CELL_EVENTS:
+                        lines.append(f"+{len(day_events) - self.CELL_EVENTS} more")
+                    event_lbl.config(text="\n".join(lines))
+                    event_color = day_events[0].get("color") if day_events else None
+                    
+                    # Styling
+                    frame.is_today = False
+                    frame.is_selected = False
+                    
+                    if year == today.year and month == today.month and day == today.day:
+                        bg = self.theme["accent"]
+                        fg = "white"
+                        frame.is_today = True
+                    elif date_key == self.selected_date:
+                        bg = self.theme["header"]
+                        fg = self.theme["text"]
+                        frame.is_selected = True
+                    elif day_events:
+                        bg = self.theme["button"]
+                        fg = self.theme["text"]
+                    else:
+                        bg = self.theme["entry"]
+                        fg = self.theme["text"]
+                    
+                    frame.config(bg=bg)
+                    date_lbl.config(bg=bg, fg=fg)
+                    event_lbl.config(bg=bg, fg="white" if frame.is_today else event_color or self.theme["accent"])
+                    
+                    frame.grid()
+                else:
+                    cell["date_value"] = None
+                    date_lbl.config(text="")
+                    event_lbl.config(text="")
+                    frame.config(bg=self.theme["bg"])
+                    date_lbl.config(bg=self.theme["bg"])
+                    event_lbl.config(bg=self.theme["bg"])
+    
+    def select_date(self, row, col):
+        """Select a date for editing"""
+        cell = self.date_cells[row][col]
+        if cell["date_value"]:
+            self.selected_date = cell["date_value"]
+            self.selected_label.config(text=f"📝 Events for {self.selected_date}:")
+            self.load_events()
+            self.update_calendar()
+    
+    def load_events(self):
+        """Rebuild the editor rows for the selected date"""
+        self.flush_edits()
+        for row in self.event_list.winfo_children():
+            row.destroy()
+        self.event_rows = []
+        if self.selected_date:
+            for event in self.app.store.calendar.get(self.selected_date):
+                self.create_event_row(event)
+        self.mark_overlaps()
+    
+    def create_event_row(self, event):
+        """Start, end, text, colour and delete for one event"""
+        event_id = event["id"]
+        row = tk.Frame(self.event_list, bg=self.theme["bg"])
+        row.pack(fill="x", pady=(3, 0))
+        
+        times = {}
+        for field in ("start", "end"):
+            entry = tk.Entry(
+                row, bg=self.theme["entry"], fg=self.theme["text"],
+                font=FONTS["normal"], bd=1, relief="solid", width=5
+            )
+            entry.insert(0, event.get(field, ""))
+            entry.pack(side="left", padx=(0, 3))
+            # Times are saved once complete, not while half typed
+            entry.bind("<Return>", lambda e, f=field, en=entry: self.save_event_time(event_id, f, en))
+            entry.bind("<FocusOut>", lambda e, f=field, en=entry: self.save_event_time(event_id, f, en))
+            times[field] = entry
+        
+        del_btn = tk.Label(row, text="✕", bg=self.theme["bg"], fg="#FF6B6B", font=FONTS["small"], cursor="hand2")
+        del_btn.pack(side="right", padx=(3, 0))
+        del_btn.bind("<Button-1>", lambda e: self.delete_event(event_id))
+        
+        color_btn = tk.Label(
+            row, text="●", bg=self.theme["bg"], fg=event.get("color") or self.theme["accent"],
+            font=FONTS["normal"], cursor="hand2"
+        )
+        color_btn.pack(side="right", padx=(3, 0))
+        color_btn.bind("<Button-1>", lambda e: self.pick_event_color(event_id, color_btn))
+        
+        text_entry = tk.Entry(
+            row, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        text_entry.insert(0, event.get("text", ""))
+        text_entry.pack(side="left", fill="x", expand=True)
+        day = self.selected_date
+        self.watch_edits(text_entry, lambda day, text: self.save_event(event_id, text=text, day=day), key=lambda: day)
+        
+        self.event_rows.append({"id": event_id, "start": times["start"], "end": times["end"], "text": text_entry})
+    
+    def save_event(self, event_id, day=None, **fields):
+        """Save the changed fields of one event (of the selected date unless day is given)"""
+        day = day or self.selected_date
+        if day and self.app.store.calendar.update(day, event_id, source=self, **fields):
+            self.update_calendar()
+    
+    def save_event_time(self, event_id, field, entry):
+        if not entry.winfo_exists():
+            return  # FocusOut from a row that load_events() just replaced
+        try:
+            value = event_time(entry.get())
+        except ValueError:
+            entry.config(fg="#FF6B6B")
+            return
+        entry.config(fg=self.theme["text"])
+        if entry.get() != value:
+            entry.delete(0, "end")
+            entry.insert(0, value)
+        self.save_event(event_id, **{field: value})
+        order = [event["id"] for event in self.app.store.calendar.get(self.selected_date)]
+        if order != [row["id"] for row in self.event_rows]:
+            self.load_events()  # The event moved to keep the day in time order
+        else:
+            self.mark_overlaps()
+    
+    def mark_overlaps(self):
+        """Highlight the times of events that overlap another one"""
+        events = self.app.store.calendar.get(self.selected_date) if self.selected_date else []
+        clashing = set()
+        for event in events:
+            start, end = event.get("start", ""), event.get("end", "")
+            if start and end > start:
+                others = [other["id"] for other in events_overlapping(events, start, end) if other is not event]
+                if others:
+                    clashing.update(others)
+                    clashing.add(event["id"])
+        for row in self.event_rows:
+            bg = "#FFE5A0" if row["id"] in clashing else self.theme["entry"]
+            row["start"].config(bg=bg)
+            row["end"].config(bg=bg)
+    
+    def pick_event_color(self, event_id, color_btn):
+        color = colorchooser.askcolor(parent=self.window, title="Event colour")[1]
+        if color:
+            color_btn.config(fg=color)
+            self.save_event(event_id, color=color)
+    
+    def add_event(self, event=None):
+        text = self.event_entry.get().strip()
+        if not self.selected_date or not text:
+            return
+        try:
+            start = event_time(self.new_start_entry.get())
+        except ValueError:
+            self.new_start_entry.config(fg="#FF6B6B")
+            return
+        self.new_start_entry.config(fg=self.theme["text"])
+        self.app.store.calendar.add(self.selected_date, text, start, source=self)
+        self.event_entry.delete(0, "end")
+        self.new_start_entry.delete(0, "end")
+        self.load_events()
+        self.update_calendar()
+    
+    def delete_event(self, event_id):
+        self.flush_edits()
+        if self.app.store.calendar.remove(self.selected_date, event_id, source=self):
+            self.load_events()
+            self.update_calendar()
+    
+    def on_data_changed(self, section, key):
+        if section != "calendar_events":
+            return
+        if self.selected_date and key in (None, self.selected_date):
+            self.load_events()
+        self.update_calendar()
+    
+    def show_date(self, date_key, event_id=None):
+        """Jump to the month of date_key and select it (and one of its events) for editing"""
+        self.current_date = datetime.strptime(date_key, "%Y-%m-%d")
+        self.selected_date = date_key
+        self.selected_label.config(text=f"📝 Events for {date_key}:")
+        self.load_events()
+        for row in self.event_rows:
+            if row["id"] == event_id:
+                row["text"].focus_set()
+        self.update_calendar()
+    
+    def prev_month(self):
+        if self.current_date.month == 1:
+            self.current_date = self.current_date.replace(year=self.current_date.year - 1, month=12)
+        else:
+            self.current_date = self.current_date.replace(month=self.current_date.month - 1)
+        self.update_calendar()
+    
+    def next_month(self):
+        if self.current_date.month == 12:
+            self.current_date = self.current_date.replace(year=self.current_date.year + 1, month=1)
+        else:
+            self.current_date = self.current_date.replace(month=self.current_date.month + 1)
+        self.update_calendar()
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.prev_btn.config(bg=theme["button"], fg=theme["text"], activebackground=theme["highlight"])
+        self.next_btn.config(bg=theme["button"], fg=theme["text"], activebackground=theme["highlight"])
+        self.month_label.config(bg=theme["bg"], fg=theme["text"])
+        
+        for lbl in self.day_headers:
+            lbl.config(bg=theme["header"], fg=theme["text"])
+        
+        self.cal_container.config(bg=theme["bg"])
+        self.cal_canvas.config(bg=theme["bg"])
+        self.cal_frame.config(bg=theme["bg"])
+        
+        self.edit_frame.config(bg=theme["bg"])
+        self.selected_label.config(bg=theme["bg"], fg=theme["text"])
+        self.event_list.config(bg=theme["bg"])
+        self.add_row.config(bg=theme["bg"])
+        self.new_start_entry.config(bg=theme["entry"], fg=theme["text"])
+        self.event_entry.config(bg=theme["entry"], fg=theme["text"])
+        self.add_event_btn.config(bg=theme["button"], fg=theme["text"], activebackground=theme["highlight"])
+        
+        self.load_events()
+        self.update_calendar()
+
+
+# ============== TODO LIST WIDGET ==============
+@trace_methods
+class TodoWidget(BaseWidget):
+    """Enhanced To-Do List with priorities"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "✅ To-Do List", "todo", app, (360, 450))
+        self.index = TodoIndex(app.store.data, app.store.layout.setting("todo_sort", "priority"))
+        self.create_content()
+    
+    def create_content(self):
+        # Add task section
+        add_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        add_frame.pack(fill="x", pady=(0, 8))
+        
+        self.task_entry = tk.Entry(
+            add_frame, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        self.task_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        self.task_entry.insert(0, "Enter new task...")
+        self.task_entry.bind("<FocusIn>", lambda e: self.task_entry.delete(0, "end") if self.task_entry.get() == "Enter new task..." else None)
+        self.task_entry.bind("<Return>", self.add_task)
+        
+        # Optional due date
+        self.due_entry = tk.Entry(
+            add_frame, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["small"], bd=1, relief="solid", width=10
+        )
+        self.due_entry.pack(side="left", padx=(0, 5))
+        self.due_entry.insert(0, "YYYY-MM-DD")
+        self.due_entry.bind("<FocusIn>", lambda e: self.due_entry.delete(0, "end") if self.due_entry.get() == "YYYY-MM-DD" else None)
+        self.due_entry.bind("<Return>", self.add_task)
+        
+        # Priority dropdown
+        self.priority_var = tk.StringVar(value="●")
+        self.priority_menu = ttk.Combobox(
+            add_frame, textvariable=self.priority_var,
+            values=TODO_PRIORITIES, width=10, state="readonly"
+        )
+        self.priority_menu.pack(side="left", padx=(0, 5))
+        self.priority_menu.current(1)
+        
+        self.add_btn = tk.Button(
+            add_frame, text="➕", command=self.add_task,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2"
+        )
+        self.add_btn.pack(side="right")
+        
+        # Filter buttons
+        filter_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        filter_frame.pack(fill="x", pady=(0, 5))
+        
+        self.filter_var = tk.StringVar(value="all")
+        
+        for text, val in [("All", "all"), ("Active", "active"), ("Done", "done")]:
+            rb = tk.Radiobutton(
+                filter_frame, text=text, variable=self.filter_var,
+                value=val, bg=self.theme["bg"], fg=self.theme["text"],
+                font=FONTS["small"], selectcolor=self.theme["entry"],
+                activebackground=self.theme["bg"], command=self.load_tasks
+            )
+            rb.pack(side="left", padx=5)
+        
+        # Sort order
+        sort_names = {mode: name for name, mode in TODO_SORT_MODES.items()}
+        self.sort_var = tk.StringVar(value=sort_names[self.index.sort_mode])
+        self.sort_menu = ttk.Combobox(
+            filter_frame, textvariable=self.sort_var,
+            values=list(TODO_SORT_MODES), width=9, state="readonly"
+        )
+        self.sort_menu.pack(side="right")
+        self.sort_menu.bind("<<ComboboxSelected>>", self.change_sort)
+        
+        # Task list
+        list_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        list_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(list_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.task_canvas = tk.Canvas(
+            list_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.task_canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.task_canvas.yview)
+        
+        self.task_container = tk.Frame(self.task_canvas, bg=self.theme["bg"])
+        self.task_canvas.create_window((0, 0), window=self.task_container, anchor="nw")
+        
+        self.task_container.bind("<Configure>",
+            lambda e: self.task_canvas.configure(scrollregion=self.task_canvas.bbox("all")))
+        
+        # Stats
+        self.stats_label = tk.Label(
+            self.content, text="", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]
+        )
+        self.stats_label.pack(fill="x", pady=(5, 0))
+        
+        self.load_tasks()
+    
+    def load_tasks(self):
+        """Load and display tasks"""
+        for widget in self.task_container.winfo_children():
+            widget.destroy()
+        
+        for task in self.index.view(self.filter_var.get()):
+            self.create_task_row(task)
+        
+        done, total = self.index.counts()
+        self.stats_label.config(text=f"📊 {done}/{total} completed")
+    
+    def create_task_row(self, task):
+        """Create a task row"""
+        task_id = task["id"]
+        priority = task.get("priority", "🟡 Medium")
+        priority_colors = {
+            "🔴 High": "#FFE5E5",
+            "🟡 Medium": "#FFF9E5",
+            "🟢 Low": "#E5FFE5"
+        }
+        row_bg = priority_colors.get(priority, self.theme["entry"])
+        
+        row = tk.Frame(self.task_container, bg=row_bg, pady=4, padx=5)
+        row.pack(fill="x", pady=2)
+        
+        # Priority indicator
+        priority_icon = priority.split()[0] if priority else "●"
+        tk.Label(row, text=priority_icon, bg=row_bg, font=FONTS["small"]).pack(side="left")
+        
+        # Checkbox
+        var = tk.BooleanVar(value=task.get("done", False))
+        cb = tk.Checkbutton(
+            row, variable=var, bg=row_bg, activebackground=row_bg,
+            command=lambda: self.toggle_task(task_id, var.get())
+        )
+        cb.pack(side="left")
+        
+        # Task text
+        text_style = "overstrike" if task.get("done") else "normal"
+        text_color = "#999999" if task.get("done") else self.theme["text"]
+        
+        lbl = tk.Label(
+            row, text=task.get("text", ""), bg=row_bg, fg=text_color,
+            font=("Segoe UI", 10, text_style), anchor="w"
+        )
+        lbl.pack(side="left", fill="x", expand=True, padx=5)
+        
+        # Delete button
+        del_btn = tk.Label(
+            row, text="🗑️", bg=row_bg, fg="#FF6B6B",
+            font=FONTS["normal"], cursor="hand2"
+        )
+        del_btn.pack(side="right", padx=3)
+        del_btn.bind("<Button-1>", lambda e: self.delete_task(task_id))
+        
+        # Manual ordering arrows
+        if self.index.sort_mode == "manual":
+            for arrow, step in (("▼", 1), ("▲", -1)):
+                move_btn = tk.Label(
+                    row, text=arrow, bg=row_bg, fg=self.theme["text"],
+                    font=FONTS["tiny"], cursor="hand2"
+                )
+                move_btn.pack(side="right")
+                move_btn.bind("<Button-1>", lambda e, s=step: self.move_task(task_id, s))
+        
+        # Due date
+        due = task.get("due")
+        if due:
+            overdue = not task.get("done") and due < date.today().isoformat()
+            tk.Label(
+                row, text=f"📅 {due[5:]}", bg=row_bg,
+                fg="#FF6B6B" if overdue else "#888888", font=FONTS["tiny"]
+            ).pack(side="right", padx=3)
+    
+    def on_data_changed(self, section, key):
+        if section == "todos":
+            self.index.update(key)
+            self.load_tasks()
+    
+    def add_task(self, event=None):
+        text = self.task_entry.get().strip()
+        if text and text != "Enter new task...":
+            self.task_entry.delete(0, "end")
+            due = self.due_entry.get().strip()
+            self.due_entry.delete(0, "end")
+            self.due_entry.insert(0, "YYYY-MM-DD")
+            self.create_task(text, self.priority_var.get(), due)
+    
+    def create_task(self, text, priority, due=""):
+        task = self.app.store.todos.add(text, priority, due, source=self)
+        self.index.add(task)
+        self.load_tasks()
+    
+    def toggle_task(self, task_id, done):
+        task = self.index.tasks.get(task_id)
+        if task is not None:
+            self.app.store.todos.set_done(task_id, done, source=self)
+            self.index.refresh(task)
+            self.load_tasks()
+    
+    def delete_task(self, task_id):
+        if task_id in self.index.tasks:
+            self.app.store.todos.remove(task_id, source=self)
+            self.index.discard(task_id)
+            self.load_tasks()
+    
+    def move_task(self, task_id, step):
+        other = self.index.neighbour(task_id, step)
+        if other is not None:
+            task = self.index.tasks[task_id]
+            self.app.store.todos.swap_order(task, other, source=self)
+            self.index.refresh(task)
+            self.index.refresh(other)
+            self.load_tasks()
+    
+    def change_sort(self, event=None):
+        mode = TODO_SORT_MODES[self.sort_var.get()]
+        self.index.set_sort(mode)
+        self.app.store.layout.set_setting("todo_sort", mode)
+        self.load_tasks()
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.task_entry.config(bg=theme["entry"], fg=theme["text"])
+        self.due_entry.config(bg=theme["entry"], fg=theme["text"])
+        self.add_btn.config(bg=theme["accent"])
+        self.task_canvas.config(bg=theme["bg"])
+        self.task_container.config(bg=theme["bg"])
+        self.stats_label.config(bg=theme["bg"], fg=theme["text"])
+        
+        self.load_tasks()
+
+
+# ============== DAY PLANNER WIDGET ==============
+@trace_methods
+class DayPlannerWidget(BaseWidget):
+    """Day planner with time slots"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "📆 Day Planner", "day_planner", app, (320, 480))
+        self.current_date = date.today().isoformat()
+        self.create_content()
+    
+    def create_content(self):
+        # Date navigation
+        nav = tk.Frame(self.content, bg=self.theme["bg"])
+        nav.pack(fill="x", pady=(0, 8))
+        
+        self.prev_filled_btn = tk.Button(
+            nav, text="⏮", command=self.prev_filled_day,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.prev_filled_btn.pack(side="left", padx=(0, 2))
+        
+        self.prev_btn = tk.Button(
+            nav, text="◀", command=self.prev_day,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        )
+        self.prev_btn.pack(side="left")
+        
+        self.today_btn = tk.Button(
+            nav, text="Today", command=self.go_today,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["small"], bd=0, padx=8, cursor="hand2"
+        )
+        self.today_btn.pack(side="left", padx=5)
+        
+        self.date_label = tk.Label(
+            nav, text="", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["header"]
+        )
+        self.date_label.pack(side="left", fill="x", expand=True)
+        
+        self.next_filled_btn = tk.Button(
+            nav, text="⏭", command=self.next_filled_day,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.next_filled_btn.pack(side="right", padx=(2, 0))
+        
+        self.next_btn = tk.Button(
+            nav, text="▶", command=self.next_day,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        )
+        self.next_btn.pack(side="right")
+        
+        # Time slots
+        scroll_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        scroll_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(scroll_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas = tk.Canvas(
+            scroll_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.slots_frame = tk.Frame(self.canvas, bg=self.theme["bg"])
+        self.canvas.create_window((0, 0), window=self.slots_frame, anchor="nw")
+        
+        self.time_entries = {}
+        
+        # Create slots from 5 AM to 11 PM
+        for hour in range(5, 24):
+            self.create_time_slot(hour)
+        
+        self.slots_frame.bind("<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        
+        self.load_day_data()
+    
+    def create_time_slot(self, hour):
+        row = tk.Frame(self.slots_frame, bg=self.theme["bg"])
+        row.pack(fill="x", pady=1)
+        
+        # Current hour highlighting
+        current_hour = datetime.now().hour
+        is_current = (hour == current_hour and self.current_date == date.today().isoformat())
+        
+        time_bg = self.theme["accent"] if is_current else self.theme["header"]
+        time_fg = "white" if is_current else self.theme["text"]
+        
+        # Time label
+        time_str = f"{hour:02d}:00"
+        time_lbl = tk.Label(
+            row, text=time_str, bg=time_bg, fg=time_fg,
+            font=FONTS["time"], width=6, pady=4
+        )
+        time_lbl.pack(side="left", padx=(0, 3))
+        
+        # Task entry
+        entry = tk.Entry(
+            row, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        entry.pack(side="left", fill="x", expand=True)
+        watcher = self.watch_edits(entry, lambda day, text, h=hour: self.save_slot(day, h, text),
+                                   key=lambda: self.current_date)
+        
+        self.time_entries[hour] = {"entry": entry, "time_label": time_lbl, "watcher": watcher}
+    
+    def load_day_data(self):
+        # Format date nicely
+        self.date_label.config(text=long_date_label(self.current_date))
+        
+        current_hour = datetime.now().hour
+        is_today = self.current_date == date.today().isoformat()
+        
+        for hour, widgets in self.time_entries.items():
+            time_lbl = widgets["time_label"]
+            widgets["watcher"].set(lambda h=hour: self.app.store.day_plan.get(self.current_date).get(str(h), ""))
+            
+            # Highlight current hour
+            is_current = (hour == current_hour and is_today)
+            time_bg = self.theme["accent"] if is_current else self.theme["header"]
+            time_fg = "white" if is_current else self.theme["text"]
+            time_lbl.config(bg=time_bg, fg=time_fg)
+    
+    def save_slot(self, day, hour, text):
+        self.app.store.day_plan.set_slot(day, hour, text, source=self)
+    
+    def on_data_changed(self, section, key):
+        if section == "day_planner" and key in (None, self.current_date):
+            self.load_day_data()
+    
+    def show_date(self, date_key, hour=None):
+        """Jump to a given day, focusing an hour slot if given"""
+        self.current_date = date_key
+        self.load_day_data()
+        if hour is not None and hour in self.time_entries:
+            self.time_entries[hour]["entry"].focus_set()
+    
+    def prev_day(self):
+        self.current_date = ordinal_to_date_key(date_key_to_ordinal(self.current_date) - 1)
+        self.load_day_data()
+    
+    def next_day(self):
+        self.current_date = ordinal_to_date_key(date_key_to_ordinal(self.current_date) + 1)
+        self.load_day_data()
+    
+    def prev_filled_day(self):
+        key = self.app.date_index.prev_key("day_planner", self.current_date)
+        if key:
+            self.current_date = key
+            self.load_day_data()
+    
+    def next_filled_day(self):
+        key = self.app.date_index.next_key("day_planner", self.current_date)
+        if key:
+            self.current_date = key
+            self.load_day_data()
+    
+    def go_today(self):
+        self.current_date = date.today().isoformat()
+        self.load_day_data()
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.prev_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_btn.config(bg=theme["button"], fg=theme["text"])
+        self.prev_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.today_btn.config(bg=theme["accent"])
+        self.date_label.config(bg=theme["bg"], fg=theme["text"])
+        self.canvas.config(bg=theme["bg"])
+        self.slots_frame.config(bg=theme["bg"])
+        
+        self.load_day_data()
+
+
+# ============== HORIZONTAL WEEK PLANNER ==============
+@trace_methods
+class WeekPlannerWidget(BaseWidget):
+    """Horizontal week planner"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "📋 Week Planner", "week_planner", app, (700, 380))
+        self.current_week_start = self.get_week_start(datetime.now())
+        self.create_content()
+    
+    def get_week_start(self, date):
+        return date - timedelta(days=date.weekday())
+    
+    def create_content(self):
+        # Navigation
+        nav = tk.Frame(self.content, bg=self.theme["bg"])
+        nav.pack(fill="x", pady=(0, 8))
+        
+        self.prev_filled_btn = tk.Button(
+            nav, text="⏮", command=self.prev_filled_week,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.prev_filled_btn.pack(side="left", padx=(0, 2))
+        
+        self.prev_btn = tk.Button(
+            nav, text="◀ Prev Week", command=self.prev_week,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2"
+        )
+        self.prev_btn.pack(side="left")
+        
+        self.week_label = tk.Label(
+            nav, text="", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["header"]
+        )
+        self.week_label.pack(side="left", fill="x", expand=True)
+        
+        self.today_btn = tk.Button(
+            nav, text="This Week", command=self.go_this_week,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["small"], bd=0, padx=8, cursor="hand2"
+        )
+        self.today_btn.pack(side="right", padx=5)
+        
+        self.next_filled_btn = tk.Button(
+            nav, text="⏭", command=self.next_filled_week,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.next_filled_btn.pack(side="right", padx=(2, 0))
+        
+        self.next_btn = tk.Button(
+            nav, text="Next Week ▶", command=self.next_week,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2"
+        )
+        self.next_btn.pack(side="right")
+        
+        # Horizontal days container
+        self.days_container = tk.Frame(self.content, bg=self.theme["bg"])
+        self.days_container.pack(fill="both", expand=True)
+        
+        self.day_columns = {}
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        
+        for i, day_name in enumerate(days):
+            self.create_day_column(i, day_name)
+            self.days_container.columnconfigure(i, weight=1)
+        
+        self.days_container.rowconfigure(0, weight=0)  # Header
+        self.days_container.rowconfigure(1, weight=1)  # Content
+        
+        self.load_week_data()
+    
+    def create_day_column(self, index, day_name):
+        """Create a vertical day column"""
+        # Header
+        header = tk.Label(
+            self.days_container, text=day_name[:3],
+            bg=self.theme["header"], fg=self.theme["text"],
+            font=FONTS["calendar_day"], pady=5
+        )
+        header.grid(row=0, column=index, sticky="ew", padx=1, pady=(0, 2))
+        
+        # Date sub-label
+        date_lbl = tk.Label(
+            self.days_container, text="",
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["tiny"], pady=2
+        )
+        date_lbl.grid(row=1, column=index, sticky="ew", padx=1)
+        
+        # Text area for tasks
+        text = tk.Text(
+            self.days_container, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["small"], bd=1, relief="solid", wrap="word",
+            width=12
+        )
+        text.grid(row=2, column=index, sticky="nsew", padx=1, pady=2)
+        watcher = self.watch_edits(text, lambda week_key, content, idx=index: self.save_day(week_key, idx, content),
+                                   key=lambda: self.current_week_start.strftime("%Y-%m-%d"))
+        
+        self.day_columns[index] = {
+            "header": header,
+            "date_label": date_lbl,
+            "text": text,
+            "watcher": watcher
+        }
+        
+        self.days_container.rowconfigure(2, weight=1)
+    
+    def load_week_data(self):
+        week_key = self.current_week_start.strftime("%Y-%m-%d")
+        
+        week_end = self.current_week_start + timedelta(days=6)
+        self.week_label.config(
+            text=f"{self.current_week_start.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}"
+        )
+        
+        today = datetime.now().date()
+        
+        for i in range(7):
+            day_date = self.current_week_start + timedelta(days=i)
+            column = self.day_columns[i]
+            
+            # Update date label
+            column["date_label"].config(text=day_date.strftime("%d"))
+            
+            # Highlight today
+            if day_date.date() == today:
+                column["header"].config(bg=self.theme["accent"], fg="white")
+                column["date_label"].config(bg=self.theme["accent"], fg="white")
+            else:
+                column["header"].config(bg=self.theme["header"], fg=self.theme["text"])
+                column["date_label"].config(bg=self.theme["button"], fg=self.theme["text"])
+            
+            # Load text
+            column["watcher"].set(lambda i=i: self.app.store.week_plan.get(week_key).get(str(i), ""))
+    
+    def save_day(self, week_key, day_index, text):
+        self.app.store.week_plan.set_day(week_key, day_index, text, source=self)
+    
+    def on_data_changed(self, section, key):
+        if section == "week_planner" and key in (None, self.current_week_start.strftime("%Y-%m-%d")):
+            self.load_week_data()
+    
+    def show_week(self, week_key, day_index=None):
+        """Jump to the week starting at week_key"""
+        self.current_week_start = datetime.strptime(week_key, "%Y-%m-%d")
+        self.load_week_data()
+        if day_index is not None and day_index in self.day_columns:
+            self.day_columns[day_index]["text"].focus_set()
+    
+    def prev_week(self):
+        self.current_week_start -= timedelta(days=7)
+        self.load_week_data()
+    
+    def next_week(self):
+        self.current_week_start += timedelta(days=7)
+        self.load_week_data()
+    
+    def go_this_week(self):
+        self.current_week_start = self.get_week_start(datetime.now())
+        self.load_week_data()
+    
+    def prev_filled_week(self):
+        key = self.app.date_index.prev_key("week_planner", self.current_week_start.strftime("%Y-%m-%d"))
+        if key:
+            self.show_week(key)
+    
+    def next_filled_week(self):
+        key = self.app.date_index.next_key("week_planner", self.current_week_start.strftime("%Y-%m-%d"))
+        if key:
+            self.show_week(key)
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.prev_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_btn.config(bg=theme["button"], fg=theme["text"])
+        self.prev_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.today_btn.config(bg=theme["accent"])
+        self.week_label.config(bg=theme["bg"], fg=theme["text"])
+        self.days_container.config(bg=theme["bg"])
+        
+        for column in self.day_columns.values():
+            column["text"].config(bg=theme["entry"], fg=theme["text"])
+        
+        self.load_week_data()
+
+
+# ============== MONTHLY PLANNER WIDGET ==============
+
+
+@trace_methods
+class MonthlyPlannerWidget(BaseWidget):
+    """Monthly goals and planning"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "🎯 Monthly Planner", "monthly_planner", app, (340, 480))
+        self.current_date = datetime.now()
+        self.create_content()
+    
+    def create_content(self):
+        # Navigation
+        nav = tk.Frame(self.content, bg=self.theme["bg"])
+        nav.pack(fill="x", pady=(0, 8))
+        
+        self.prev_filled_btn = tk.Button(
+            nav, text="⏮", command=self.prev_filled_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.prev_filled_btn.pack(side="left", padx=(0, 2))
+        
+        self.prev_btn = tk.Button(
+            nav, text="◀", command=self.prev_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        )
+        self.prev_btn.pack(side="left")
+        
+        self.month_label = tk.Label(
+            nav, text="", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["header"]
+        )
+        self.month_label.pack(side="left", fill="x", expand=True)
+        
+        self.next_filled_btn = tk.Button(
+            nav, text="⏭", command=self.next_filled_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["small"], bd=0, padx=4, cursor="hand2"
+        )
+        self.next_filled_btn.pack(side="right", padx=(2, 0))
+        
+        self.next_btn = tk.Button(
+            nav, text="▶", command=self.next_month,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        )
+        self.next_btn.pack(side="right")
+        
+        # Sections with scroll
+        scroll_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        scroll_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(scroll_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas = tk.Canvas(
+            scroll_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.sections_frame = tk.Frame(self.canvas, bg=self.theme["bg"])
+        self.canvas.create_window((0, 0), window=self.sections_frame, anchor="nw")
+        
+        self.section_texts = {}
+        
+        for title, key, height in MONTH_PLAN_SECTIONS:
+            self.create_section(title, key, height)
+        
+        self.sections_frame.bind("<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        
+        self.load_month_data()
+    
+    def create_section(self, title, key, height):
+        frame = tk.Frame(self.sections_frame, bg=self.theme["bg"])
+        frame.pack(fill="x", pady=3)
+        
+        header = tk.Label(
+            frame, text=title, bg=self.theme["header"],
+            fg=self.theme["text"], font=FONTS["small"],
+            anchor="w", padx=8, pady=4
+        )
+        header.pack(fill="x")
+        
+        text = tk.Text(
+            frame, height=height, bg=self.theme["entry"],
+            fg=self.theme["text"], font=FONTS["normal"],
+            bd=1, relief="solid", wrap="word", padx=5, pady=5
+        )
+        text.pack(fill="x")
+        watcher = self.watch_edits(text, lambda month_key, content, k=key: self.save_section(month_key, k, content),
+                                   key=lambda: self.current_date.strftime("%Y-%m"))
+        
+        self.section_texts[key] = {"text": text, "header": header, "watcher": watcher}
+    
+    def load_month_data(self):
+        month_key = self.current_date.strftime("%Y-%m")
+        
+        self.month_label.config(
+            text=f"{calendar.month_name[self.current_date.month]} {self.current_date.year}"
+        )
+        
+        for key, widgets in self.section_texts.items():
+            widgets["watcher"].set(lambda k=key: self.app.store.month_plan.get(month_key).get(k, ""))
+    
+    def save_section(self, month_key, section_key, text):
+        self.app.store.month_plan.set_section(month_key, section_key, text, source=self)
+    
+    def on_data_changed(self, section, key):
+        if section == "monthly_planner" and key in (None, self.current_date.strftime("%Y-%m")):
+            self.load_month_data()
+    
+    def show_month(self, month_key, section_key=None):
+        """Jump to the month given as YYYY-MM"""
+        self.current_date = datetime.strptime(month_key, "%Y-%m")
+        self.load_month_data()
+        if section_key in self.section_texts:
+            self.section_texts[section_key]["text"].focus_set()
+    
+    def prev_month(self):
+        if self.current_date.month == 1:
+            self.current_date = self.current_date.replace(year=self.current_date.year - 1, month=12)
+        else:
+            self.current_date = self.current_date.replace(month=self.current_date.month - 1)
+        self.load_month_data()
+    
+    def next_month(self):
+        if self.current_date.month == 12:
+            self.current_date = self.current_date.replace(year=self.current_date.year + 1, month=1)
+        else:
+            self.current_date = self.current_date.replace(month=self.current_date.month + 1)
+        self.load_month_data()
+    
+    def prev_filled_month(self):
+        key = self.app.date_index.prev_key("monthly_planner", self.current_date.strftime("%Y-%m"))
+        if key:
+            self.show_month(key)
+    
+    def next_filled_month(self):
+        key = self.app.date_index.next_key("monthly_planner", self.current_date.strftime("%Y-%m"))
+        if key:
+            self.show_month(key)
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.prev_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_btn.config(bg=theme["button"], fg=theme["text"])
+        self.prev_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.next_filled_btn.config(bg=theme["button"], fg=theme["text"])
+        self.month_label.config(bg=theme["bg"], fg=theme["text"])
+        self.canvas.config(bg=theme["bg"])
+        self.sections_frame.config(bg=theme["bg"])
+        
+        for widgets in self.section_texts.values():
+            widgets["header"].config(bg=theme["header"], fg=theme["text"])
+            widgets["text"].config(bg=theme["entry"], fg=theme["text"])
+
+
+# ============== CLOCK WIDGET ==============
+@trace_methods
+class ClockWidget(BaseWidget):
+    """Digital clock with date"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "🕐 Clock", "clock", app, (220, 140))
+        self.create_content()
+        self.update_clock()
+    
+    def create_content(self):
+        # Time display
+        self.time_label = tk.Label(
+            self.content, text="", bg=self.theme["bg"],
+            fg=self.theme["accent"], font=FONTS["clock"]
+        )
+        self.time_label.pack(expand=True)
+        
+        # Date display
+        self.date_label = tk.Label(
+            self.content, text="", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["normal"]
+        )
+        self.date_label.pack()
+    
+    def update_clock(self):
+        now = datetime.now()
+        self.time_label.config(text=now.strftime("%H:%M:%S"))
+        self.date_label.config(text=now.strftime("%A, %B %d, %Y"))
+        self.window.after(1000, self.update_clock)
+    
+    def update_theme(self):
+        super().update_theme()
+        self.time_label.config(bg=self.theme["bg"], fg=self.theme["accent"])
+        self.date_label.config(bg=self.theme["bg"], fg=self.theme["text"])
+
+
+# ============== STICKY NOTES WIDGET ==============
+@trace_methods
+class StickyNotesWidget(BaseWidget):
+    """Quick sticky notes"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "📌 Sticky Notes", "sticky_notes", app, (300, 350))
+        self.create_content()
+    
+    def create_content(self):
+        # Add note button
+        add_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        add_frame.pack(fill="x", pady=(0, 5))
+        
+        self.add_btn = tk.Button(
+            add_frame, text="➕ Add New Note", command=self.add_note,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["button"], bd=0, padx=15, pady=5, cursor="hand2"
+        )
+        self.add_btn.pack()
+        
+        # Notes container
+        scroll_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        scroll_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(scroll_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas = tk.Canvas(
+            scroll_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.notes_frame = tk.Frame(self.canvas, bg=self.theme["bg"])
+        self.canvas.create_window((0, 0), window=self.notes_frame, anchor="nw")
+        
+        self.notes_frame.bind("<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        
+        self.load_notes()
+    
+    def load_notes(self):
+        self.flush_edits()
+        for widget in self.notes_frame.winfo_children():
+            widget.destroy()
+        
+        notes = self.app.store.notes.all()
+        
+        note_colors = ["#FFFACD", "#FFE4E1", "#E0FFFF", "#F0FFF0", "#FFF0F5", "#F5F5DC"]
+        
+        for i, note in enumerate(notes):
+            color = note_colors[i % len(note_colors)]
+            self.create_note_card(i, note, color)
+    
+    def create_note_card(self, index, note, bg_color):
+        card = tk.Frame(self.notes_frame, bg=bg_color, pady=5, padx=5)
+        card.pack(fill="x", pady=3, padx=2)
+        
+        # Header with delete button
+        header = tk.Frame(card, bg=bg_color)
+        header.pack(fill="x")
+        
+        time_lbl = tk.Label(
+            header, text=note.get("time", ""), bg=bg_color,
+            fg="#888888", font=FONTS["tiny"]
+        )
+        time_lbl.pack(side="left")
+        
+        del_btn = tk.Label(
+            header, text="✕", bg=bg_color, fg="#FF6B6B",
+            font=FONTS["small"], cursor="hand2"
+        )
+        del_btn.pack(side="right")
+        del_btn.bind("<Button-1>", lambda e: self.delete_note(note["id"]))
+        
+        # Note text
+        text = tk.Text(
+            card, height=3, bg=bg_color, fg="#333333",
+            font=FONTS["normal"], bd=0, wrap="word"
+        )
+        text.pack(fill="x")
+        text.insert("1.0", note.get("text", ""))
+        self.watch_edits(text, self.save_note, key=lambda: note["id"])
+    
+    def add_note(self):
+        self.app.store.notes.add(source=self)
+        self.load_notes()
+    
+    def save_note(self, note_id, text):
+        self.app.store.notes.set_text(note_id, text, source=self)
+    
+    def delete_note(self, note_id):
+        self.flush_edits()
+        self.app.store.notes.remove(note_id, source=self)
+        self.load_notes()
+    
+    def on_data_changed(self, section, key):
+        if section == "sticky_notes":
+            self.load_notes()
+    
+    def update_theme(self):
+        super().update_theme()
+        self.add_btn.config(bg=self.theme["accent"])
+        self.canvas.config(bg=self.theme["bg"])
+        self.notes_frame.config(bg=self.theme["bg"])
+        self.load_notes()
+
+
+# ============== POMODORO TIMER WIDGET ==============
+@trace_methods
+class PomodoroWidget(BaseWidget):
+    """Pomodoro timer for productivity"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "🍅 Pomodoro Timer", "pomodoro", app, (280, 340))
+        self.work_time = 25 * 60
+        self.break_time = 5 * 60
+        self.time_left = self.work_time
+        self.is_running = False
+        self.is_work = True
+        self.sessions = app.store.pomodoro.summary()["today_sessions"]
+        self.interval_start = None
+        self.create_content()
+    
+    def create_content(self):
+        # Mode indicator
+        self.mode_label = tk.Label(
+            self.content, text="🎯 WORK MODE", bg=self.theme["bg"],
+            fg=self.theme["accent"], font=FONTS["header"]
+        )
+        self.mode_label.pack(pady=(10, 5))
+        
+        # Timer display
+        self.timer_label = tk.Label(
+            self.content, text="25:00", bg=self.theme["bg"],
+            fg=self.theme["text"], font=("Segoe UI Light", 48)
+        )
+        self.timer_label.pack(pady=10)
+        
+        # Control buttons
+        btn_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        btn_frame.pack(pady=10)
+        
+        self.start_btn = tk.Button(
+            btn_frame, text="▶ Start", command=self.toggle_timer,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["button"], bd=0, padx=20, pady=8, cursor="hand2"
+        )
+        self.start_btn.pack(side="left", padx=5)
+        
+        self.reset_btn = tk.Button(
+            btn_frame, text="↺ Reset", command=self.reset_timer,
+            bg=self.theme["button"], fg=self.theme["text"],
+            font=FONTS["button"], bd=0, padx=20, pady=8, cursor="hand2"
+        )
+        self.reset_btn.pack(side="left", padx=5)
+        
+        # Session counter
+        self.session_label = tk.Label(
+            self.content, text=f"Sessions: {self.sessions}", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["normal"]
+        )
+        self.session_label.pack(pady=5)
+        
+        # Focus totals from the session ledger
+        self.focus_label = tk.Label(
+            self.content, text="", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]
+        )
+        self.focus_label.pack()
+        
+        # Optional label recorded with each finished interval
+        self.label_entry = tk.Entry(
+            self.content, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["small"], bd=1, relief="solid", width=24
+        )
+        self.label_entry.pack(pady=(5, 0))
+        self.label_entry.insert(0, "Session label...")
+        self.label_entry.bind("<FocusIn>", lambda e: self.label_entry.delete(0, "end") if self.label_entry.get() == "Session label..." else None)
+        
+        self.update_focus_stats()
+        
+        # Settings
+        settings_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        settings_frame.pack(pady=5)
+        
+        tk.Label(settings_frame, text="Work:", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]).pack(side="left")
+        
+        self.work_spin = tk.Spinbox(
+            settings_frame, from_=1, to=60, width=3,
+            font=FONTS["small"], command=self.update_settings
+        )
+        self.work_spin.pack(side="left", padx=2)
+        self.work_spin.delete(0, "end")
+        self.work_spin.insert(0, "25")
+        
+        tk.Label(settings_frame, text="min  Break:", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]).pack(side="left")
+        
+        self.break_spin = tk.Spinbox(
+            settings_frame, from_=1, to=30, width=3,
+            font=FONTS["small"], command=self.update_settings
+        )
+        self.break_spin.pack(side="left", padx=2)
+        self.break_spin.delete(0, "end")
+        self.break_spin.insert(0, "5")
+        
+        tk.Label(settings_frame, text="min", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]).pack(side="left")
+    
+    def update_settings(self):
+        try:
+            self.work_time = int(self.work_spin.get()) * 60
+            self.break_time = int(self.break_spin.get()) * 60
+            if not self.is_running:
+                self.time_left = self.work_time if self.is_work else self.break_time
+                self.update_display()
+        except:
+            pass
+    
+    def toggle_timer(self):
+        self.is_running = not self.is_running
+        self.start_btn.config(text="⏸ Pause" if self.is_running else "▶ Start")
+        if self.is_running:
+            if self.interval_start is None:
+                self.interval_start = time.time()
+            self.run_timer()
+    
+    def run_timer(self):
+        if self.is_running and self.time_left > 0:
+            self.time_left -= 1
+            self.update_display()
+            self.window.after(1000, self.run_timer)
+        elif self.time_left <= 0:
+            self.timer_complete()
+    
+    def timer_complete(self):
+        self.is_running = False
+        self.start_btn.config(text="▶ Start")
+        self.record_interval()
+        
+        if self.is_work:
+            self.sessions += 1
+            self.session_label.config(text=f"Sessions: {self.sessions}")
+            self.is_work = False
+            self.time_left = self.break_time
+            self.mode_label.config(text="☕ BREAK TIME", fg="#4CAF50")
+        else:
+            self.is_work = True
+            self.time_left = self.work_time
+            self.mode_label.config(text="🎯 WORK MODE", fg=self.theme["accent"])
+        
+        self.update_display()
+        
+        # Flash notification
+        self.window.bell()
+    
+    def record_interval(self):
+        """Append the interval that just finished to the session ledger"""
+        end = time.time()
+        seconds = self.work_time if self.is_work else self.break_time
+        start = self.interval_start if self.interval_start is not None else end - seconds
+        label = self.label_entry.get().strip()
+        if label == "Session label...":
+            label = ""
+        
+        self.app.store.pomodoro.record(start, end, "work" if self.is_work else "break", seconds, label)
+        self.interval_start = None
+        self.app.store.commit("pomodoro_log", None, source=self)
+        self.update_focus_stats()
+    
+    def on_data_changed(self, section, key):
+        if section == "pomodoro_log":
+            self.update_focus_stats()
+    
+    def update_focus_stats(self):
+        stats = self.app.store.pomodoro.summary()
+        self.focus_label.config(
+            text=f"Today {stats['today_minutes']}m · Week {stats['week_minutes']}m · All {stats['total_minutes']}m"
+        )
+    
+    def reset_timer(self):
+        self.is_running = False
+        self.is_work = True
+        self.interval_start = None
+        self.time_left = self.work_time
+        self.start_btn.config(text="▶ Start")
+        self.mode_label.config(text="🎯 WORK MODE", fg=self.theme["accent"])
+        self.update_display()
+    
+    def update_display(self):
+        mins, secs = divmod(self.time_left, 60)
+        self.timer_label.config(text=f"{mins:02d}:{secs:02d}")
+    
+    def update_theme(self):
+        super().update_theme()
+        self.mode_label.config(bg=self.theme["bg"])
+        self.timer_label.config(bg=self.theme["bg"], fg=self.theme["text"])
+        self.start_btn.config(bg=self.theme["accent"])
+        self.reset_btn.config(bg=self.theme["button"], fg=self.theme["text"])
+        self.session_label.config(bg=self.theme["bg"], fg=self.theme["text"])
+        self.focus_label.config(bg=self.theme["bg"], fg=self.theme["text"])
+        self.label_entry.config(bg=self.theme["entry"], fg=self.theme["text"])
+
+
+# ============== HABIT TRACKER WIDGET ==============
+@trace_methods
+class HabitTrackerWidget(BaseWidget):
+    """Weekly habit tracker"""
+    
+    def __init__(self, master, app):
+        super().__init__(master, "💪 Habit Tracker", "habit_tracker", app, (470, 350))
+        self.stat_labels = {}
+        self.create_content()
+    
+    def create_content(self):
+        # Add habit
+        add_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        add_frame.pack(fill="x", pady=(0, 8))
+        
+        self.habit_entry = tk.Entry(
+            add_frame, bg=self.theme["entry"], fg=self.theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        self.habit_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        self.habit_entry.insert(0, "New habit...")
+        self.habit_entry.bind("<FocusIn>", lambda e: self.habit_entry.delete(0, "end") if self.habit_entry.get() == "New habit..." else None)
+        self.habit_entry.bind("<Return>", self.add_habit)
+        
+        self.add_btn = tk.Button(
+            add_frame, text="➕", command=self.add_habit,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["button"], bd=0, padx=10, cursor="hand2"
+        )
+        self.add_btn.pack(side="right")
+        
+        # Days header
+        days_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        days_frame.pack(fill="x", pady=(0, 5))
+        
+        tk.Label(days_frame, text="Habit", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"], width=15, anchor="w").pack(side="left")
+        
+        self.day_labels = []
+        for day in ["M", "T", "W", "T", "F", "S", "S"]:
+            lbl = tk.Label(days_frame, text=day, bg=self.theme["header"],
+                fg=self.theme["text"], font=FONTS["small"], width=3)
+            lbl.pack(side="left", padx=1)
+            self.day_labels.append(lbl)
+        
+        self.stats_header = tk.Label(days_frame, text="🔥  30d", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"], width=8)
+        self.stats_header.pack(side="left", padx=(4, 0))
+        
+        tk.Label(days_frame, text="", width=3, bg=self.theme["bg"]).pack(side="left")
+        
+        # Habits list
+        scroll_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        scroll_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(scroll_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas = tk.Canvas(
+            scroll_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.scrollbar.set
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.habits_frame = tk.Frame(self.canvas, bg=self.theme["bg"])
+        self.canvas.create_window((0, 0), window=self.habits_frame, anchor="nw")
+        
+        self.habits_frame.bind("<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        
+        self.load_habits()
+    
+    def get_week_key(self):
+        today = datetime.now()
+        week_start = today - timedelta(days=today.weekday())
+        return week_start.strftime("%Y-%m-%d")
+    
+    def load_habits(self):
+        for widget in self.habits_frame.winfo_children():
+            widget.destroy()
+        
+        habits = self.app.store.habits.names()
+        week_key = self.get_week_key()
+        week_data = self.app.store.habits.week(week_key)
+        self.stat_labels = {}
+        
+        for i, habit in enumerate(habits):
+            self.create_habit_row(i, habit, week_data.get(str(i), []))
+    
+    def create_habit_row(self, index, habit_name, completed_days):
+        row = tk.Frame(self.habits_frame, bg=self.theme["entry"], pady=3)
+        row.pack(fill="x", pady=2)
+        
+        # Habit name (click for the full history)
+        lbl = tk.Label(row, text=habit_name, bg=self.theme["entry"],
+            fg=self.theme["text"], font=FONTS["small"], width=15, anchor="w",
+            cursor="hand2")
+        lbl.pack(side="left", padx=3)
+        lbl.bind("<Button-1>", lambda e: HabitHistoryWindow(self, index))
+        
+        # Day checkboxes
+        vars = []
+        for day in range(7):
+            var = tk.BooleanVar(value=day in completed_days)
+            vars.append(var)
+            
+            cb = tk.Checkbutton(
+                row, variable=var, bg=self.theme["entry"],
+                activebackground=self.theme["entry"],
+                command=lambda idx=index, d=day, v=var: self.toggle_day(idx, d, v.get())
+            )
+            cb.pack(side="left", padx=1)
+        
+        # Streak and 30-day rate
+        stat_lbl = tk.Label(row, text="", bg=self.theme["entry"],
+            fg=self.theme["accent"], font=FONTS["small"], width=8)
+        stat_lbl.pack(side="left", padx=(4, 0))
+        self.stat_labels[index] = stat_lbl
+        self.update_habit_stats(index)
+        
+        # Delete button
+        del_btn = tk.Label(row, text="🗑️", bg=self.theme["entry"],
+            fg="#FF6B6B", font=FONTS["small"], cursor="hand2")
+        del_btn.pack(side="right", padx=3)
+        del_btn.bind("<Button-1>", lambda e: self.delete_habit(index))
+    
+    def update_habit_stats(self, index):
+        stats = self.app.habit_stats.stats(str(index))
+        self.stat_labels[index].config(text=f"{stats['current']}  {stats['rates'][30]:.0%}")
+    
+    def add_habit(self, event=None):
+        text = self.habit_entry.get().strip()
+        if text and text != "New habit...":
+            self.app.store.habits.add(text, source=self)
+            
+            self.habit_entry.delete(0, "end")
+            self.load_habits()
+    
+    def toggle_day(self, habit_index, day, completed):
+        week_key = self.get_week_key()
+        if not self.app.store.habits.set_day(week_key, habit_index, day, completed, source=self):
+            return
+        
+        self.app.habit_stats.set_day(str(habit_index), date_key_to_ordinal(week_key) + day, completed)
+        if habit_index in self.stat_labels:
+            self.update_habit_stats(habit_index)
+    
+    def delete_habit(self, index):
+        self.app.store.habits.remove(index, source=self)
+        self.load_habits()
+    
+    def on_data_changed(self, section, key):
+        if section in ("habits", "habit_tracking"):
+            self.load_habits()
+    
+    def update_theme(self):
+        super().update_theme()
+        self.habit_entry.config(bg=self.theme["entry"], fg=self.theme["text"])
+        self.add_btn.config(bg=self.theme["accent"])
+        self.canvas.config(bg=self.theme["bg"])
+        self.habits_frame.config(bg=self.theme["bg"])
+        
+        for lbl in self.day_labels:
+            lbl.config(bg=self.theme["header"], fg=self.theme["text"])
+        self.stats_header.config(bg=self.theme["bg"], fg=self.theme["text"])
+        
+        self.load_habits()
+
+
+@trace_methods
+class HabitHistoryWindow:
+    """Year-by-year heatmap and statistics for one habit"""
+    
+    CELL = 11
+    
+    def __init__(self, tracker, index):
+        self.tracker = tracker
+        self.app = tracker.app
+        self.habit_key = str(index)
+        self.year = date.today().year
+        theme = tracker.theme
+        self.theme = theme
+        
+        habits = self.app.store.habits.names()
+        name = habits[index] if index < len(habits) else ""
+        
+        self.window = tk.Toplevel(tracker.window)
+        self.window.title(f"💪 {name}")
+        self.window.configure(bg=theme["bg"])
+        self.window.resizable(False, False)
+        
+        nav = tk.Frame(self.window, bg=theme["bg"])
+        nav.pack(fill="x", padx=10, pady=(10, 5))
+        
+        tk.Button(
+            nav, text="◀", command=lambda: self.change_year(-1),
+            bg=theme["button"], fg=theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        ).pack(side="left")
+        
+        self.year_label = tk.Label(
+            nav, text="", bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        self.year_label.pack(side="left", fill="x", expand=True)
+        
+        tk.Button(
+            nav, text="▶", command=lambda: self.change_year(1),
+            bg=theme["button"], fg=theme["text"],
+            font=FONTS["button"], bd=0, padx=8, cursor="hand2"
+        ).pack(side="right")
+        
+        self.canvas = tk.Canvas(
+            self.window, width=54 * self.CELL, height=7 * self.CELL,
+            bg=theme["bg"], highlightthickness=0
+        )
+        self.canvas.pack(padx=10, pady=5)
+        
+        stats = self.app.habit_stats.stats(self.habit_key)
+        rates = stats["rates"]
+        tk.Label(
+            self.window,
+            text=(f"🔥 Current streak: {stats['current']} days    🏆 Longest: {stats['longest']} days\n"
+                  f"7 days: {rates[7]:.0%}    30 days: {rates[30]:.0%}    365 days: {rates[365]:.0%}"),
+            bg=theme["bg"], fg=theme["text"], font=FONTS["small"], justify="left"
+        ).pack(padx=10, pady=(0, 10))
+        
+        self.draw_year()
+    
+    def change_year(self, delta):
+        self.year += delta
+        self.draw_year()
+    
+    def draw_year(self):
+        """Draw one year as week columns, reading a single slice of the bitset"""
+        self.canvas.delete("all")
+        self.year_label.config(text=str(self.year))
+        
+        first = date(self.year, 1, 1).toordinal()
+        last = date(self.year, 12, 31).toordinal()
+        bits = self.app.habit_stats.window_bits(self.habit_key, first, last)
+        offset = date(self.year, 1, 1).weekday()
+        
+        for i in range(last - first + 1):
+            column, row = divmod(i + offset, 7)
+            x, y = column * self.CELL, row * self.CELL
+            color = self.theme["accent"] if bits >> i & 1 else self.theme["button"]
+            self.canvas.create_rectangle(
+                x, y, x + self.CELL - 2, y + self.CELL - 2, fill=color, outline=""
+            )
+
+
+# ============== AGENDA WIDGET ==============
+@trace_methods
+class AgendaWidget(BaseWidget):
+    """Upcoming days merged from the calendar, day planner and week planner"""
+    
+    CHUNK_DAYS = 10
+    
+    def __init__(self, master, app):
+        super().__init__(master, "🗓️ Agenda", "agenda", app, (340, 460))
+        self.days_ahead = app.store.layout.setting("agenda_days", 30)
+        self.first_day = self.last_day = date.today().toordinal()
+        self.day_ordinals = []   # days in range that have content, sorted
+        self.blocks = {}         # ordinal -> frame, for the days rendered so far
+        self.rendered_count = 0
+        self.render_pending = False
+        self.create_content()
+    
+    def create_content(self):
+        # Range selector
+        top = tk.Frame(self.content, bg=self.theme["bg"])
+        top.pack(fill="x", pady=(0, 8))
+        
+        self.range_label = tk.Label(
+            top, text="Next", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["small"]
+        )
+        self.range_label.pack(side="left")
+        
+        self.days_spin = tk.Spinbox(
+            top, from_=1, to=365, width=4,
+            font=FONTS["small"], command=self.update_range
+        )
+        self.days_spin.pack(side="left", padx=4)
+        self.days_spin.delete(0, "end")
+        self.days_spin.insert(0, str(self.days_ahead))
+        self.days_spin.bind("<Return>", lambda e: self.update_range())
+        
+        self.days_label = tk.Label(
+            top, text="days", bg=self.theme["bg"], fg=self.theme["text"],
+            font=FONTS["small"]
+        )
+        self.days_label.pack(side="left")
+        
+        self.today_btn = tk.Button(
+            top, text="Today", command=self.load_agenda,
+            bg=self.theme["accent"], fg="white",
+            font=FONTS["small"], bd=0, padx=8, cursor="hand2"
+        )
+        self.today_btn.pack(side="right")
+        
+        # Day list
+        scroll_frame = tk.Frame(self.content, bg=self.theme["bg"])
+        scroll_frame.pack(fill="both", expand=True)
+        
+        self.scrollbar = tk.Scrollbar(scroll_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.canvas = tk.Canvas(
+            scroll_frame, bg=self.theme["bg"], highlightthickness=0,
+            yscrollcommand=self.on_scroll
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.days_frame = tk.Frame(self.canvas, bg=self.theme["bg"])
+        self.days_window = self.canvas.create_window((0, 0), window=self.days_frame, anchor="nw")
+        
+        self.days_frame.bind("<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas.bind("<Configure>",
+            lambda e: self.canvas.itemconfig(self.days_window, width=e.width))
+        
+        self.empty_label = tk.Label(
+            self.days_frame, text="Nothing planned 🎉", bg=self.theme["bg"],
+            fg=self.theme["text"], font=FONTS["small"]
+        )
+        
+        self.load_agenda()
+    
+    def update_range(self):
+        try:
+            self.days_ahead = max(1, min(365, int(self.days_spin.get())))
+        except ValueError:
+            return
+        self.app.store.layout.set_setting("agenda_days", self.days_ahead)
+        self.load_agenda()
+    
+    def collect_days(self):
+        """Days in range with content, from the per-section date indexes"""
+        index = self.app.date_index
+        first, last = self.first_day, self.last_day
+        days = set(index.range_ordinals("calendar_events", first, last))
+        days.update(index.range_ordinals("day_planner", first, last))
+        
+        weeks = self.app.store.week_plan.entries()
+        for week_start in index.range_ordinals("week_planner", first - 6, last):
+            for column, text in weeks.get(ordinal_to_date_key(week_start), {}).items():
+                day = week_start + int(column)
+                if first <= day <= last and text.strip():
+                    days.add(day)
+        return sorted(days)
+    
+    def day_entries(self, ordinal):
+        """(icon, time, text, jump target) rows for one day"""
+        key = ordinal_to_date_key(ordinal)
+        entries = []
+        
+        # All-day events, then timed events and planner slots by time
+        timed = []
+        for event in self.app.store.calendar.get(key):
+            entry = ("📅", event.get("start", ""), event.get("text", ""), f"calendar_events|{key}|{event['id']}")
+            (timed if entry[1] else entries).append(entry)
+        
+        slots = self.app.store.day_plan.get(key)
+        for hour in sorted(slots, key=int):
+            if slots[hour]:
+                timed.append(("📆", f"{int(hour):02d}:00", slots[hour], f"day_planner|{key}|{hour}"))
+        timed.sort(key=lambda entry: entry[1])
+        entries += timed
+        
+        weekday = date.fromordinal(ordinal).weekday()
+        week_key = ordinal_to_date_key(ordinal - weekday)
+        text = self.app.store.week_plan.get(week_key).get(str(weekday), "")
+        if text.strip():
+            entries.append(("📋", "", text, f"week_planner|{week_key}|{weekday}"))
+        return entries
+    
+    def load_agenda(self):
+        """Rebuild the day list for the current range, rendering the first chunk"""
+        for frame in self.blocks.values():
+            frame.destroy()
+        self.blocks = {}
+        self.rendered_count = 0
+        
+        self.first_day = date.today().toordinal()
+        self.last_day = self.first_day + self.days_ahead - 1
+        self.day_ordinals = self.collect_days()
+        
+        self.canvas.yview_moveto(0)
+        self.render_more()
+    
+    def render_more(self):
+        self.render_pending = False
+        chunk = self.day_ordinals[self.rendered_count:self.rendered_count + self.CHUNK_DAYS]
+        for ordinal in chunk:
+            self.blocks[ordinal] = self.create_day_block(ordinal)
+        self.rendered_count += len(chunk)
+        
+        if self.day_ordinals:
+            self.empty_label.pack_forget()
+        else:
+            self.empty_label.pack(pady=20)
+    
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Render further days only once the user nears the end of the list
+        if float(last) > 0.85 and self.rendered_count < len(self.day_ordinals) and not self.render_pending:
+            self.render_pending = True
+            self.window.after_idle(self.render_more)
+    
+    def create_day_block(self, ordinal, before=None):
+        block = tk.Frame(self.days_frame, bg=self.theme["bg"])
+        if before is not None:
+            block.pack(fill="x", pady=2, before=before)
+        else:
+            block.pack(fill="x", pady=2)
+        self.fill_day_block(block, ordinal)
+        return block
+    
+    def fill_day_block(self, block, ordinal):
+        for widget in block.winfo_children():
+            widget.destroy()
+        
+        day = date.fromordinal(ordinal)
+        is_today = ordinal == date.today().toordinal()
+        tk.Label(
+            block, text=day.strftime("%A, %b %d") + ("  · Today" if is_today else ""),
+            bg=self.theme["accent"] if is_today else self.theme["header"],
+            fg="white" if is_today else self.theme["text"],
+            font=FONTS["small"], anchor="w", padx=6, pady=2
+        ).pack(fill="x")
+        
+        for icon, time_str, text, target in self.day_entries(ordinal):
+            line = f"{icon} {time_str}  {text}" if time_str else f"{icon} {text}"
+            lbl = tk.Label(
+                block, text=" ".join(line.split()), bg=self.theme["entry"],
+                fg=self.theme["text"], font=FONTS["small"], anchor="w",
+                justify="left", padx=8, wraplength=280, cursor="hand2"
+            )
+            lbl.pack(fill="x")
+            lbl.bind("<Button-1>", lambda e, t=target: self.app.jump_to(t))
+    
+    def refresh_day(self, ordinal):
+        """Add, redraw or drop the block of a single day"""
+        has_content = bool(self.day_entries(ordinal))
+        i = bisect.bisect_left(self.day_ordinals, ordinal)
+        present = i < len(self.day_ordinals) and self.day_ordinals[i] == ordinal
+        
+        if has_content and not present:
+            fully_rendered = self.rendered_count == len(self.day_ordinals)
+            self.day_ordinals.insert(i, ordinal)
+            if i < self.rendered_count or fully_rendered:
+                following = self.day_ordinals[i + 1] if i + 1 < len(self.day_ordinals) else None
+                self.blocks[ordinal] = self.create_day_block(ordinal, self.blocks.get(following))
+                self.rendered_count += 1
+                self.empty_label.pack_forget()
+        elif not has_content and present:
+            del self.day_ordinals[i]
+            block = self.blocks.pop(ordinal, None)
+            if block is not None:
+                block.destroy()
+                self.rendered_count -= 1
+            if not self.day_ordinals:
+                self.empty_label.pack(pady=20)
+        elif has_content and ordinal in self.blocks:
+            self.fill_day_block(self.blocks[ordinal], ordinal)
+    
+    def on_data_changed(self, section, key):
+        if section not in ("calendar_events", "day_planner", "week_planner"):
+            return
+        if key is None:
+            self.load_agenda()
+            return
+        
+        try:
+            ordinal = date_key_to_ordinal(key)
+        except ValueError:
+            return
+        days = range(ordinal, ordinal + 7) if section == "week_planner" else (ordinal,)
+        for day in days:
+            if self.first_day <= day <= self.last_day:
+                self.refresh_day(day)
+    
+    def update_theme(self):
+        super().update_theme()
+        theme = self.theme
+        
+        self.range_label.config(bg=theme["bg"], fg=theme["text"])
+        self.days_label.config(bg=theme["bg"], fg=theme["text"])
+        self.today_btn.config(bg=theme["accent"])
+        self.canvas.config(bg=theme["bg"])
+        self.days_frame.config(bg=theme["bg"])
+        self.empty_label.config(bg=theme["bg"], fg=theme["text"])
+        
+        for ordinal, block in self.blocks.items():
+            block.config(bg=theme["bg"])
+            self.fill_day_block(block, ordinal)
+
+
+# ============== SEARCH WINDOW ==============
+@trace_methods
+class SearchWindow:
+    """Search box over all widget data that jumps to the matching widget"""
+    
+    SECTION_LABELS = {
+        "calendar_events": "📅",
+        "day_planner": "📆",
+        "week_planner": "📋",
+        "monthly_planner": "🎯",
+        "sticky_notes": "📌",
+        "todos": "✅"
+    }
+    
+    def __init__(self, app):
+        self.app = app
+        self.results = []
+        theme = THEMES.get(app.store.layout.default_theme(), THEMES["🌊 Ocean Blue"])
+        
+        self.window = tk.Toplevel(app.root)
+        self.window.title("🔍 Search")
+        self.window.geometry("420x380")
+        self.window.configure(bg=theme["bg"])
+        self.window.attributes('-topmost', True)
+        
+        self.entry = tk.Entry(
+            self.window, bg=theme["entry"], fg=theme["text"],
+            font=FONTS["normal"], bd=1, relief="solid"
+        )
+        self.entry.pack(fill="x", padx=10, pady=(10, 5))
+        self.entry.bind("<KeyRelease>", self.run_query)
+        self.entry.bind("<Return>", self.open_selected)
+        self.entry.bind("<Down>", lambda e: self.listbox.focus_set())
+        
+        self.status_label = tk.Label(
+            self.window, text="Type to search all widgets", bg=theme["bg"],
+            fg=theme["text"], font=FONTS["tiny"], anchor="w"
+        )
+        self.status_label.pack(fill="x", padx=10)
+        
+        self.listbox = tk.Listbox(
+            self.window, bg=theme["entry"], fg=theme["text"],
+            font=FONTS["small"], bd=1, relief="solid", activestyle="none",
+            selectbackground=theme["highlight"]
+        )
+        self.listbox.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+        self.listbox.bind("<Double-Button-1>", self.open_selected)
+        self.listbox.bind("<Return>", self.open_selected)
+        
+        self.entry.focus_set()
+    
+    def run_query(self, event=None):
+        start = time.perf_counter()
+        self.results = self.app.search_index.search(self.entry.get())
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        self.listbox.delete(0, "end")
+        for doc_id in self.results:
+            section, key, sub = SearchIndex.split_doc_id(doc_id)
+            text = " ".join(self.app.search_index.get_text(doc_id).split())
+            location = key if section not in ("sticky_notes", "todos") else ""
+            if section == "day_planner":
+                location = f"{key} {int(sub):02d}:00"
+            self.listbox.insert("end", f"{self.SECTION_LABELS[section]} {location}  {text[:60]}")
+        
+        self.status_label.config(text=f"{len(self.results)} results in {elapsed:.1f} ms")
+    
+    def open_selected(self, event=None):
+        selection = self.listbox.curselection()
+        if not selection and self.results:
+            selection = (0,)
+        if selection:
+            self.app.jump_to(self.results[selection[0]])
+
+
+# ============== FILE WATCHER ==============
+class FileWatcher:
+    """Calls back when DATA_FILE may have changed: inotify where available, else stat polling"""
+    
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    
+    def __init__(self, root, callback, interval=2000, settle=300):
+        self.root = root
+        self.callback = callback
+        self.interval = interval
+        self.settle = settle
+        self.fd = None
+        self.pending = None
+    
+    def start(self):
+        self.fd = self.open_inotify()
+        if self.fd is not None:
+            self.root.tk.createfilehandler(self.fd, tk.READABLE, self.on_readable)
+        else:
+            self.root.after(self.interval, self.poll)
+    
+    def open_inotify(self):
+        # The directory is watched, not the file: editors and sync clients
+        # usually replace the file by renaming a temporary one over it
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            if libc.inotify_add_watch(fd, os.path.dirname(DATA_FILE).encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except Exception:
+            return None
+    
+    def on_readable(self, fd, mask):
+        try:
+            while os.read(fd, 65536):
+                pass
+        except OSError:
+            pass
+        # Let the writer finish before looking (events come in bursts)
+        if self.pending is None:
+            self.pending = self.root.after(self.settle, self.fire)
+    
+    def fire(self):
+        self.pending = None
+        self.callback()
+    
+    def poll(self):
+        self.callback()
+        self.root.after(self.interval, self.poll)
+
+
+# ============== SCREEN SETUP ==============
+SCREEN_POLL_MS = 3000
+SM_CXSCREEN = 0
+SM_CYSCREEN = 1
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+
+def screen_signature(root):
+    """Names the monitor setup: primary screen size, plus the virtual desktop when that is bigger"""
+    try:
+        # Tk reads the screen size once at startup on Windows; ask the system
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        screen = (metrics(SM_CXSCREEN), metrics(SM_CYSCREEN))
+        desktop = (metrics(SM_XVIRTUALSCREEN), metrics(SM_YVIRTUALSCREEN),
+                   metrics(SM_CXVIRTUALSCREEN), metrics(SM_CYVIRTUALSCREEN))
+    except AttributeError:
+        screen = (root.winfo_screenwidth(), root.winfo_screenheight())
+        desktop = (root.winfo_vrootx(), root.winfo_vrooty(), root.winfo_vrootwidth(), root.winfo_vrootheight())
+    name = f"{screen[0]}x{screen[1]}"
+    if desktop[2:] != screen:
+        name += f" in {desktop[2]}x{desktop[3]}{desktop[0]:+d}{desktop[1]:+d}"
+    return name
+
+
+# ============== MAIN APPLICATION ==============
+WIDGET_CLASSES = {
+    "calendar": CalendarWidget,
+    "todo": TodoWidget,
+    "day_planner": DayPlannerWidget,
+    "week_planner": WeekPlannerWidget,
+    "monthly_planner": MonthlyPlannerWidget,
+    "clock": ClockWidget,
+    "sticky_notes": StickyNotesWidget,
+    "pomodoro": PomodoroWidget,
+    "habit_tracker": HabitTrackerWidget,
+    "agenda": AgendaWidget
+}
+
+
+class DesktopWidgetsApp:
+    """Main application"""
+    
+    def __init__(self, command_server=None):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.command_server = command_server
+        
+        self.workers = WorkerPool(self.root)
+        self.store = DataStore()
+        self.store.executor = self.workers
+        self.data = self.store.data
+        
+        self.search_index = SearchIndex(self.data)
+        self.search_index.load()
+        self.store.listeners.append(self.search_index.update)
+        self.date_index = DateIndex(self.data)
+        self.store.listeners.append(self.date_index.update)
+        self.habit_stats = HabitStats(self.data)
+        self.store.listeners.append(self.habit_stats.update)
+        self.sync_client = SyncClient(self)
+        self.store.listeners.append(self.sync_client.update)
+        self.store.listeners.append(self.on_store_change)
+        self.search_persist_job = None
+        self.import_job = None
+        self.export_writer = None
+        
+        self.widgets = {}
+        self.store.layout.use_screen(screen_signature(self.root))
+        self.create_widgets()
+        self.create_control_panel()
+        self.setup_autostart()
+        if self.command_server is not None:
+            self.root.after(250, self.poll_commands)
+        self.file_watcher = FileWatcher(self.root, self.store.check_external_changes)
+        self.file_watcher.start()
+        if hasattr(signal, "SIGUSR1"):
+            # `kill -USR1 <pid>` saves the trace buffer (the handler runs on the Tk thread)
+            signal.signal(signal.SIGUSR1, self.dump_trace)
+        self.lag_monitor = LagMonitor(self.root)
+        self.lag_monitor.start()
+        self.root.after(2000, self.update_lag_status)
+        self.memory_monitor = MemoryMonitor(self)
+        self.root.after(60000, self.sample_memory)
+        self.root.after(5000, self.sync_client.tick)
+        self.root.after(SCREEN_POLL_MS, self.check_screen)
+    
+    def on_store_change(self, section, key, source):
+        """Pass a store edit on to every widget but the one that made it"""
+        for widget in self.widgets.values():
+            if widget is not source:
+                widget.on_data_changed(section, key)
+        if section == "pomodoro_log":
+            self.update_focus_stats()
+        
+        # Persist the search index once typing has settled
+        if self.search_persist_job is not None:
+            self.root.after_cancel(self.search_persist_job)
+        self.search_persist_job = self.root.after(3000, self.persist_search_index)
+    
+    def flush_edits(self):
+        for widget in self.widgets.values():
+            widget.flush_edits()
+    
+    def undo(self, event=None):
+        # A pending edit is saved first, so it is what gets undone
+        self.flush_edits()
+        self.store.undo()
+        return "break"
+    
+    def redo(self, event=None):
+        self.flush_edits()
+        self.store.redo()
+        return "break"
+    
+    def persist_search_index(self):
+        self.search_persist_job = None
+        packed = self.search_index.pack()
+        if packed is not None:
+            self.workers.submit(
+                SearchIndex.write_packed, packed, priority=WorkerPool.LOW,
+                on_done=self.search_index.mark_saved, on_error=self.search_index.write_failed
+            )
+    
+    def open_search(self):
+        SearchWindow(self)
+    
+    def jump_to(self, doc_id):
+        """Show the widget holding a search hit and navigate to its date"""
+        section, key, sub = SearchIndex.split_doc_id(doc_id)
+        widget_ids = {
+            "calendar_events": "calendar",
+            "day_planner": "day_planner",
+            "week_planner": "week_planner",
+            "monthly_planner": "monthly_planner",
+            "sticky_notes": "sticky_notes",
+            "todos": "todo"
+        }
+        widget_id = widget_ids[section]
+        widget = self.widgets[widget_id]
+        widget.show_widget()
+        self.widget_vars[widget_id].set(True)
+        widget.window.lift()
+        
+        if section == "calendar_events":
+            widget.show_date(key, sub or None)
+        elif section == "day_planner":
+            widget.show_date(key, int(sub))
+        elif section == "week_planner":
+            widget.show_week(key, int(sub))
+        elif section == "monthly_planner":
+            widget.show_month(key, sub)
+        elif section == "todos" and widget.filter_var.get() != "all":
+            widget.filter_var.set("all")
+            widget.load_tasks()
+    
+    def create_widgets(self):
+        hidden = self.store.layout.hidden()
+        
+        for widget_id, widget_class in WIDGET_CLASSES.items():
+            self.widgets[widget_id] = widget_class(self.root, self)
+            if widget_id in hidden:
+                self.widgets[widget_id].window.withdraw()
+    
+    def create_control_panel(self):
+        self.control_panel = tk.Toplevel(self.root)
+        self.control_panel.title("🎮 Widget Control Panel")
+        self.control_panel.geometry("320x580")
+        self.control_panel.resizable(False, False)
+        self.control_panel.attributes('-topmost', True)
+        
+        theme = THEMES.get(self.data.get("default_theme", "🌊 Ocean Blue"))
+        self.control_panel.configure(bg=theme["bg"])
+        
+        # Title
+        title = tk.Label(
+            self.control_panel,
+            text="🖥️ Desktop Widgets v2.0",
+            bg=theme["header"],
+            fg=theme["text"],
+            font=FONTS["title"],
+            pady=12
+        )
+        title.pack(fill="x")
+        
+        # Scrollable content
+        canvas = tk.Canvas(self.control_panel, bg=theme["bg"], highlightthickness=0)
+        scrollbar = tk.Scrollbar(self.control_panel, orient="vertical", command=canvas.yview)
+        scroll_frame = tk.Frame(canvas, bg=theme["bg"])
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
+        
+        scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        
+        # Widget toggles
+        toggle_frame = tk.LabelFrame(
+            scroll_frame, text="📱 Show/Hide Widgets",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        toggle_frame.pack(fill="x", padx=10, pady=10)
+        
+        widget_names = {
+            "calendar": "📅 Calendar",
+            "todo": "✅ To-Do List",
+            "day_planner": "📆 Day Planner",
+            "week_planner": "📋 Week Planner (Horizontal)",
+            "monthly_planner": "🎯 Monthly Planner",
+            "clock": "🕐 Clock",
+            "sticky_notes": "📌 Sticky Notes",
+            "pomodoro": "🍅 Pomodoro Timer",
+            "habit_tracker": "💪 Habit Tracker",
+            "agenda": "🗓️ Agenda"
+        }
+        
+        self.widget_vars = {}
+        for widget_id, widget_name in widget_names.items():
+            var = tk.BooleanVar(value=widget_id not in self.store.layout.hidden())
+            self.widget_vars[widget_id] = var
+            
+            cb = tk.Checkbutton(
+                toggle_frame, text=widget_name, variable=var,
+                bg=theme["bg"], fg=theme["text"], font=FONTS["normal"],
+                activebackground=theme["bg"], selectcolor=theme["entry"],
+                command=lambda wid=widget_id: self.toggle_widget(wid)
+            )
+            cb.pack(anchor="w", padx=10, pady=2)
+        
+        # Quick actions
+        action_frame = tk.LabelFrame(
+            scroll_frame, text="⚡ Quick Actions",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        action_frame.pack(fill="x", padx=10, pady=10)
+        
+        btn_row = tk.Frame(action_frame, bg=theme["bg"])
+        btn_row.pack(fill="x", pady=5)
+        
+        tk.Button(
+            btn_row, text="👁️ Show All", command=self.show_all_widgets,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=5, cursor="hand2"
+        ).pack(side="left", padx=5)
+        
+        tk.Button(
+            btn_row, text="🙈 Hide All", command=self.hide_all_widgets,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=5, cursor="hand2"
+        ).pack(side="left", padx=5)
+        
+        tk.Button(
+            action_frame, text="🔍 Search All Widgets", command=self.open_search,
+            bg=theme["accent"], fg="white", font=FONTS["button"],
+            bd=0, padx=12, pady=5, cursor="hand2"
+        ).pack(fill="x", padx=5, pady=(0, 5))
+        
+        tk.Button(
+            action_frame, text="📥 Import Calendar / Tasks", command=self.import_file,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=5, cursor="hand2"
+        ).pack(fill="x", padx=5, pady=(0, 5))
+        
+        self.import_status_label = tk.Label(
+            action_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", wraplength=280, justify="left"
+        )
+        self.import_status_label.pack(fill="x", padx=10, pady=(0, 4))
+        
+        # Export as iCalendar, CSV, a Markdown journal or raw JSON
+        export_frame = tk.LabelFrame(
+            scroll_frame, text="📤 Export",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        export_frame.pack(fill="x", padx=10, pady=10)
+        
+        export_row = tk.Frame(export_frame, bg=theme["bg"])
+        export_row.pack(fill="x", padx=10, pady=(4, 2))
+        self.export_format_var = tk.StringVar(value="ics")
+        ttk.Combobox(
+            export_row, textvariable=self.export_format_var,
+            values=list(CLI_EXPORT_FORMATS), width=6, state="readonly"
+        ).pack(side="left", padx=(0, 5))
+        self.export_section_var = tk.StringVar(value="all")
+        ttk.Combobox(
+            export_row, textvariable=self.export_section_var,
+            values=["all"] + list(EXPORT_SECTIONS), width=10, state="readonly"
+        ).pack(side="left")
+        
+        range_row = tk.Frame(export_frame, bg=theme["bg"])
+        range_row.pack(fill="x", padx=10, pady=2)
+        self.export_range_entries = []
+        for label in ("From", "To"):
+            tk.Label(
+                range_row, text=label, bg=theme["bg"], fg=theme["text"], font=FONTS["small"]
+            ).pack(side="left", padx=(0, 3))
+            entry = tk.Entry(
+                range_row, bg=theme["entry"], fg=theme["text"], font=FONTS["small"], relief="flat", width=11
+            )
+            entry.pack(side="left", padx=(0, 6), ipady=2)
+            self.export_range_entries.append(entry)
+        
+        tk.Button(
+            export_frame, text="Export...", command=self.export_file,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(fill="x", padx=10, pady=2)
+        
+        self.export_status_label = tk.Label(
+            export_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", wraplength=280, justify="left"
+        )
+        self.export_status_label.pack(fill="x", padx=10, pady=(0, 4))
+        
+        # Focus time from the pomodoro ledger
+        focus_frame = tk.LabelFrame(
+            scroll_frame, text="🍅 Focus Time",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        focus_frame.pack(fill="x", padx=10, pady=10)
+        
+        self.focus_stats_label = tk.Label(
+            focus_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", justify="left"
+        )
+        self.focus_stats_label.pack(fill="x", padx=10, pady=4)
+        self.update_focus_stats()
+        
+        # Sync between machines through a sync_server.py instance
+        sync_frame = tk.LabelFrame(
+            scroll_frame, text="🔄 Sync",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        sync_frame.pack(fill="x", padx=10, pady=10)
+        
+        self.sync_server_entry = tk.Entry(
+            sync_frame, bg=theme["entry"], fg=theme["text"], font=FONTS["small"], relief="flat"
+        )
+        self.sync_server_entry.insert(0, self.sync_client.state.get("server") or "http://localhost:8765")
+        self.sync_server_entry.pack(fill="x", padx=10, pady=(4, 2), ipady=3)
+        
+        self.sync_token_entry = tk.Entry(
+            sync_frame, bg=theme["entry"], fg=theme["text"], font=FONTS["small"], relief="flat", show="•"
+        )
+        self.sync_token_entry.insert(0, self.sync_client.state.get("token", ""))
+        self.sync_token_entry.pack(fill="x", padx=10, pady=2, ipady=3)
+        
+        tk.Button(
+            sync_frame, text="Sync Now", command=self.sync_now,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(fill="x", padx=10, pady=2)
+        
+        self.sync_status_label = tk.Label(
+            sync_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w"
+        )
+        self.sync_status_label.pack(fill="x", padx=10, pady=(0, 4))
+        self.update_sync_status()
+        
+        # Tracing: record widget spans, save them for chrome://tracing
+        trace_frame = tk.LabelFrame(
+            scroll_frame, text="🩺 Diagnostics",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        trace_frame.pack(fill="x", padx=10, pady=10)
+        
+        self.trace_var = tk.BooleanVar(value=TRACER.enabled)
+        tk.Checkbutton(
+            trace_frame, text="Record trace", variable=self.trace_var,
+            bg=theme["bg"], fg=theme["text"], font=FONTS["normal"],
+            activebackground=theme["bg"], selectcolor=theme["entry"],
+            command=lambda: self.set_tracing(self.trace_var.get())
+        ).pack(anchor="w", padx=10, pady=2)
+        
+        tk.Button(
+            trace_frame, text="Save Trace", command=self.dump_trace,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(fill="x", padx=10, pady=2)
+        
+        self.trace_status_label = tk.Label(
+            trace_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", wraplength=280, justify="left"
+        )
+        self.trace_status_label.pack(fill="x", padx=10, pady=(0, 4))
+        
+        self.lag_status_label = tk.Label(
+            trace_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", wraplength=280, justify="left"
+        )
+        self.lag_status_label.pack(fill="x", padx=10, pady=(4, 2))
+        
+        tk.Button(
+            trace_frame, text="Lag Report", command=self.show_lag_report,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(fill="x", padx=10, pady=(2, 6))
+        
+        self.memory_status_label = tk.Label(
+            trace_frame, text="", bg=theme["bg"], fg=theme["text"],
+            font=FONTS["small"], anchor="w", wraplength=280, justify="left"
+        )
+        self.memory_status_label.pack(fill="x", padx=10, pady=(4, 2))
+        
+        self.tracemalloc_var = tk.BooleanVar(value=tracemalloc.is_tracing())
+        tk.Checkbutton(
+            trace_frame, text="Track allocations", variable=self.tracemalloc_var,
+            bg=theme["bg"], fg=theme["text"], font=FONTS["normal"],
+            activebackground=theme["bg"], selectcolor=theme["entry"],
+            command=lambda: self.set_tracemalloc(self.tracemalloc_var.get())
+        ).pack(anchor="w", padx=10, pady=2)
+        
+        memory_buttons = tk.Frame(trace_frame, bg=theme["bg"])
+        memory_buttons.pack(fill="x", padx=10, pady=(2, 6))
+        tk.Button(
+            memory_buttons, text="Memory Report", command=self.show_memory_report,
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(side="left", fill="x", expand=True, padx=(0, 2))
+        tk.Button(
+            memory_buttons, text="Leak Check", command=lambda: self.show_memory_report(leaks=True),
+            bg=theme["button"], fg=theme["text"], font=FONTS["button"],
+            bd=0, padx=12, pady=4, cursor="hand2"
+        ).pack(side="left", fill="x", expand=True, padx=(2, 0))
+        
+        # Info
+        info_frame = tk.LabelFrame(
+            scroll_frame, text="ℹ️ Tips",
+            bg=theme["bg"], fg=theme["text"], font=FONTS["header"]
+        )
+        info_frame.pack(fill="x", padx=10, pady=10)
+        
+        tips = [
+            "🎨 Click color icon on each widget to change its theme",
+            "↔️ Drag widgets by their header",
+            "📐 Resize using bottom-right corner",
+            "💾 All data auto-saves"
+        ]
+        
+        for tip in tips:
+            tk.Label(
+                info_frame, text=tip, bg=theme["bg"], fg=theme["text"],
+                font=FONTS["small"], anchor="w", wraplength=280
+            ).pack(fill="x", padx=10, pady=2)
+        
+        # Exit button
+        tk.Button(
+            scroll_frame, text="❌ Exit Application", command=self.exit_app,
+            bg="#FF6B6B", fg="white", font=FONTS["button"],
+            bd=0, padx=20, pady=8, cursor="hand2"
+        ).pack(pady=15)
+        
+        self.control_panel.protocol("WM_DELETE_WINDOW", self.minimize_control_panel)
+        self.control_panel.bind("<Control-z>", self.undo)
+        self.control_panel.bind("<Control-y>", self.redo)
+    
+    def update_control_panel(self):
+        for widget_id, var in self.widget_vars.items():
+            var.set(widget_id not in self.store.layout.hidden())
+    
+    def check_screen(self):
+        """Rearrange the widgets in place when a monitor comes or goes"""
+        if self.store.layout.use_screen(screen_signature(self.root)):
+            for widget in self.widgets.values():
+                widget.apply_layout()
+            self.update_control_panel()
+        self.root.after(SCREEN_POLL_MS, self.check_screen)
+    
+    def update_focus_stats(self):
+        if not hasattr(self, "focus_stats_label"):
+            return
+        stats = self.store.pomodoro.summary()
+        self.focus_stats_label.config(
+            text=f"Today: {stats['today_minutes']} min ({stats['today_sessions']} sessions)\n"
+                 f"This week: {stats['week_minutes']} min\n"
+                 f"All time: {stats['total_minutes']} min"
+        )
+    
+    def sync_now(self):
+        self.sync_client.state["server"] = self.sync_server_entry.get().strip()
+        self.sync_client.state["token"] = self.sync_token_entry.get().strip()
+        self.sync_client.sync_now()
+        self.update_sync_status()
+    
+    def update_sync_status(self):
+        if hasattr(self, "sync_status_label"):
+            self.sync_status_label.config(text=self.sync_client.status)
+    
+    def import_file(self):
+        """Pick an .ics or .csv file and import it in the background"""
+        if self.import_job is not None:
+            return
+        path = filedialog.askopenfilename(
+            parent=self.control_panel, title="Import calendar or tasks",
+            filetypes=[("Calendars and task lists", "*.ics *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.set_import_status(f"Reading {os.path.basename(path)}...")
+        self.import_job = self.workers.submit(
+            parse_import_file, path,
+            on_done=self.finish_import, on_error=self.import_failed,
+            on_progress=lambda done, total: self.set_import_status(f"Reading... {done * 100 // max(total, 1)}%")
+        )
+    
+    def finish_import(self, result):
+        self.import_job = None
+        items, skipped = result
+        self.set_import_status(describe_import(apply_import(self.store, items), skipped))
+    
+    def import_failed(self, error):
+        self.import_job = None
+        self.set_import_status(f"Import failed: {error}")
+    
+    def set_import_status(self, text):
+        if hasattr(self, "import_status_label"):
+            self.import_status_label.config(text=text)
+    
+    def export_file(self):
+        """Ask for a file and write the chosen export to it in chunks"""
+        if self.export_writer is not None:
+            return
+        fmt, section = self.export_format_var.get(), self.export_section_var.get()
+        try:
+            start, end = (cli_date(e.get().strip()) if e.get().strip() else None for e in self.export_range_entries)
+        except ValueError:
+            self.set_export_status("Dates are YYYY-MM-DD, today, tomorrow or yesterday")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.control_panel, title="Export", defaultextension=f".{fmt}",
+            filetypes=[(fmt.upper(), f"*.{fmt}"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.export_writer = ExportWriter(path)
+        except OSError as e:
+            self.set_export_status(f"Export failed: {e}")
+            return
+        sections = None if section == "all" else [EXPORT_SECTIONS[section]]
+        # JSON walks whole sections, so it goes out in one piece; the others
+        # look entries up day by day and can pause between chunks
+        self.write_export(export_lines(self.data, fmt, sections, start, end), None if fmt == "json" else 2000)
+    
+    def write_export(self, lines, limit):
+        try:
+            done = self.export_writer.write(lines, limit)
+        except (OSError, ValueError, RuntimeError) as e:
+            self.export_writer.abort()
+            self.export_writer = None
+            self.set_export_status(f"Export failed: {e}")
+            return
+        if done:
+            self.set_export_status(f"Wrote {os.path.basename(self.export_writer.path)} ({self.export_writer.count} lines)")
+            self.export_writer = None
+        else:
+            self.set_export_status(f"Exporting... {self.export_writer.count} lines")
+            self.root.after(1, self.write_export, lines, limit)
+    
+    def set_export_status(self, text):
+        if hasattr(self, "export_status_label"):
+            self.export_status_label.config(text=text)
+    
+    def set_tracing(self, enabled):
+        TRACER.enabled = enabled
+        if hasattr(self, "trace_var"):
+            self.trace_var.set(enabled)
+    
+    def update_lag_status(self):
+        if hasattr(self, "lag_status_label"):
+            self.lag_status_label.config(text=self.lag_monitor.summary())
+        self.root.after(2000, self.update_lag_status)
+    
+    def show_lag_report(self):
+        self.show_report("Event-loop lag", self.lag_monitor.report())
+    
+    def show_report(self, title, report):
+        theme = THEMES.get(self.store.layout.default_theme(), THEMES["🌊 Ocean Blue"])
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("720x480")
+        text = tk.Text(window, bg=theme["entry"], fg=theme["text"], font=FONTS["time"], wrap="none")
+        text.pack(fill="both", expand=True)
+        text.insert("1.0", report)
+        text.config(state="disabled")
+    
+    def sample_memory(self):
+        for scope, counter in self.memory_monitor.sample():
+            print(f"Possible leak: {scope} {counter} rose at each of the last {MemoryMonitor.GROWTH_SAMPLES} samples")
+        if hasattr(self, "memory_status_label"):
+            self.memory_status_label.config(text=self.memory_monitor.summary())
+        self.root.after(60000, self.sample_memory)
+    
+    def set_tracemalloc(self, enabled):
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled:
+            tracemalloc.stop()
+    
+    def show_memory_report(self, leaks=False):
+        leaks = self.memory_monitor.leak_check() if leaks else None
+        self.show_report("Memory", self.memory_monitor.report(leaks))
+    
+    def dump_memory_report(self, leaks=False):
+        leaks = self.memory_monitor.leak_check() if leaks else None
+        try:
+            text = f"Saved memory report to {self.memory_monitor.dump(leaks)}"
+        except OSError as e:
+            text = f"Memory report not saved: {e}"
+        if hasattr(self, "memory_status_label"):
+            self.memory_status_label.config(text=text)
+    
+    def dump_trace(self, *signal_args):
+        try:
+            path, count = TRACER.dump()
+            text = f"Saved {count} spans to {path}"
+        except OSError as e:
+            text = f"Trace not saved: {e}"
+        if hasattr(self, "trace_status_label"):
+            self.trace_status_label.config(text=text)
+    
+    def minimize_control_panel(self):
+        self.control_panel.iconify()
+    
+    def toggle_widget(self, widget_id):
+        if self.widget_vars[widget_id].get():
+            self.widgets[widget_id].show_widget()
+        else:
+            self.widgets[widget_id].hide_widget()
+    
+    def show_all_widgets(self):
+        for widget_id, widget in self.widgets.items():
+            widget.show_widget()
+            self.widget_vars[widget_id].set(True)
+    
+    def hide_all_widgets(self):
+        for widget_id, widget in self.widgets.items():
+            widget.hide_widget()
+            self.widget_vars[widget_id].set(False)
+    
+    def poll_commands(self):
+        """Run commands forwarded by later launches (the socket thread only queues them)"""
+        for command in self.command_server.pending():
+            self.run_command(command)
+        self.root.after(250, self.poll_commands)
+    
+    def run_command(self, command):
+        verb, target = command[0], command[1]
+        if verb == "trace":
+            if target == "dump":
+                self.dump_trace()
+            else:
+                self.set_tracing(target == "on")
+            return
+        if verb == "memory":
+            self.dump_memory_report(leaks=target == "leaks")
+            return
+        if verb == "add":
+            self.widgets["todo"].create_task(command[2], TODO_PRIORITIES[1])
+            target = "todo"
+        elif target == "panel":
+            self.control_panel.deiconify()
+            self.control_panel.lift()
+            return
+        elif target == "all":
+            if verb == "show":
+                self.show_all_widgets()
+            else:
+                self.hide_all_widgets()
+            return
+        
+        self.widget_vars[target].set(verb != "hide")
+        self.toggle_widget(target)
+        if verb != "hide":
+            self.widgets[target].window.lift()
+    
+    def setup_autostart(self):
+        try:
+            import winreg
+            key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
+            app_name = "DesktopWidgets"
+            
+            if getattr(sys, 'frozen', False):
+                exe_path = sys.executable
+            else:
+                exe_path = f'pythonw "{os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")}"'
+            
+            try:
+                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
+                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, exe_path)
+                winreg.CloseKey(key)
+            except:
+                pass
+        except:
+            pass
+    
+    def exit_app(self):
+        self.flush_edits()
+        self.lag_monitor.stop()
+        # Let queued writes land; afterwards the pool runs work inline
+        self.workers.shutdown()
+        self.store.save()
+        self.search_index.save()
+        if self.command_server is not None:
+            self.command_server.stop()
+        self.sync_client.collect()
+        self.sync_client.save_state()
+        self.root.quit()
+        self.root.destroy()
+        sys.exit()
+    
+    def run(self):
+        self.root.mainloop()
+
+
+# ============== SINGLE INSTANCE ==============
+LOCK_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets.lock")
+IPC_SOCKET_FILE = os.path.join(os.path.expanduser("~"), ".desktop_widgets.sock")
+IPC_PORT_FILE = os.path.join(os.path.expanduser("~"), "desktop_widgets.port")
+WIDGET_ALIASES = {
+    "todos": "todo", "tasks": "todo", "day": "day_planner", "week": "week_planner",
+    "month": "monthly_planner", "notes": "sticky_notes", "habits": "habit_tracker"
+}
+COMMAND_USAGE = (
+    "usage: main.py [show panel|all|<widget>] [hide all|<widget>] [add todo <text>] [trace on|off|dump]\n"
+    "       main.py memory [report|leaks]   (written to " + MEMORY_REPORT_FILE + ")\n"
+    "widgets: " + ", ".join(WIDGET_CLASSES) + "\n"
+    "without the GUI: main.py todo|event|plan|note|habit|export ... (see --help)"
+)
+
+
+def parse_command(argv):
+    """Normalise command-line words into a command list; raises ValueError with usage text"""
+    words = [word for word in argv if word.strip()]
+    if not words:
+        return ["show", "panel"]
+    
+    verb = words[0].lower()
+    if verb in ("show", "hide") and len(words) == 2:
+        target = words[1].lower().replace("-", "_")
+        target = WIDGET_ALIASES.get(target, target)
+        if target in WIDGET_CLASSES or target == "all" or (verb, target) == ("show", "panel"):
+            return [verb, target]
+    elif verb == "add" and len(words) >= 3 and words[1].lower() in ("todo", "task"):
+        return ["add", "todo", " ".join(words[2:])]
+    elif verb == "trace" and len(words) == 2 and words[1].lower() in ("on", "off", "dump"):
+        return ["trace", words[1].lower()]
+    elif verb == "memory" and len(words) <= 2:
+        target = words[1].lower() if len(words) == 2 else "report"
+        if target in ("report", "leaks"):
+            return ["memory", target]
+    raise ValueError(COMMAND_USAGE)
+
+
+class InstanceLock:
+    """Exclusive OS lock on LOCK_FILE; the OS drops it if the process dies"""
+    
+    def __init__(self, path=None):
+        self.path = path or LOCK_FILE
+        self.handle = None
+    
+    def acquire(self):
+        handle = open(self.path, "a+")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self.handle = handle
+        return True
+    
+    def release(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class CommandServer:
+    """Accepts commands from later launches on a local socket and queues them for the Tk thread"""
+    
+    def __init__(self):
+        self.commands = queue.Queue()
+        self.sock = None
+        self.token = None
+    
+    def start(self):
+        # AF_UNIX where Python has it; otherwise a loopback port plus a token
+        # kept in the user's home, so only this user can send commands
+        if hasattr(socket, "AF_UNIX"):
+            try:
+                os.unlink(IPC_SOCKET_FILE)
+            except OSError:
+                pass
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            old_umask = os.umask(0o177)
+            try:
+                sock.bind(IPC_SOCKET_FILE)
+            finally:
+                os.umask(old_umask)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            self.token = uuid.uuid4().hex
+            with open(IPC_PORT_FILE, "w") as f:
+                f.write(f"{sock.getsockname()[1]} {self.token}")
+        
+        sock.listen(4)
+        self.sock = sock
+        threading.Thread(target=self.serve, daemon=True).start()
+    
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    conn.settimeout(2)
+                    request = json.loads(conn.makefile("rb").readline(65536))
+                    if self.token and request.get("token") != self.token:
+                        raise ValueError("bad token")
+                    self.commands.put(parse_command(request.get("argv", [])))
+                    reply = "ok"
+                except Exception as e:
+                    reply = f"error: {e}"
+                try:
+                    conn.sendall((reply + "\n").encode("utf-8"))
+                except OSError:
+                    pass
+    
+    def pending(self):
+        """Commands received since the last call"""
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+    
+    def stop(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(IPC_SOCKET_FILE if self.token is None else IPC_PORT_FILE)
+            except OSError:
+                pass
+
+
+def send_command(command, timeout=2.0):
+    """Forward a command to the running instance; returns its reply line"""
+    token = None
+    if hasattr(socket, "AF_UNIX"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = IPC_SOCKET_FILE
+    else:
+        with open(IPC_PORT_FILE) as f:
+            port, token = f.read().split()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = ("127.0.0.1", int(port))
+    
+    with sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall((json.dumps({"token": token, "argv": command}) + "\n").encode("utf-8"))
+        return sock.makefile("rb").readline().decode("utf-8").strip()
+
+
+def main(argv):
+    try:
+        command = parse_command(argv)
+    except ValueError as e:
+        print(e)
+        return 2
+    
+    lock = InstanceLock()
+    if not lock.acquire():
+        # Already running: hand the command over instead of opening a second
+        # copy of the data. Retry briefly in case it is still starting up.
+        for attempt in range(20):
+            try:
+                reply = send_command(command)
+            except (OSError, ValueError):
+                time.sleep(0.1)
+                continue
+            if reply != "ok":
+                print(reply)
+            return 0 if reply == "ok" else 1
+        print("Desktop Widgets is already running but not responding")
+        return 1
+    
+    # Listen before the (slow) Tk start so early second launches are queued
+    server = CommandServer()
+    try:
+        server.start()
+    except OSError:
+        server = None
+    
+    load_gui()
+    app = DesktopWidgetsApp(server)
+    if argv:
+        app.run_command(command)
+    app.run()
+    return 0